@@ -0,0 +1,76 @@
+"""
+Scaling of TokenSpanAligner: exhaustive scan vs sorted-offset binary search.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_aligner
+"""
+
+import time
+
+from chisel.extraction.models.models import EntitySpan, Token
+from chisel.extraction.models.sequences import SpanSet, TokenSequence
+from chisel.extraction.span_aligners.token_span_aligner import TokenSpanAligner
+
+
+def make_document(n_tokens: int, entity_every: int = 4):
+    tokens = [
+        Token(id=i, text="tok", start=4 * i, end=4 * i + 3) for i in range(n_tokens)
+    ]
+    entities = [
+        EntitySpan(text="tok tok", start=4 * i, end=4 * i + 7, label="ENT")
+        for i in range(0, n_tokens - 1, entity_every)
+    ]
+    return tokens, entities
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main() -> None:
+    aligner = TokenSpanAligner()
+    print(
+        f"{'tokens':>8}{'entities':>10}{'exhaustive (ms)':>17}"
+        f"{'bisect (ms)':>13}{'columnar (ms)':>15}"
+    )
+    for n_tokens in (500, 2_000, 8_000, 32_000):
+        tokens, entities = make_document(n_tokens)
+        sequence = TokenSequence.from_tokens(tokens)
+        spans = SpanSet.from_entities(entities)
+        exhaustive = (
+            timed(lambda: aligner._align_exhaustive(entities, tokens), repeat=1)
+            if n_tokens <= 8_000
+            else float("nan")
+        )
+        bisect = timed(lambda: aligner.align(entities, tokens))
+        columnar = timed(lambda: aligner.align(spans, sequence))
+        print(
+            f"{n_tokens:>8}{len(entities):>10}{exhaustive:>17.1f}"
+            f"{bisect:>13.1f}{columnar:>15.2f}"
+        )
+
+    documents = [make_document(256) for _ in range(1_000)]
+    per_document = timed(lambda: [aligner.align(e, t) for t, e in documents], repeat=1)
+    batched = timed(
+        lambda: aligner.align_batch(
+            [e for _, e in documents], [t for t, _ in documents]
+        ),
+        repeat=1,
+    )
+    sequences = [TokenSequence.from_tokens(t) for t, _ in documents]
+    span_sets = [SpanSet.from_entities(e) for _, e in documents]
+    columnar = timed(lambda: aligner.align_batch(span_sets, sequences), repeat=1)
+    print(
+        f"\n1000 documents x 256 tokens: per-document {per_document:.1f} ms, "
+        f"align_batch {batched:.1f} ms, columnar align_batch {columnar:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Per-object construction cost of the Chisel models: validating constructor vs `trusted`.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_models
+"""
+
+import timeit
+
+from chisel.extraction.models.models import (
+    ChiselRecord,
+    EntitySpan,
+    Token,
+    TokenEntitySpan,
+)
+
+NUMBER = 100_000
+
+entity = EntitySpan(text="Barack Obama", start=0, end=12, label="PER")
+tokens = [Token(id=i, text="tok", start=i, end=i + 1) for i in range(512)]
+record_values = dict(
+    id="doc",
+    chunk_id=0,
+    text="x" * 512,
+    tokens=tokens,
+    entities=[entity] * 8,
+    labels=[0] * 512,
+    input_ids=[0] * 512,
+    attention_mask=[1] * 512,
+)
+
+CASES = {
+    "Token": (
+        lambda: Token(id=1, text="tok", start=0, end=3),
+        lambda: Token.trusted(id=1, text="tok", start=0, end=3),
+        NUMBER,
+    ),
+    "EntitySpan (shifted copy)": (
+        lambda: entity.copy(update={"start": 1, "end": 13}),
+        lambda: EntitySpan.trusted(
+            text=entity.text,
+            start=1,
+            end=13,
+            label=entity.label,
+            attributes=entity.attributes,
+        ),
+        NUMBER,
+    ),
+    "TokenEntitySpan": (
+        lambda: TokenEntitySpan(entity=entity, token_indices=[0, 1]),
+        lambda: TokenEntitySpan.trusted(entity=entity, token_indices=[0, 1]),
+        NUMBER,
+    ),
+    "ChiselRecord (512 tokens)": (
+        lambda: ChiselRecord(**record_values),
+        lambda: ChiselRecord.trusted(**record_values),
+        NUMBER // 50,
+    ),
+}
+
+
+def main() -> None:
+    print(f"{'model':<28}{'validated (us)':>16}{'trusted (us)':>14}{'speedup':>9}")
+    for name, (validated, trusted, number) in CASES.items():
+        validated_us = timeit.timeit(validated, number=number) / number * 1e6
+        trusted_us = timeit.timeit(trusted, number=number) / number * 1e6
+        print(
+            f"{name:<28}{validated_us:>16.2f}{trusted_us:>14.2f}"
+            f"{validated_us / trusted_us:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,24 @@ class Parser(Protocol):
         pass
 
 
+@runtime_checkable
+class IncrementalParser(Parser, Protocol):
+    """
+    A parser that can consume a document piece by piece.
+
+    `feed` returns the clean text produced so far (since the previous call) together with
+    the entity spans that have been closed, using offsets relative to the start of the
+    whole clean text. `close` flushes the remainder. This allows documents larger than
+    memory to be parsed and passed on to tokenization in bounded-size segments.
+    """
+
+    def feed(self, chunk: str) -> tuple[str, List[EntitySpan]]:
+        pass
+
+    def close(self) -> tuple[str, List[EntitySpan]]:
+        pass
+
+
 @runtime_checkable
 class Tokenizer(Protocol):
     """
@@ -44,6 +62,20 @@ class Tokenizer(Protocol):
         pass
 
 
+@runtime_checkable
+class BatchTokenizer(Tokenizer, Protocol):
+    """
+    A tokenizer that can also process many texts in one call.
+
+    Implementations should tokenize each text exactly once and return one token list per
+    input text, in input order. Backends such as Hugging Face fast tokenizers can then
+    batch the work natively instead of being invoked once per document.
+    """
+
+    def tokenize_batch(self, texts: List[str]) -> List[List[Token]]:
+        pass
+
+
 @runtime_checkable
 class TokenChunker(Protocol):
     """
@@ -95,7 +127,9 @@ class Labeler(Protocol):
         subword_strategy: Determines how subword tokens are labeled. Options:
             - "first": label only the first subword token
             - "all": label all subword tokens
-            - "strict": label only when the span matches exactly one token
+            - "strict": label all subword tokens, but only when the span starts and ends
+              exactly on word boundaries; a span whose boundary falls inside a word is
+              treated as misaligned and handled by `misalignment_policy`
 
         misalignment_policy: Determines how to handle entity spans that do not align cleanly with tokens.
             - "skip": ignore these spans
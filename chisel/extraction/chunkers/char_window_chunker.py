@@ -0,0 +1,169 @@
+import logging
+import re
+from bisect import bisect_left
+from typing import Iterator, List, Optional, Tuple
+from chisel.extraction.base.protocols import TextChunker
+from chisel.extraction.models.models import EntitySpan
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_BOUNDARY = re.compile(r"[.!?]\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class CharWindowTextChunker(TextChunker):
+    """
+    Splits raw text and its entity spans into character windows before tokenization.
+
+    Windows hold at most `max_chars` characters. Each window ends at the last sentence
+    boundary that keeps it at least `min_fill * max_chars` characters long, falling back
+    to the last whitespace and then to any character; a cut is never placed inside an
+    entity. Consecutive windows may share `overlap` characters (snapped to the start of
+    a word). Entity offsets are shifted to be relative to their window.
+
+    `iter_chunks` is a generator: windows are produced one at a time, and only the
+    current window is copied out of the document, so huge documents can be tokenized
+    in bounded-size pieces (e.g. with `HFTokenizer.tokenize_batch`).
+
+    Parameters
+    ----------
+    max_chars : int
+        Maximum number of characters per window.
+    overlap : int
+        Number of characters a window shares with the previous one.
+    min_fill : float
+        Fraction of `max_chars` a window should reach before a preferred (sentence or
+        whitespace) boundary is chosen over a later, less preferred one.
+    """
+
+    def __init__(
+        self, max_chars: int = 10_000, overlap: int = 0, min_fill: float = 0.8
+    ):
+        if max_chars < 1:
+            raise ValueError("max_chars must be at least 1.")
+        if not 0 <= overlap < max_chars:
+            raise ValueError("overlap must be non-negative and smaller than max_chars.")
+        if not 0.0 <= min_fill <= 1.0:
+            raise ValueError("min_fill must be between 0 and 1.")
+        self.max_chars = max_chars
+        self.overlap = overlap
+        self.min_fill = min_fill
+
+    def chunk(
+        self, text: str, entities: List[EntitySpan]
+    ) -> List[Tuple[str, List[EntitySpan]]]:
+        return list(self.iter_chunks(text, entities))
+
+    def iter_chunks(
+        self, text: str, entities: List[EntitySpan]
+    ) -> Iterator[Tuple[str, List[EntitySpan]]]:
+        """Yields ``(window text, shifted entities)`` for each window, in document order."""
+        for start, end, selected in self._windows(text, entities):
+            yield text[start:end], [
+                EntitySpan.trusted(
+                    text=entities[k].text,
+                    start=entities[k].start - start,
+                    end=entities[k].end - start,
+                    label=entities[k].label,
+                    attributes=entities[k].attributes,
+                )
+                for k in selected
+            ]
+
+    def windows(
+        self, text: str, entities: List[EntitySpan]
+    ) -> Iterator[Tuple[int, int]]:
+        """Yields the ``(start, end)`` character range of each window in the document."""
+        for start, end, _ in self._windows(text, entities):
+            yield start, end
+
+    def _windows(
+        self, text: str, entities: List[EntitySpan]
+    ) -> Iterator[Tuple[int, int, List[int]]]:
+        order = sorted(range(len(entities)), key=lambda k: entities[k].start)
+        entity_starts = [entities[k].start for k in order]
+        blocked = _Blocked(entities)
+
+        n = len(text)
+        start = 0
+        while True:
+            end = n if n - start <= self.max_chars else self._cut(text, start, blocked)
+
+            # Entities lying fully inside the window, in input order.
+            lo = bisect_left(entity_starts, start)
+            hi = bisect_left(entity_starts, end)
+            selected = sorted(k for k in order[lo:hi] if entities[k].end <= end)
+            yield start, end, selected
+
+            if end >= n:
+                return
+            start = self._next_start(text, start, end, blocked)
+
+    def _cut(self, text: str, start: int, blocked: "_Blocked") -> int:
+        limit = start + self.max_chars
+        min_end = start + max(1, int(self.min_fill * self.max_chars))
+        for pattern in (_SENTENCE_BOUNDARY, _WHITESPACE):
+            cut = self._last_match_end(pattern, text, min_end, limit, blocked)
+            if cut is not None:
+                return cut
+
+        # Any character boundary outside entities, preferably after `min_end`.
+        cut = blocked.last_free(limit)
+        if cut > start:
+            return cut
+        logger.warning(
+            f"Entities cover characters {start}-{limit} without a gap (longer than "
+            f"max_chars={self.max_chars}); cutting at {limit} and dropping the "
+            f"entities that cross it."
+        )
+        return limit
+
+    def _next_start(self, text: str, start: int, end: int, blocked: "_Blocked") -> int:
+        if not self.overlap:
+            return end
+        candidate = end - self.overlap
+        # Start the overlap at the beginning of a word and outside any entity.
+        if candidate > 0 and not text[candidate - 1].isspace():
+            match = _WHITESPACE.search(text, candidate, end)
+            candidate = match.end() if match else end
+        candidate = blocked.last_free(candidate)
+        return candidate if candidate > start else end
+
+    @staticmethod
+    def _last_match_end(
+        pattern: re.Pattern, text: str, lo: int, hi: int, blocked: "_Blocked"
+    ) -> Optional[int]:
+        # Boundaries ending exactly at `hi` must be found too, so search up to `hi + 1`.
+        best = None
+        for match in pattern.finditer(text, max(0, lo - 1), min(len(text), hi + 1)):
+            cut = match.end()
+            if cut > hi:
+                cut = hi
+            if lo <= cut and not blocked.is_blocked(cut):
+                best = cut
+        return best
+
+
+class _Blocked:
+    """Merged entity intervals; a cut at position `p` is blocked if it falls strictly inside one."""
+
+    def __init__(self, entities: List[EntitySpan]):
+        merged: List[List[int]] = []
+        for start, end in sorted((e.start, e.end) for e in entities if e.end > e.start):
+            if merged and start < merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self._starts = [start for start, _ in merged]
+        self._ends = [end for _, end in merged]
+
+    def is_blocked(self, position: int) -> bool:
+        i = bisect_left(self._starts, position) - 1
+        return i >= 0 and position < self._ends[i]
+
+    def last_free(self, position: int) -> int:
+        """Returns the largest unblocked position not after `position`."""
+        i = bisect_left(self._starts, position) - 1
+        if i >= 0 and position < self._ends[i]:
+            return self._starts[i]
+        return position
@@ -0,0 +1,250 @@
+import logging
+from typing import Collection, List, Tuple, Union
+import numpy as np
+from chisel.extraction.base.protocols import TokenChunker
+from chisel.extraction.models.models import EntitySpan, Token, TokenEntitySpan
+from chisel.extraction.models.sequences import SpanSet, TokenSequence
+
+logger = logging.getLogger(__name__)
+
+# Preference of a split point, from least to most preferred.
+_TOKEN_BOUNDARY = 0
+_WHITESPACE_BOUNDARY = 1
+_SENTENCE_BOUNDARY = 2
+
+
+class EntityAwareTokenChunker(TokenChunker):
+    """
+    Splits tokens into chunks of at most `max_tokens` without cutting through entities.
+
+    Split points are chosen greedily in a single linear pass. For every chunk, the split
+    is placed at the last sentence boundary that keeps the chunk at least
+    `min_fill * max_tokens` tokens long, falling back to the last whitespace boundary
+    and then to the last token boundary. A split is never placed inside a
+    TokenEntitySpan, so every entity ends up whole in exactly one chunk, without
+    overlapping windows.
+
+    Parameters
+    ----------
+    max_tokens : int
+        Maximum number of tokens per chunk.
+    min_fill : float
+        Fraction of `max_tokens` a chunk should reach before a preferred (sentence or
+        whitespace) boundary is chosen over a later, less preferred one. With 1.0 every
+        chunk is filled as far as possible, which minimizes the number of chunks.
+    sentence_end_tokens : Collection[str]
+        Token texts that end a sentence when followed by whitespace.
+
+    Notes
+    -----
+    An entity longer than `max_tokens` cannot be kept whole; the chunk is then cut at
+    `max_tokens`, the entity is dropped and a warning is logged. As in
+    `FixedLengthTokenChunker`, entities that are aligned to no tokens are included in
+    every chunk.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 256,
+        min_fill: float = 0.8,
+        sentence_end_tokens: Collection[str] = (".", "!", "?"),
+    ):
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1.")
+        if not 0.0 <= min_fill <= 1.0:
+            raise ValueError("min_fill must be between 0 and 1.")
+        self.max_tokens = max_tokens
+        self.min_fill = min_fill
+        self.sentence_end_tokens = set(sentence_end_tokens)
+
+    def chunk(
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        entities: Union[List[TokenEntitySpan], SpanSet],
+    ) -> Tuple[
+        List[Union[List[Token], TokenSequence]],
+        List[Union[List[TokenEntitySpan], SpanSet]],
+    ]:
+        if isinstance(tokens, TokenSequence):
+            return self._chunk_columnar(
+                tokens, SpanSet.from_token_entity_spans(entities)
+            )
+
+        firsts = np.array(
+            [min(e.token_indices) if e.token_indices else 0 for e in entities],
+            dtype=np.int64,
+        )
+        stops = np.array(
+            [max(e.token_indices) + 1 if e.token_indices else 0 for e in entities],
+            dtype=np.int64,
+        )
+        cuts = self._cut_points(
+            np.array([t.start for t in tokens], dtype=np.int64),
+            np.array([t.end for t in tokens], dtype=np.int64),
+            [t.text for t in tokens],
+            firsts,
+            stops,
+        )
+
+        chunks_tokens = []
+        chunks_entities = []
+        for c, selected in enumerate(self._assign(cuts, firsts, stops)):
+            i, end = cuts[c], cuts[c + 1]
+            token_chunk = tokens[i:end]
+            token_start = token_chunk[0].start
+            chunks_tokens.append(
+                [
+                    Token.trusted(
+                        id=t.id,
+                        text=t.text,
+                        start=t.start - token_start,
+                        end=t.end - token_start,
+                    )
+                    for t in token_chunk
+                ]
+            )
+            chunk_entities = []
+            for k in selected:
+                e = entities[k]
+                shifted_entity = EntitySpan.trusted(
+                    text=e.entity.text,
+                    start=e.entity.start - token_start,
+                    end=e.entity.end - token_start,
+                    label=e.entity.label,
+                    attributes=e.entity.attributes,
+                )
+                chunk_entities.append(
+                    TokenEntitySpan.trusted(
+                        entity=shifted_entity,
+                        token_indices=[idx - i for idx in e.token_indices],
+                    )
+                )
+            chunks_entities.append(chunk_entities)
+
+        return chunks_tokens, chunks_entities
+
+    def _chunk_columnar(
+        self, tokens: TokenSequence, entities: SpanSet
+    ) -> Tuple[List[TokenSequence], List[SpanSet]]:
+        """Same split points as the list path, returned as views over the input arrays."""
+        firsts = entities.token_starts.astype(np.int64)
+        stops = entities.token_ends.astype(np.int64)
+        cuts = self._cut_points(tokens.starts, tokens.ends, tokens.texts, firsts, stops)
+        token_starts = tokens.starts
+
+        chunks_tokens = []
+        chunks_entities = []
+        for c, selected in enumerate(self._assign(cuts, firsts, stops)):
+            i, end = cuts[c], cuts[c + 1]
+            chunks_tokens.append(tokens[i:end].rebase())
+            chunks_entities.append(
+                entities.take(np.asarray(selected, dtype=np.int64)).shift(
+                    char_delta=int(token_starts[i]), token_delta=i
+                )
+            )
+        return chunks_tokens, chunks_entities
+
+    def _cut_points(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        texts,
+        firsts: np.ndarray,
+        stops: np.ndarray,
+    ) -> List[int]:
+        """
+        Returns the chunk boundaries ``[0, c1, ..., len(tokens)]``.
+
+        A split point `c` separates token `c - 1` from token `c`. Each split point gets a
+        preference level (-1 where it would cut an entity), and for every level a running
+        maximum gives the last split point of at least that level before any position,
+        so every chunk is placed in O(1).
+        """
+        n = len(starts)
+        if n == 0:
+            return [0]
+
+        # Split points strictly inside an entity's token range are forbidden.
+        inside = np.zeros(n + 1, dtype=np.int64)
+        aligned = stops > firsts
+        np.add.at(inside, firsts[aligned] + 1, 1)
+        np.add.at(inside, stops[aligned], -1)
+        blocked = np.cumsum(inside) > 0
+
+        level = np.full(n + 1, _TOKEN_BOUNDARY, dtype=np.int64)
+        level[1:n][starts[1:] > ends[:-1]] = _WHITESPACE_BOUNDARY
+        sentence_end = np.fromiter(
+            (self._is_sentence_end(text) for text in texts[: n - 1]),
+            dtype=bool,
+            count=n - 1,
+        )
+        level[1:n][
+            sentence_end & (level[1:n] == _WHITESPACE_BOUNDARY)
+        ] = _SENTENCE_BOUNDARY
+        level[blocked] = -1
+        level[0] = level[n] = _SENTENCE_BOUNDARY
+
+        positions = np.arange(n + 1)
+        last_at_least = {
+            lvl: np.maximum.accumulate(np.where(level >= lvl, positions, -1))
+            for lvl in (_SENTENCE_BOUNDARY, _WHITESPACE_BOUNDARY, _TOKEN_BOUNDARY)
+        }
+
+        max_tokens = self.max_tokens
+        min_length = max(1, int(self.min_fill * max_tokens))
+        cuts = [0]
+        start = 0
+        while n - start > max_tokens:
+            end = start + max_tokens
+            cut = next(
+                (
+                    int(last_at_least[lvl][end])
+                    for lvl in (
+                        _SENTENCE_BOUNDARY,
+                        _WHITESPACE_BOUNDARY,
+                        _TOKEN_BOUNDARY,
+                    )
+                    if last_at_least[lvl][end] >= start + min_length
+                ),
+                None,
+            )
+            if cut is None:
+                cut = int(last_at_least[_TOKEN_BOUNDARY][end])
+                if cut <= start:
+                    logger.warning(
+                        f"No split point in tokens {start}-{end} keeps every entity "
+                        f"whole (an entity is longer than max_tokens={max_tokens}); "
+                        f"cutting at token {end} and dropping the entity."
+                    )
+                    cut = end
+            cuts.append(cut)
+            start = cut
+        cuts.append(n)
+        return cuts
+
+    def _is_sentence_end(self, text: str) -> bool:
+        return text.lstrip("Ġ▁") in self.sentence_end_tokens
+
+    @staticmethod
+    def _assign(
+        cuts: List[int], firsts: np.ndarray, stops: np.ndarray
+    ) -> List[List[int]]:
+        """Returns, in input order, the indices of the entities of every chunk."""
+        n_chunks = len(cuts) - 1
+        if n_chunks == 0:
+            return []
+        boundaries = np.asarray(cuts)
+        aligned = stops > firsts
+        chunk_ids = np.searchsorted(boundaries, firsts, side="right") - 1
+        fits = stops <= boundaries[np.minimum(chunk_ids + 1, n_chunks)]
+
+        selected: List[List[int]] = [[] for _ in range(n_chunks)]
+        for k, (is_aligned, chunk_id, fit) in enumerate(
+            zip(aligned.tolist(), chunk_ids.tolist(), fits.tolist())
+        ):
+            if not is_aligned:
+                for chunk in selected:
+                    chunk.append(k)
+            elif fit:
+                selected[chunk_id].append(k)
+        return selected
@@ -1,5 +1,7 @@
-from typing import List, Tuple
-from chisel.extraction.models.models import Token, TokenEntitySpan
+from typing import Iterator, List, Optional, Tuple, Union
+import numpy as np
+from chisel.extraction.models.models import EntitySpan, Token, TokenEntitySpan
+from chisel.extraction.models.sequences import SpanSet, TokenSequence
 
 
 # Implement the fixed-length chunker
@@ -9,42 +11,62 @@ class FixedLengthTokenChunker:
         self.overlap = overlap
 
     def chunk(
-        self, tokens: List[Token], entities: List[TokenEntitySpan]
-    ) -> Tuple[List[List[Token]], List[List[TokenEntitySpan]]]:
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        entities: Union[List[TokenEntitySpan], SpanSet],
+    ) -> Tuple[
+        List[Union[List[Token], TokenSequence]],
+        List[Union[List[TokenEntitySpan], SpanSet]],
+    ]:
+        if isinstance(tokens, TokenSequence):
+            return self._chunk_columnar(
+                tokens, SpanSet.from_token_entity_spans(entities)
+            )
+
         chunks_tokens = []
         chunks_entities = []
-        i = 0
-        stride = self.max_tokens - self.overlap
+        index = _EntityWindowIndex(
+            [
+                (
+                    (min(e.token_indices), max(e.token_indices) + 1)
+                    if e.token_indices
+                    else None
+                )
+                for e in entities
+            ]
+        )
 
-        while i < len(tokens):
+        for i in self._window_starts(len(tokens)):
             token_chunk = tokens[i : i + self.max_tokens]
-
-            # Stop if the chunk would be too small (e.g. last chunk has only 1 token)
-            if len(token_chunk) < self.overlap and i != 0:
-                break
-
             token_start = token_chunk[0].start
+            selected = index.select(i, i + self.max_tokens)
+
+            # A window that needs no shifting reuses the input objects.
+            if i == 0 and token_start == 0:
+                chunks_tokens.append(token_chunk)
+                chunks_entities.append([entities[k] for k in selected])
+                continue
 
-            # Filter and shift TokenEntitySpans
             chunk_entities = []
-            for e in entities:
-                if all(i <= idx < i + self.max_tokens for idx in e.token_indices):
-                    shifted_indices = [idx - i for idx in e.token_indices]
-                    shifted_entity = e.entity.copy(
-                        update={
-                            "start": e.entity.start - token_start,
-                            "end": e.entity.end - token_start,
-                        }
-                    )
-                    chunk_entities.append(
-                        TokenEntitySpan(
-                            entity=shifted_entity, token_indices=shifted_indices
-                        )
+            for k in selected:
+                e = entities[k]
+                shifted_entity = EntitySpan.trusted(
+                    text=e.entity.text,
+                    start=e.entity.start - token_start,
+                    end=e.entity.end - token_start,
+                    label=e.entity.label,
+                    attributes=e.entity.attributes,
+                )
+                chunk_entities.append(
+                    TokenEntitySpan.trusted(
+                        entity=shifted_entity,
+                        token_indices=[idx - i for idx in e.token_indices],
                     )
+                )
 
             # Shift tokens
             shifted_tokens = [
-                Token(
+                Token.trusted(
                     id=t.id,
                     text=t.text,
                     start=t.start - token_start,
@@ -56,6 +78,84 @@ class FixedLengthTokenChunker:
             chunks_tokens.append(shifted_tokens)
             chunks_entities.append(chunk_entities)
 
+        return chunks_tokens, chunks_entities
+
+    def _window_starts(self, n_tokens: int) -> Iterator[int]:
+        """Yields the first token index of every window."""
+        i = 0
+        stride = self.max_tokens - self.overlap
+        while i < n_tokens:
+            # Stop if the chunk would be too small (e.g. last chunk has only 1 token)
+            if min(self.max_tokens, n_tokens - i) < self.overlap and i != 0:
+                break
+            yield i
             i += stride
 
+    def _chunk_columnar(
+        self, tokens: TokenSequence, entities: SpanSet
+    ) -> Tuple[List[TokenSequence], List[SpanSet]]:
+        """Same windows as the list path, returned as views over the input arrays."""
+        chunks_tokens = []
+        chunks_entities = []
+        token_starts = tokens.starts
+        firsts = entities.token_starts
+        stops = entities.token_ends
+        unaligned = np.flatnonzero(stops <= firsts)
+        aligned = np.flatnonzero(stops > firsts)
+        # Aligned entities ordered by first token, so that the candidates of a window
+        # are found with two binary searches.
+        order = aligned[np.argsort(firsts[aligned], kind="stable")]
+        sorted_firsts = firsts[order]
+        # With entities already in token order every selection is in input order.
+        in_order = not len(unaligned) and bool(np.all(order[1:] > order[:-1]))
+
+        for i in self._window_starts(len(tokens)):
+            end = i + self.max_tokens
+            lo, hi = sorted_firsts.searchsorted((i, end))
+            candidates = order[lo:hi]
+            selected = candidates[stops[candidates] <= end]
+            if not in_order:
+                selected = np.sort(np.concatenate([unaligned, selected]))
+
+            token_start = int(token_starts[i])
+            chunk_entities = entities.take(selected).shift(
+                char_delta=token_start, token_delta=i
+            )
+
+            chunks_tokens.append(tokens[i:end].rebase())
+            chunks_entities.append(chunk_entities)
+
         return chunks_tokens, chunks_entities
+
+
+class _EntityWindowIndex:
+    """
+    Finds the entities that lie fully inside successive token windows.
+
+    Entities are sorted once by their first token. Windows are queried in increasing
+    order, so a pointer skips entities starting before the current window for good, and
+    each query only visits entities that start inside the window.
+    """
+
+    def __init__(self, bounds: List[Optional[Tuple[int, int]]]):
+        # Entities without tokens are part of every window.
+        self._unbounded = [k for k, b in enumerate(bounds) if b is None]
+        self._bounded = sorted(
+            (b[0], b[1], k) for k, b in enumerate(bounds) if b is not None
+        )
+        self._pointer = 0
+
+    def select(self, start: int, end: int) -> List[int]:
+        """Returns, in input order, the entities whose tokens all lie in [start, end)."""
+        bounded = self._bounded
+        while self._pointer < len(bounded) and bounded[self._pointer][0] < start:
+            self._pointer += 1
+
+        selected = list(self._unbounded)
+        j = self._pointer
+        while j < len(bounded) and bounded[j][0] < end:
+            if bounded[j][1] <= end:
+                selected.append(bounded[j][2])
+            j += 1
+        selected.sort()
+        return selected
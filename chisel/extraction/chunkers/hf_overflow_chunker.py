@@ -0,0 +1,224 @@
+from typing import List, Sequence, Tuple, Union
+import numpy as np
+from chisel.extraction.chunkers.fixed_length_chunker import FixedLengthTokenChunker
+from chisel.extraction.models.models import EntitySpan, Token, TokenEntitySpan
+from chisel.extraction.models.sequences import SpanSet, TokenSequence
+from chisel.extraction.span_aligners.token_span_aligner import TokenSpanAligner
+from chisel.extraction.tokenizers.hf_tokenizer import HFTokenizer
+
+ChunkedDocument = Tuple[
+    List[Union[List[Token], TokenSequence]],
+    List[Union[List[TokenEntitySpan], SpanSet]],
+]
+
+
+class HFOverflowTokenChunker:
+    """
+    Tokenizes and chunks documents in one pass of a Hugging Face fast tokenizer.
+
+    Windows overlapping by `overlap` tokens are produced by the tokenizer itself
+    (``return_overflowing_tokens=True`` with a ``stride``), and
+    ``overflow_to_sample_mapping`` groups them per document. Entities are aligned once
+    per document with `TokenSpanAligner` on the window offsets and assigned to windows
+    with array operations.
+
+    The result is the same as
+    ``FixedLengthTokenChunker(max_tokens, overlap).chunk(tokens, TokenSpanAligner().align(entities, tokens))``
+    with ``tokens = tokenizer.tokenize(text)``: chunk offsets are relative to the first
+    token of the chunk, an entity is kept in every chunk that contains all of its tokens,
+    and entities without tokens are kept in every chunk.
+
+    Parameters
+    ----------
+    tokenizer : HFTokenizer
+        Tokenizer wrapping a fast (Rust) Hugging Face tokenizer.
+    max_tokens : int
+        Maximum number of tokens per chunk.
+    overlap : int
+        Number of tokens shared by consecutive chunks.
+    columnar : bool
+        If True, chunks are returned as TokenSequence / SpanSet instead of model lists.
+
+    Notes
+    -----
+    Byte-level tokenizers can emit tokens whose offsets are not sorted; an entity may
+    then cover non-contiguous tokens. The list output falls back to
+    `FixedLengthTokenChunker` for such documents, while the columnar output, which can
+    only represent contiguous token ranges, raises a ValueError.
+    """
+
+    def __init__(
+        self,
+        tokenizer: HFTokenizer,
+        max_tokens: int = 256,
+        overlap: int = 0,
+        columnar: bool = False,
+    ):
+        if not tokenizer.tokenizer.is_fast:
+            raise ValueError("HFOverflowTokenChunker requires a fast tokenizer.")
+        # Windows are requested one token longer than `max_tokens` (see
+        # `tokenize_and_chunk_batch`). The tokenizer validates the stride against
+        # max_length minus the special tokens it would add, even when they are not added.
+        n_special = tokenizer.tokenizer.num_special_tokens_to_add()
+        if overlap < 0 or overlap + 1 >= max_tokens + 1 - n_special:
+            raise ValueError(
+                f"overlap must be non-negative and smaller than max_tokens - {n_special} "
+                f"(special tokens of this tokenizer)."
+            )
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+        self.columnar = columnar
+        self._aligner = TokenSpanAligner()
+
+    def tokenize_and_chunk(
+        self, text: str, entities: List[EntitySpan]
+    ) -> ChunkedDocument:
+        """Returns ``(token chunks, entity chunks)`` for one document."""
+        return self.tokenize_and_chunk_batch([text], [entities])[0]
+
+    def tokenize_and_chunk_batch(
+        self, texts: Sequence[str], entities_batch: Sequence[List[EntitySpan]]
+    ) -> List[ChunkedDocument]:
+        """Returns ``(token chunks, entity chunks)`` for every document, in input order."""
+        if len(texts) != len(entities_batch):
+            raise ValueError("texts and entities_batch must have the same length.")
+        if not texts:
+            return []
+
+        # Each window carries one extra token, shared with the next window. Offsets
+        # at the start of an overflow window can differ from those of a full encoding
+        # (e.g. for a zero-width "Ġ" token), so the first token of every later window
+        # takes its offsets from that extra token instead.
+        encoding = self.tokenizer.tokenizer(
+            list(texts),
+            return_offsets_mapping=True,
+            add_special_tokens=False,
+            truncation=True,
+            max_length=self.max_tokens + 1,
+            stride=self.overlap + 1,
+            return_overflowing_tokens=True,
+            return_tensors=None,
+        )
+        sample_mapping = np.asarray(encoding["overflow_to_sample_mapping"])
+        bounds = np.searchsorted(sample_mapping, np.arange(len(texts) + 1))
+        space_prefixed = self.tokenizer._space_prefix_mask()
+        stride = self.max_tokens - self.overlap
+
+        results = []
+        for d, entities in enumerate(entities_batch):
+            windows = []
+            previous = None
+            for w in range(bounds[d], bounds[d + 1]):
+                ids = np.asarray(encoding["input_ids"][w], dtype=np.int64)
+                offsets = np.asarray(
+                    encoding["offset_mapping"][w], dtype=np.int64
+                ).reshape(-1, 2)
+                if previous is not None and len(offsets):
+                    offsets[0] = previous[stride]
+                previous = offsets
+                windows.append(
+                    (ids, offsets[:, 0] + space_prefixed[ids], offsets[:, 1], w)
+                )
+            results.append(self._chunk_document(encoding, windows, entities))
+        return results
+
+    def _chunk_document(self, encoding, windows, entities: List[EntitySpan]):
+        stride = self.max_tokens - self.overlap
+        shared = self.overlap + 1
+        # Window k starts at token k * stride and shares `shared` tokens with window
+        # k - 1; dropping them rebuilds the whole document.
+        doc_ids, doc_starts, doc_ends = (
+            np.concatenate(
+                [windows[0][a]] + [window[a][shared:] for window in windows[1:]]
+            )
+            for a in range(3)
+        )
+        n_tokens = len(doc_ids)
+        if n_tokens == 0:
+            return [], []
+
+        doc_tokens = TokenSequence(
+            ids=doc_ids,
+            starts=doc_starts,
+            ends=doc_ends,
+            texts=list(encoding.tokens(windows[0][3]))
+            + [
+                text
+                for window in windows[1:]
+                for text in encoding.tokens(window[3])[shared:]
+            ],
+        )
+        try:
+            aligned = self._aligner.align(SpanSet.from_entities(entities), doc_tokens)
+        except ValueError:
+            # Unsorted offsets can align an entity to non-contiguous tokens, which only
+            # the list representation supports.
+            if self.columnar:
+                raise
+            return self._chunk_tokens(doc_tokens.to_tokens(), entities)
+        firsts = aligned.token_starts
+        stops = aligned.token_ends
+        unaligned = stops <= firsts
+
+        # The tokenizer stops once the document is covered, while
+        # FixedLengthTokenChunker keeps emitting tail windows of at least `overlap`
+        # tokens; those are suffixes of the last window.
+        starts = []
+        i = 0
+        while i < n_tokens:
+            if min(self.max_tokens, n_tokens - i) < self.overlap and i != 0:
+                break
+            starts.append(i)
+            i += stride
+
+        chunks_tokens = []
+        chunks_entities = []
+        last = len(windows) - 1
+        for k, i in enumerate(starts):
+            # Windows past the last one are suffixes of it.
+            ids, token_starts, token_ends, w = windows[min(k, last)]
+            offset = i - min(k, last) * stride
+            window = slice(offset, offset + self.max_tokens)
+            ids = ids[window]
+            token_starts = token_starts[window]
+            token_ends = token_ends[window]
+            texts = None if self.columnar else encoding.tokens(w)[window]
+
+            token_start = int(token_starts[0])
+            selected = np.flatnonzero(
+                unaligned | ((firsts >= i) & (stops <= i + self.max_tokens))
+            )
+            chunk_entities = aligned.take(selected).shift(
+                char_delta=token_start, token_delta=i
+            )
+            if self.columnar:
+                chunks_tokens.append(
+                    TokenSequence(
+                        ids=ids,
+                        starts=token_starts,
+                        ends=token_ends,
+                        text_resolver=self.tokenizer.tokenizer.convert_ids_to_tokens,
+                        char_offset=token_start,
+                    )
+                )
+                chunks_entities.append(chunk_entities)
+            else:
+                chunks_tokens.append(
+                    [
+                        Token.trusted(id=idx, text=text, start=start, end=end)
+                        for idx, text, start, end in zip(
+                            ids.tolist(),
+                            texts,
+                            (token_starts - token_start).tolist(),
+                            (token_ends - token_start).tolist(),
+                        )
+                    ]
+                )
+                chunks_entities.append(chunk_entities.to_token_entity_spans())
+
+        return chunks_tokens, chunks_entities
+
+    def _chunk_tokens(self, tokens: List[Token], entities: List[EntitySpan]):
+        chunker = FixedLengthTokenChunker(self.max_tokens, self.overlap)
+        return chunker.chunk(tokens, self._aligner.align(entities, tokens))
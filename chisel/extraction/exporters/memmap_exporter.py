@@ -0,0 +1,116 @@
+import json
+import os
+from itertools import chain, islice
+from typing import Dict, Iterable, Optional, Sequence
+import numpy as np
+from chisel.extraction.base.protocols import Exporter
+from chisel.extraction.models.memmap_layout import FIELD_FILE, META_FILE, OFFSETS_FILE
+from chisel.extraction.models.models import ChiselRecord
+
+# Compact on-disk dtypes; labels include the -100 ignore index.
+DEFAULT_DTYPES = {
+    "input_ids": "int32",
+    "attention_mask": "int8",
+    "labels": "int16",
+    "position_ids": "int32",
+}
+
+
+class MemmapExporter(Exporter):
+    """
+    Writes per-token fields of ChiselRecords as flat binary files that can be
+    memory-mapped, e.g. by `MemmapTorchNERDataset`.
+
+    Every field is stored as one raw ``<field>.bin`` file holding the values of all
+    records back to back; ``offsets.npy`` holds the start of every record plus the total
+    number of tokens, and ``meta.json`` the dtypes and sizes. Records are consumed
+    lazily and written `batch_size` at a time, so corpora larger than memory can be
+    exported from an iterator.
+
+    Parameters
+    ----------
+    output_dir : str
+        Directory to write to; existing files of the export are overwritten.
+    fields : Sequence[str]
+        Per-token fields of ChiselRecord to write. Every record must have all of them.
+    dtypes : Optional[Dict[str, str]]
+        NumPy dtype per field, overriding `DEFAULT_DTYPES`. A ValueError is raised if a
+        value does not fit.
+    batch_size : int
+        Number of records converted and written at a time.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        fields: Sequence[str] = ("input_ids", "attention_mask", "labels"),
+        dtypes: Optional[Dict[str, str]] = None,
+        batch_size: int = 1000,
+    ):
+        dtypes = {**DEFAULT_DTYPES, **(dtypes or {})}
+        missing = [name for name in fields if name not in dtypes]
+        if missing:
+            raise ValueError(f"No dtype given for fields: {missing}")
+        if "input_ids" not in fields:
+            raise ValueError("fields must include input_ids, which defines lengths.")
+        self.output_dir = output_dir
+        self.fields = list(fields)
+        self.dtypes = {name: np.dtype(dtypes[name]) for name in self.fields}
+        self.batch_size = batch_size
+
+    def export(self, data: Iterable[ChiselRecord]) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        records = iter(data)
+        offsets = [np.zeros(1, dtype=np.int64)]
+        n_tokens = 0
+        files = {
+            name: open(os.path.join(self.output_dir, FIELD_FILE.format(name)), "wb")
+            for name in self.fields
+        }
+        try:
+            while True:
+                batch = list(islice(records, self.batch_size))
+                if not batch:
+                    break
+                lengths = np.fromiter(
+                    (len(r.input_ids) for r in batch), dtype=np.int64, count=len(batch)
+                )
+                offsets.append(n_tokens + np.cumsum(lengths))
+                n_tokens += int(lengths.sum())
+                for name in self.fields:
+                    self._values(batch, name, lengths).tofile(files[name])
+        finally:
+            for f in files.values():
+                f.close()
+
+        offsets = np.concatenate(offsets)
+        np.save(os.path.join(self.output_dir, OFFSETS_FILE), offsets)
+        with open(os.path.join(self.output_dir, META_FILE), "w") as f:
+            json.dump(
+                {
+                    "num_records": len(offsets) - 1,
+                    "num_tokens": n_tokens,
+                    "fields": {name: dtype.str for name, dtype in self.dtypes.items()},
+                },
+                f,
+                indent=2,
+            )
+
+    def _values(self, batch, name: str, lengths: np.ndarray) -> np.ndarray:
+        columns = [getattr(r, name) for r in batch]
+        for r, column, n in zip(batch, columns, lengths.tolist()):
+            if column is None or len(column) != n:
+                raise ValueError(
+                    f"Record {r.id!r} (chunk {r.chunk_id}) must have {n} {name}, "
+                    f"the length of its input_ids."
+                )
+        values = np.fromiter(
+            chain.from_iterable(columns), dtype=np.int64, count=int(lengths.sum())
+        )
+        converted = values.astype(self.dtypes[name])
+        if not np.array_equal(converted, values):
+            raise ValueError(
+                f"Values of {name} do not fit into {self.dtypes[name]}; pass a "
+                f"larger dtype."
+            )
+        return converted
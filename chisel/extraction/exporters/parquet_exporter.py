@@ -0,0 +1,318 @@
+import os
+from collections import OrderedDict
+from itertools import chain
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from chisel.extraction.base.protocols import Exporter
+from chisel.extraction.formatters.arrow_columns import (
+    list_array,
+    struct_list_array,
+    tag_index_array,
+)
+from chisel.extraction.models.models import ChiselRecord
+from chisel.extraction.models.sequences import SpanSet, TokenSequence
+
+_LABEL = pa.dictionary(pa.int32(), pa.string())
+
+
+def _schema(dictionary_labels: bool) -> pa.Schema:
+    label = _LABEL if dictionary_labels else pa.string()
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("chunk_id", pa.int64()),
+            ("text", pa.string()),
+            (
+                "tokens",
+                pa.list_(
+                    pa.struct(
+                        [
+                            ("id", pa.int64()),
+                            ("text", pa.string()),
+                            ("start", pa.int64()),
+                            ("end", pa.int64()),
+                        ]
+                    )
+                ),
+            ),
+            (
+                "entities",
+                pa.list_(
+                    pa.struct(
+                        [
+                            ("text", pa.string()),
+                            ("start", pa.int64()),
+                            ("end", pa.int64()),
+                            ("label", label),
+                            ("attributes", pa.map_(pa.string(), pa.string())),
+                        ]
+                    )
+                ),
+            ),
+            ("bio_labels", pa.list_(label)),
+            ("labels", pa.list_(pa.int64())),
+            ("multi_labels", pa.list_(pa.list_(pa.int64()))),
+            ("input_ids", pa.list_(pa.int64())),
+            ("attention_mask", pa.list_(pa.int64())),
+            ("position_ids", pa.list_(pa.int64())),
+            ("segment_ids", pa.list_(pa.int64())),
+            (
+                "segments",
+                pa.list_(
+                    pa.struct(
+                        [
+                            ("id", pa.string()),
+                            ("chunk_id", pa.int64()),
+                            ("token_start", pa.int64()),
+                            ("token_end", pa.int64()),
+                            ("char_start", pa.int64()),
+                            ("char_end", pa.int64()),
+                        ]
+                    )
+                ),
+            ),
+        ]
+    )
+
+
+class ParquetExporter(Exporter):
+    """
+    Writes ChiselRecords to Parquet, one row per record, as they arrive.
+
+    Tokens and entities are nested ``list<struct>`` columns (entity attributes are a
+    ``map<string, string>``), multi labels are stored as tag indices per token, and
+    every other ChiselRecord field is a column of its own, so readers can load only the
+    columns they need, e.g. ``pq.read_table(path, columns=["input_ids", "labels"])``.
+
+    Records are buffered until `row_group_size` of them are collected, then converted
+    to Arrow and written with `pyarrow.parquet.ParquetWriter`; the full dataset is never
+    held in memory.
+
+    Parameters
+    ----------
+    path : str
+        Output file, or output directory if `partition_by` is set.
+    row_group_size : int
+        Number of records per row group (and per conversion batch).
+    compression : str
+        Parquet compression codec, e.g. "zstd", "snappy", "gzip" or "none".
+    compression_level : Optional[int]
+        Codec-specific compression level.
+    dictionary_labels : bool
+        If True, entity labels and BIO labels are stored as Arrow dictionaries and
+        dictionary-encoded in Parquet, so each distinct label is stored once per page.
+    partition_by : Optional[str]
+        Top-level ChiselRecord field (e.g. "chunk_id") to partition by. Records are
+        written to Hive-style directories ``<path>/<field>=<value>/part-N.parquet`` and
+        the field is stored in the directory name instead of the files. The buffer of
+        `row_group_size` records is shared by all partition values; every flush writes
+        one row group per value in it.
+    max_open_files : int
+        Maximum number of partition files open at once. When a new partition value
+        needs a file, the least recently written one is closed; later records of a
+        closed partition go to its next ``part-N.parquet`` file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        row_group_size: int = 5_000,
+        compression: str = "zstd",
+        compression_level: Optional[int] = None,
+        dictionary_labels: bool = True,
+        partition_by: Optional[str] = None,
+        max_open_files: int = 64,
+    ):
+        if row_group_size < 1 or max_open_files < 1:
+            raise ValueError("row_group_size and max_open_files must be at least 1.")
+        schema = _schema(dictionary_labels)
+        if partition_by is not None:
+            if partition_by not in ("id", "chunk_id"):
+                raise ValueError(
+                    f"Cannot partition by {partition_by!r}; use a scalar field "
+                    f"('id' or 'chunk_id')."
+                )
+            schema = schema.remove(schema.get_field_index(partition_by))
+        self.path = path
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.compression_level = compression_level
+        self.dictionary_labels = dictionary_labels
+        self.partition_by = partition_by
+        self.max_open_files = max_open_files
+        self.schema = schema
+
+    def export(self, data: Iterable[ChiselRecord]) -> None:
+        # Open writers, least recently written first, and files written per partition.
+        writers: "OrderedDict[str, pq.ParquetWriter]" = OrderedDict()
+        parts: Dict[str, int] = {}
+        buffer: List[ChiselRecord] = []
+        try:
+            for record in data:
+                buffer.append(record)
+                if len(buffer) >= self.row_group_size:
+                    self._flush(writers, parts, buffer)
+                    buffer = []
+            if buffer:
+                self._flush(writers, parts, buffer)
+            if not parts and self.partition_by is None:
+                # An empty export still produces a readable file.
+                self._writer(writers, parts, "")
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+    def _flush(self, writers, parts, records: List[ChiselRecord]) -> None:
+        groups: Dict[str, List[ChiselRecord]] = {}
+        for record in records:
+            groups.setdefault(self._partition(record), []).append(record)
+        for key, group in groups.items():
+            table = pa.Table.from_batches([self._record_batch(group)], self.schema)
+            self._writer(writers, parts, key).write_table(
+                table, row_group_size=len(group)
+            )
+
+    def _partition(self, record: ChiselRecord) -> str:
+        if self.partition_by is None:
+            return ""
+        value = quote(str(getattr(record, self.partition_by)), safe="")
+        return f"{self.partition_by}={value}"
+
+    def _writer(self, writers, parts: Dict[str, int], key: str) -> pq.ParquetWriter:
+        if key in writers:
+            writers.move_to_end(key)
+            return writers[key]
+        if len(writers) >= self.max_open_files:
+            _, writer = writers.popitem(last=False)
+            writer.close()
+        path = self.path
+        if self.partition_by is not None:
+            directory = os.path.join(self.path, key)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{parts.get(key, 0)}.parquet")
+        elif os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        parts[key] = parts.get(key, 0) + 1
+        writers[key] = pq.ParquetWriter(
+            path,
+            self.schema,
+            compression=self.compression,
+            compression_level=self.compression_level,
+        )
+        return writers[key]
+
+    def _record_batch(self, records: List[ChiselRecord]) -> pa.RecordBatch:
+        label = _LABEL if self.dictionary_labels else pa.string()
+        columns = {
+            "id": pa.array([r.id for r in records], pa.string()),
+            "chunk_id": pa.array([r.chunk_id for r in records], pa.int64()),
+            "text": pa.array([r.text for r in records], pa.string()),
+            "tokens": self._tokens(records),
+            "entities": self._entities(records, label),
+            "bio_labels": list_array([r.bio_labels for r in records], label),
+            "multi_labels": tag_index_array([r.multi_labels for r in records]),
+            "segments": self._segments(records),
+        }
+        for name in (
+            "labels",
+            "input_ids",
+            "attention_mask",
+            "position_ids",
+            "segment_ids",
+        ):
+            columns[name] = list_array([getattr(r, name) for r in records], pa.int64())
+        return pa.RecordBatch.from_arrays(
+            [columns[name] for name in self.schema.names], schema=self.schema
+        )
+
+    @staticmethod
+    def _tokens(records: List[ChiselRecord]) -> pa.ListArray:
+        ids, starts, ends, texts = [], [], [], []
+        for record in records:
+            tokens = record.tokens
+            if isinstance(tokens, TokenSequence):
+                ids.append(tokens.ids)
+                starts.append(tokens.starts)
+                ends.append(tokens.ends)
+                texts.append(tokens.texts)
+            else:
+                ids.append(np.fromiter((t.id for t in tokens), np.int64, len(tokens)))
+                starts.append(
+                    np.fromiter((t.start for t in tokens), np.int64, len(tokens))
+                )
+                ends.append(np.fromiter((t.end for t in tokens), np.int64, len(tokens)))
+                texts.append([t.text for t in tokens])
+        empty = [np.zeros(0, np.int64)]
+        return struct_list_array(
+            np.fromiter(map(len, ids), np.int64, len(ids)),
+            {
+                "id": pa.array(np.concatenate(ids + empty).astype(np.int64)),
+                "text": pa.array(list(chain.from_iterable(texts)), pa.string()),
+                "start": pa.array(np.concatenate(starts + empty).astype(np.int64)),
+                "end": pa.array(np.concatenate(ends + empty).astype(np.int64)),
+            },
+        )
+
+    @staticmethod
+    def _entities(records: List[ChiselRecord], label: pa.DataType) -> pa.ListArray:
+        spans = [SpanSet.from_entities(r.entities) for r in records]
+        labels = pa.array(
+            list(chain.from_iterable(s.labels.tolist() for s in spans)), pa.string()
+        )
+        attributes = [
+            list(attrs.items())
+            for s in spans
+            for attrs in ([{}] * len(s) if s.attributes is None else s.attributes)
+        ]
+        empty = [np.zeros(0, np.int64)]
+        return struct_list_array(
+            np.fromiter(map(len, spans), np.int64, len(spans)),
+            {
+                "text": pa.array(
+                    list(chain.from_iterable(s.texts.tolist() for s in spans)),
+                    pa.string(),
+                ),
+                "start": pa.array(np.concatenate([s.starts for s in spans] + empty)),
+                "end": pa.array(np.concatenate([s.ends for s in spans] + empty)),
+                "label": (
+                    labels.dictionary_encode()
+                    if pa.types.is_dictionary(label)
+                    else labels
+                ),
+                "attributes": pa.array(attributes, pa.map_(pa.string(), pa.string())),
+            },
+        )
+
+    @staticmethod
+    def _segments(records: List[ChiselRecord]) -> pa.ListArray:
+        fields = (
+            "id",
+            "chunk_id",
+            "token_start",
+            "token_end",
+            "char_start",
+            "char_end",
+        )
+        segments = [r.segments for r in records]
+        missing = np.fromiter(
+            (s is None for s in segments), dtype=bool, count=len(segments)
+        )
+        flat = [segment for s in segments if s is not None for segment in s]
+        array = struct_list_array(
+            np.fromiter((len(s or ()) for s in segments), np.int64, len(segments)),
+            {
+                name: pa.array(
+                    [getattr(segment, name) for segment in flat],
+                    pa.string() if name == "id" else pa.int64(),
+                )
+                for name in fields
+            },
+        )
+        if not missing.any():
+            return array
+        return pa.ListArray.from_arrays(
+            array.offsets, array.values, mask=pa.array(missing)
+        )
@@ -0,0 +1,352 @@
+import glob
+import json
+import os
+import struct
+from typing import Any, Dict, Iterable, List
+import numpy as np
+from chisel.extraction.base.protocols import Exporter
+from chisel.extraction.models.models import ChiselRecord, RecordSegment
+from chisel.extraction.models.sequences import SpanSet, TokenLabelMatrix, TokenSequence
+
+SHARD_PATTERN = "shard-{:05d}.bin"
+INDEX_SUFFIX = ".idx"
+MAGIC = b"CHISEL\x00\x01"
+
+_HEADER = struct.Struct("<I")
+_INT_DTYPES = [
+    (dtype, int(np.iinfo(dtype).min), int(np.iinfo(dtype).max))
+    for dtype in (np.dtype(t).newbyteorder("<") for t in ("i1", "i2", "i4", "i8"))
+]
+_PER_TOKEN_FIELDS = (
+    "labels",
+    "input_ids",
+    "attention_mask",
+    "position_ids",
+    "segment_ids",
+)
+# Integer arrays of a payload, in the order they are stored.
+_ARRAYS = (
+    "token_ids",
+    "token_starts",
+    "token_lengths",
+    "entity_starts",
+    "entity_lengths",
+    *_PER_TOKEN_FIELDS,
+    "multi_label_counts",
+    "multi_label_indices",
+    "multi_label_values",
+)
+_SEGMENT_FIELDS = (
+    "id",
+    "chunk_id",
+    "token_start",
+    "token_end",
+    "char_start",
+    "char_end",
+)
+
+
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+
+def _pread(fd: int, size: int, offset: int) -> bytes:
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, offset)
+    # Without fork there is no descriptor shared between processes.
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+def _compact(values: Any) -> np.ndarray:
+    """Returns `values` as the smallest little-endian integer array that holds them."""
+    values = np.asarray(values, dtype=np.int64)
+    if len(values):
+        low, high = int(values.min()), int(values.max())
+        for dtype, lowest, highest in _INT_DTYPES:
+            if lowest <= low and high <= highest:
+                return values.astype(dtype)
+    return values.astype(_INT_DTYPES[0][0])
+
+
+def _deltas(values: np.ndarray) -> np.ndarray:
+    deltas = values.copy()
+    deltas[1:] -= values[:-1]
+    return deltas
+
+
+def encode_record(record: ChiselRecord) -> bytes:
+    """
+    Serializes a ChiselRecord to the shard payload format.
+
+    The payload is a length-prefixed JSON header with the strings of the record (ids,
+    text, token and entity texts, labels, attributes) and the layout of the integer
+    arrays, followed by the raw arrays. Every array uses the smallest integer dtype its
+    values fit in, and token and entity offsets are delta-encoded, so they mostly fit in
+    one or two bytes per value.
+    """
+    tokens = TokenSequence.from_tokens(record.tokens)
+    spans = SpanSet.from_entities(record.entities)
+    starts, ends = tokens.starts, tokens.ends
+    token_texts = list(tokens.texts)
+    if token_texts == [
+        record.text[s:e] for s, e in zip(starts.tolist(), ends.tolist())
+    ]:
+        # Token strings are slices of the text; skip storing them twice.
+        token_texts = None
+
+    arrays = {
+        "token_ids": tokens.ids,
+        "token_starts": _deltas(starts),
+        "token_lengths": ends - starts,
+        "entity_starts": _deltas(spans.starts),
+        "entity_lengths": spans.ends - spans.starts,
+    }
+    for name in _PER_TOKEN_FIELDS:
+        values = getattr(record, name)
+        if values is not None:
+            arrays[name] = values
+    header = {
+        "id": record.id,
+        "chunk_id": record.chunk_id,
+        "text": record.text,
+        "token_texts": token_texts,
+        "entity_labels": spans.labels.tolist(),
+        "entity_texts": spans.texts.tolist(),
+        "entity_attributes": (
+            None
+            if spans.attributes is None or not any(spans.attributes)
+            else spans.attributes.tolist()
+        ),
+        "bio_labels": record.bio_labels,
+        "segments": (
+            None
+            if record.segments is None
+            else [[getattr(s, f) for f in _SEGMENT_FIELDS] for s in record.segments]
+        ),
+    }
+    matrix = record.multi_labels
+    if isinstance(matrix, TokenLabelMatrix):
+        header["multi_labels"] = {"tags": list(matrix.tags)}
+        arrays["multi_label_counts"] = np.diff(matrix.indptr)
+        arrays["multi_label_indices"] = matrix.indices
+    elif matrix is not None:
+        matrix = np.asarray(matrix)
+        header["multi_labels"] = {"shape": list(matrix.shape)}
+        arrays["multi_label_values"] = matrix.reshape(-1)
+
+    blocks = []
+    layout: List[Any] = []
+    for name in _ARRAYS:
+        values = arrays.get(name)
+        if values is None:
+            layout.append(None)
+            continue
+        if name == "multi_label_values":
+            block = np.ascontiguousarray(values)
+        else:
+            block = _compact(values)
+        layout.append([block.dtype.str, len(block)])
+        blocks.append(block.tobytes())
+    header["arrays"] = layout
+    header = {key: value for key, value in header.items() if value is not None}
+    encoded = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode()
+    return b"".join([_HEADER.pack(len(encoded)), encoded] + blocks)
+
+
+def decode_record(payload: bytes) -> ChiselRecord:
+    """Rebuilds a ChiselRecord, with columnar tokens and entities, from `encode_record`."""
+    (size,) = _HEADER.unpack_from(payload)
+    position = _HEADER.size + size
+    header = json.loads(payload[_HEADER.size : position])
+    arrays: Dict[str, np.ndarray] = {}
+    for name, spec in zip(_ARRAYS, header["arrays"]):
+        if spec is not None:
+            dtype, count = np.dtype(spec[0]), spec[1]
+            arrays[name] = np.frombuffer(payload, dtype, count, position)
+            position += dtype.itemsize * count
+
+    starts = np.cumsum(arrays["token_starts"], dtype=np.int64)
+    ends = starts + arrays["token_lengths"]
+    texts = header.get("token_texts")
+    if texts is None:
+        text = header["text"]
+        texts = [text[s:e] for s, e in zip(starts.tolist(), ends.tolist())]
+    entity_starts = np.cumsum(arrays["entity_starts"], dtype=np.int64)
+    entity_labels = header["entity_labels"]
+    attributes = header.get("entity_attributes")
+
+    multi_labels = None
+    if "multi_labels" in header:
+        spec = header["multi_labels"]
+        if "tags" in spec:
+            indptr = np.zeros(len(arrays["multi_label_counts"]) + 1, dtype=np.int64)
+            np.cumsum(arrays["multi_label_counts"], out=indptr[1:])
+            multi_labels = TokenLabelMatrix(
+                indptr, arrays["multi_label_indices"], spec["tags"]
+            )
+        else:
+            multi_labels = arrays["multi_label_values"].reshape(spec["shape"]).copy()
+
+    segments = header.get("segments")
+    return ChiselRecord.trusted(
+        id=header["id"],
+        chunk_id=header["chunk_id"],
+        text=header["text"],
+        tokens=TokenSequence(arrays["token_ids"], starts, ends, texts=texts),
+        entities=SpanSet(
+            entity_starts,
+            entity_starts + arrays["entity_lengths"],
+            labels=entity_labels,
+            texts=header["entity_texts"],
+            attributes=[{}] * len(entity_labels) if attributes is None else attributes,
+        ),
+        bio_labels=header.get("bio_labels"),
+        multi_labels=multi_labels,
+        segments=(
+            None
+            if segments is None
+            else [
+                RecordSegment.trusted(**dict(zip(_SEGMENT_FIELDS, s))) for s in segments
+            ]
+        ),
+        **{name: arrays[name].tolist() for name in _PER_TOKEN_FIELDS if name in arrays},
+    )
+
+
+class ShardExporter(Exporter):
+    """
+    Writes ChiselRecords to compact binary shards with a random-access index.
+
+    Every shard ``shard-NNNNN.bin`` starts with a magic header followed by the records,
+    each one a 4-byte length prefix and its `encode_record` payload. The matching
+    ``shard-NNNNN.bin.idx`` holds the little-endian uint64 byte offset of every record
+    plus the end of the last one, so `ShardReader` reads record `i` with one seek and
+    one read. Records are written as they arrive; a new shard is started every
+    `shard_size` records.
+
+    Parameters
+    ----------
+    output_dir : str
+        Directory to write to. Shards of a previous export in it are removed.
+    shard_size : int
+        Number of records per shard.
+    """
+
+    def __init__(self, output_dir: str, shard_size: int = 10_000):
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1.")
+        self.output_dir = output_dir
+        self.shard_size = shard_size
+
+    def export(self, data: Iterable[ChiselRecord]) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(self.output_dir, "shard-*.bin*")):
+            os.remove(path)
+
+        shard = None
+        offsets: List[int] = []
+        n_shards = 0
+        try:
+            for record in data:
+                if shard is None:
+                    path = os.path.join(self.output_dir, SHARD_PATTERN.format(n_shards))
+                    shard = open(path, "wb")
+                    shard.write(MAGIC)
+                    offsets = [len(MAGIC)]
+                    n_shards += 1
+                payload = encode_record(record)
+                shard.write(_HEADER.pack(len(payload)))
+                shard.write(payload)
+                offsets.append(offsets[-1] + _HEADER.size + len(payload))
+                if len(offsets) > self.shard_size:
+                    self._close(shard, offsets)
+                    shard = None
+        finally:
+            if shard is not None:
+                self._close(shard, offsets)
+
+    @staticmethod
+    def _close(shard, offsets: List[int]) -> None:
+        shard.close()
+        np.asarray(offsets, dtype="<u8").tofile(shard.name + INDEX_SUFFIX)
+
+
+class ShardReader:
+    """
+    Map-style access to the records written by `ShardExporter`.
+
+    Only the index files are read when the reader is created. ``reader[i]`` looks up the
+    shard and byte range of record `i`, reads it with one positioned read (``os.pread``),
+    and decodes it into a ChiselRecord with columnar tokens and entities. Reads do not
+    move a shared file offset, and shard files are opened lazily per process, so the
+    reader can be passed to forked or spawned DataLoader workers. Open files are closed
+    by `close`, on leaving a ``with`` block, or when the reader is garbage collected.
+
+    Parameters
+    ----------
+    path : str
+        Directory written by `ShardExporter`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.shards = sorted(glob.glob(os.path.join(path, "shard-*.bin")))
+        if not self.shards and not os.path.isdir(path):
+            raise ValueError(f"No shards found in {path!r}.")
+        self._offsets = [
+            np.fromfile(shard + INDEX_SUFFIX, dtype="<u8") for shard in self.shards
+        ]
+        self._ends = np.cumsum([len(offsets) - 1 for offsets in self._offsets])
+        self._files: Dict[int, int] = {}
+        self._pid = os.getpid()
+
+    def __len__(self) -> int:
+        return int(self._ends[-1]) if len(self._ends) else 0
+
+    def __getitem__(self, index: int) -> ChiselRecord:
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError(f"Record {index} out of range for {n} records.")
+        shard = int(np.searchsorted(self._ends, index, side="right"))
+        local = index - (int(self._ends[shard - 1]) if shard else 0)
+        start, end = self._offsets[shard][local : local + 2].tolist()
+
+        if self._pid != os.getpid():
+            # Descriptors inherited through fork belong to the parent; open our own.
+            self._files = {}
+            self._pid = os.getpid()
+        fd = self._files.get(shard)
+        if fd is None:
+            fd = self._files[shard] = os.open(self.shards[shard], _OPEN_FLAGS)
+        # Skip the length prefix; the index already gives the size.
+        return decode_record(
+            _pread(fd, end - start - _HEADER.size, start + _HEADER.size)
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def close(self) -> None:
+        if self._pid == os.getpid():
+            for fd in self._files.values():
+                os.close(fd)
+        self._files = {}
+
+    def __enter__(self) -> "ShardReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self):
+        if getattr(self, "_files", None):
+            self.close()
+
+    def __getstate__(self):
+        # Open file handles stay with the process that opened them.
+        state = self.__dict__.copy()
+        state["_files"] = {}
+        return state
@@ -0,0 +1,173 @@
+import glob
+import os
+from itertools import islice
+from typing import Iterable, List, Literal, Optional
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc, DocBin
+from spacy.util import filter_spans
+from chisel.extraction.base.protocols import Exporter
+from chisel.extraction.models.models import ChiselRecord, ValidationIssue
+from chisel.extraction.models.sequences import SpanSet
+from chisel.extraction.validators.report import ValidationReport
+
+SHARD_PATTERN = "shard-{:05d}.spacy"
+
+
+class SpacyDocBinExporter(Exporter):
+    """
+    Writes ChiselRecords as spaCy `Doc` objects to sharded ``.spacy`` (DocBin) files,
+    ready for ``spacy train``.
+
+    Texts are tokenized in batches with the tokenizer of a blank pipeline (or of `nlp`),
+    so no trained components are loaded, and all Docs share one `Vocab`. Record tokens
+    are not reused: they are usually model subwords rather than spaCy words. Entities
+    are placed with ``doc.char_span(start, end, label, alignment_mode=...)`` from their
+    character offsets.
+
+    Entities that do not align to token boundaries, and entities overlapping a longer
+    one (``doc.ents`` cannot overlap), are dropped and recorded in `report` as
+    ``misaligned_span`` and ``overlapping_span`` issues. Set `spans_key` to also store
+    every aligned entity, overlapping or not, in ``doc.spans[spans_key]``.
+
+    Docs are added to one DocBin that is written to ``shard-NNNNN.spacy`` and replaced
+    every `shard_size` Docs, so memory stays bounded for any number of records.
+
+    Parameters
+    ----------
+    output_dir : str
+        Directory to write to. Shards of a previous export in it are removed.
+    lang : str
+        Language code of the blank pipeline whose tokenizer is used.
+    nlp : Optional[Language]
+        Pipeline whose tokenizer and vocab are used instead of a blank `lang` one.
+    shard_size : int
+        Maximum number of Docs per ``.spacy`` file.
+    batch_size : int
+        Number of texts tokenized at a time.
+    alignment_mode : str
+        Passed to ``Doc.char_span``: "strict" drops spans that do not match token
+        boundaries, "contract" and "expand" snap them to the tokens inside or around.
+    spans_key : Optional[str]
+        If set, all aligned entities are also stored in ``doc.spans[spans_key]``.
+    store_user_data : bool
+        If True, the record id and chunk id are stored in ``doc.user_data``. DocBin
+        serializes user data per Doc, which adds about half to the export time.
+    on_error : Literal["warn", "raise"]
+        "warn" drops entities that cannot be placed and records them in `report`;
+        "raise" raises a ValueError for the first one.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        lang: str = "en",
+        nlp: Optional[Language] = None,
+        shard_size: int = 5_000,
+        batch_size: int = 1_000,
+        alignment_mode: Literal["strict", "contract", "expand"] = "strict",
+        spans_key: Optional[str] = None,
+        store_user_data: bool = True,
+        on_error: Literal["warn", "raise"] = "warn",
+    ):
+        if alignment_mode not in ("strict", "contract", "expand"):
+            raise ValueError(f"Unknown alignment_mode: {alignment_mode!r}")
+        if shard_size < 1 or batch_size < 1:
+            raise ValueError("shard_size and batch_size must be at least 1.")
+        self.output_dir = output_dir
+        self.nlp = spacy.blank(lang) if nlp is None else nlp
+        self.shard_size = shard_size
+        self.batch_size = batch_size
+        self.alignment_mode = alignment_mode
+        self.spans_key = spans_key
+        self.store_user_data = store_user_data
+        self.on_error = on_error
+        self.report = ValidationReport()
+
+    def export(self, data: Iterable[ChiselRecord]) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(self.output_dir, "shard-*.spacy")):
+            os.remove(path)
+        self.report = ValidationReport()
+
+        records = iter(data)
+        doc_bin = self._doc_bin()
+        n_shards = 0
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                break
+            texts = (record.text for record in batch)
+            for record, doc in zip(
+                batch, self.nlp.tokenizer.pipe(texts, batch_size=self.batch_size)
+            ):
+                doc_bin.add(self._annotate(doc, record))
+                if len(doc_bin) >= self.shard_size:
+                    self._write(doc_bin, n_shards)
+                    n_shards += 1
+                    doc_bin = self._doc_bin()
+        if len(doc_bin) or n_shards == 0:
+            self._write(doc_bin, n_shards)
+
+    def _doc_bin(self) -> DocBin:
+        return DocBin(store_user_data=self.store_user_data)
+
+    def _write(self, doc_bin: DocBin, shard: int) -> None:
+        doc_bin.to_disk(os.path.join(self.output_dir, SHARD_PATTERN.format(shard)))
+
+    def _annotate(self, doc: Doc, record: ChiselRecord) -> Doc:
+        spans = SpanSet.from_entities(record.entities)
+        issues: List[ValidationIssue] = []
+        aligned = []
+        for index, (start, end, label) in enumerate(
+            zip(spans.starts.tolist(), spans.ends.tolist(), spans.labels.tolist())
+        ):
+            span = doc.char_span(
+                start, end, label=label, alignment_mode=self.alignment_mode
+            )
+            if span is None or len(span) == 0:
+                issues.append(
+                    self._issue(
+                        "misaligned_span",
+                        f"Entity {label!r} at [{start}:{end}] does not align to "
+                        f"token boundaries ({self.alignment_mode}).",
+                        record,
+                        index,
+                    )
+                )
+            else:
+                aligned.append((index, span))
+
+        ents = filter_spans([span for _, span in aligned])
+        if len(ents) < len(aligned):
+            kept = {id(span) for span in ents}
+            for index, span in aligned:
+                if id(span) not in kept:
+                    issues.append(
+                        self._issue(
+                            "overlapping_span",
+                            f"Entity {span.label_!r} at [{span.start_char}:"
+                            f"{span.end_char}] overlaps a longer entity.",
+                            record,
+                            index,
+                        )
+                    )
+        doc.ents = ents
+        if self.spans_key is not None:
+            doc.spans[self.spans_key] = [span for _, span in aligned]
+        if self.store_user_data:
+            doc.user_data["id"] = record.id
+            doc.user_data["chunk_id"] = record.chunk_id
+
+        if issues and self.on_error == "raise":
+            raise ValueError(issues[0].message)
+        self.report.update(len(spans), issues, len(issues))
+        return doc
+
+    @staticmethod
+    def _issue(
+        error: str, message: str, record: ChiselRecord, index: int
+    ) -> ValidationIssue:
+        return ValidationIssue.trusted(
+            error=error, message=message, doc_id=record.id, index=index
+        )
@@ -0,0 +1,94 @@
+"""
+Builders of Arrow list columns from flat value and offset buffers, shared by the
+Arrow-based formatters and exporters.
+"""
+
+from itertools import chain
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+import pyarrow as pa
+from chisel.extraction.models.sequences import TokenLabelMatrix
+
+
+def list_offsets(
+    lengths: np.ndarray, missing: Optional[np.ndarray] = None
+) -> Tuple[pa.Array, dict]:
+    """Returns the int32 offsets of lists with `lengths`, and the null mask keyword."""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int32)
+    np.cumsum(lengths, out=offsets[1:])
+    if missing is None or not missing.any():
+        return pa.array(offsets), {}
+    return pa.array(offsets), {"mask": pa.array(missing)}
+
+
+def list_array(
+    values: Sequence[Optional[Sequence]], value_type: pa.DataType
+) -> pa.ListArray:
+    """Returns one list per entry of `values` (None gives a null list)."""
+    if pa.types.is_string(value_type) or pa.types.is_dictionary(value_type):
+        # Strings are converted one by one either way; Arrow's own nested conversion
+        # is the fastest path for them.
+        array = pa.array(values, pa.list_(pa.string()))
+        if pa.types.is_dictionary(value_type):
+            offsets, mask = list_offsets(
+                np.diff(array.offsets.to_numpy()), array.is_null().to_numpy(False)
+            )
+            array = pa.ListArray.from_arrays(
+                offsets, array.flatten().dictionary_encode(), **mask
+            )
+        return array
+    present = [v for v in values if v is not None]
+    missing = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+    lengths = np.zeros(len(values), dtype=np.int64)
+    lengths[~missing] = np.fromiter(map(len, present), np.int64, len(present))
+    if present and all(isinstance(v, np.ndarray) for v in present):
+        flat = np.concatenate(present).astype(np.int64, copy=False)
+    else:
+        flat = np.fromiter(
+            chain.from_iterable(present), np.int64, count=int(lengths.sum())
+        )
+    offsets, mask = list_offsets(lengths, missing)
+    return pa.ListArray.from_arrays(offsets, pa.array(flat, value_type), **mask)
+
+
+def struct_list_array(lengths: np.ndarray, fields: Dict[str, pa.Array]) -> pa.ListArray:
+    """Returns lists of structs; `fields` hold the flat values of all lists."""
+    offsets, _ = list_offsets(lengths)
+    return pa.ListArray.from_arrays(
+        offsets, pa.StructArray.from_arrays(list(fields.values()), list(fields))
+    )
+
+
+def tag_index_array(matrices: Sequence) -> pa.ListArray:
+    """
+    Returns the tag indices of every token of every multi-label matrix (dense or
+    `TokenLabelMatrix`) as a ``list<list<int64>>`` column; None gives a null entry.
+    """
+    # Sparse rows keep the size proportional to the tags that are set.
+    indptrs = []
+    indices = []
+    missing = np.fromiter(
+        (m is None for m in matrices), dtype=bool, count=len(matrices)
+    )
+    lengths = np.zeros(len(matrices), dtype=np.int64)
+    for k, matrix in enumerate(matrices):
+        if matrix is None:
+            continue
+        if isinstance(matrix, TokenLabelMatrix):
+            indptr = matrix.indptr - matrix.indptr[0]
+            columns = matrix.indices
+        else:
+            rows, columns = np.nonzero(np.asarray(matrix))
+            indptr = np.zeros(len(matrix) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(rows, minlength=len(matrix)), out=indptr[1:])
+        lengths[k] = len(indptr) - 1
+        indptrs.append(np.diff(indptr))
+        indices.append(columns)
+
+    row_offsets, _ = list_offsets(np.concatenate(indptrs + [np.zeros(0, np.int64)]))
+    rows = pa.ListArray.from_arrays(
+        row_offsets,
+        pa.array(np.concatenate(indices + [np.zeros(0, np.int64)]).astype(np.int64)),
+    )
+    offsets, mask = list_offsets(lengths, missing)
+    return pa.ListArray.from_arrays(offsets, rows, **mask)
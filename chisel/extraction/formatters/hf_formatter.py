@@ -1,7 +1,23 @@
 # chisel/extraction/formatters/hf_formatter.py
-from typing import List, Dict, Any
-from datasets import Dataset
+import os
+import tempfile
+import uuid
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Optional
+import pyarrow as pa
+from datasets import Dataset, concatenate_datasets
+from chisel.extraction.formatters.arrow_columns import list_array, tag_index_array
 from chisel.extraction.models.models import ChiselRecord
+from chisel.extraction.models.sequences import TokenSequence
+
+# Per-token list columns and the type of their values.
+_LIST_FIELDS = (
+    ("tokens", pa.string()),
+    ("input_ids", pa.int64()),
+    ("attention_mask", pa.int64()),
+    ("labels", pa.int64()),
+    ("bio_labels", pa.string()),
+)
 
 
 class HFDatasetFormatter:
@@ -16,20 +32,118 @@ class HFDatasetFormatter:
     - attention_mask: List[int]
     - labels: List[int]
     - bio_labels: List[str] (if available)
+    - multi_labels: List[List[int]], the tag indices of every token (only if some
+      record was labeled by `MultiLabelLabeler`)
+
+    Columns are built as Arrow arrays straight from flat value and offset buffers, one
+    record batch of `shard_size` records at a time, without a Python dict per record.
+    With a `cache_dir`, the formatter streams: every batch is written to an Arrow shard
+    in a new directory under `cache_dir` as soon as it is built, and the result is a
+    memory-mapped dataset over those shards, so peak memory stays around one shard.
+
+    Parameters
+    ----------
+    shard_size : int
+        Number of records per Arrow record batch (and per shard file when streaming).
+    cache_dir : Optional[str]
+        Directory for the Arrow shards; None keeps the dataset in memory.
+    multi_labels : Optional[bool]
+        Whether to add the multi_labels column. None adds it if some record has
+        multi_labels; when streaming, only the first record is inspected.
     """
 
-    def format(self, records: List[ChiselRecord]) -> Dataset:
-        rows: List[Dict[str, Any]] = []
-        for record in records:
-            rows.append(
-                {
-                    "id": record.id,
-                    "chunk_id": record.chunk_id,
-                    "tokens": [t.text for t in record.tokens],
-                    "input_ids": record.input_ids,
-                    "attention_mask": record.attention_mask,
-                    "labels": record.labels,
-                    "bio_labels": record.bio_labels,
-                }
-            )
-        return Dataset.from_list(rows)
+    def __init__(
+        self,
+        shard_size: int = 1000,
+        cache_dir: Optional[str] = None,
+        multi_labels: Optional[bool] = None,
+    ):
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1.")
+        self.shard_size = shard_size
+        self.cache_dir = cache_dir
+        self.multi_labels = multi_labels
+
+    def format(self, records: Iterable[ChiselRecord]) -> Dataset:
+        if self.cache_dir is None:
+            records = list(records)
+            multi_label = self.multi_labels
+            if multi_label is None:
+                multi_label = any(r.multi_labels is not None for r in records)
+            schema = self._schema(multi_label)
+            batches = [
+                self._record_batch(shard, schema)
+                for shard in self._shards(iter(records))
+            ]
+            return self._dataset(pa.Table.from_batches(batches, schema))
+        return self._format_to_disk(iter(records))
+
+    def _format_to_disk(self, records: Iterator[ChiselRecord]) -> Dataset:
+        first = next(records, None)
+        multi_label = self.multi_labels
+        if multi_label is None:
+            multi_label = first is not None and first.multi_labels is not None
+        schema = self._schema(multi_label)
+        if first is not None:
+            records = chain([first], records)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        directory = tempfile.mkdtemp(prefix="chisel-", dir=self.cache_dir)
+        paths = []
+        for shard in self._shards(records):
+            path = os.path.join(directory, f"shard-{len(paths):05d}.arrow")
+            # Datasets memory-maps files in the Arrow streaming format.
+            with pa.OSFile(path, "wb") as sink:
+                with pa.ipc.new_stream(sink, schema) as writer:
+                    writer.write_batch(self._record_batch(shard, schema))
+            paths.append(path)
+
+        if not paths:
+            return self._dataset(schema.empty_table())
+        return concatenate_datasets([Dataset.from_file(path) for path in paths])
+
+    @staticmethod
+    def _dataset(table: pa.Table) -> Dataset:
+        # Without a fingerprint, datasets hashes the whole in-memory table.
+        return Dataset(table, fingerprint=uuid.uuid4().hex[:16])
+
+    def _shards(self, records: Iterator[ChiselRecord]) -> Iterator[List[ChiselRecord]]:
+        while True:
+            shard = list(islice(records, self.shard_size))
+            if not shard:
+                return
+            yield shard
+
+    @staticmethod
+    def _schema(multi_label: bool) -> pa.Schema:
+        fields = [("id", pa.string()), ("chunk_id", pa.int64())]
+        fields += [(name, pa.list_(value_type)) for name, value_type in _LIST_FIELDS]
+        if multi_label:
+            fields.append(("multi_labels", pa.list_(pa.list_(pa.int64()))))
+        return pa.schema(fields)
+
+    def _record_batch(
+        self, records: List[ChiselRecord], schema: pa.Schema
+    ) -> pa.RecordBatch:
+        columns = {
+            "id": pa.array([r.id for r in records], pa.string()),
+            "chunk_id": pa.array([r.chunk_id for r in records], pa.int64()),
+            "tokens": list_array(
+                [
+                    (
+                        r.tokens.texts
+                        if isinstance(r.tokens, TokenSequence)
+                        else [t.text for t in r.tokens]
+                    )
+                    for r in records
+                ],
+                pa.string(),
+            ),
+        }
+        for name, value_type in _LIST_FIELDS[1:]:
+            columns[name] = list_array([getattr(r, name) for r in records], value_type)
+        if "multi_labels" in schema.names:
+            columns["multi_labels"] = tag_index_array([r.multi_labels for r in records])
+        return pa.RecordBatch.from_arrays(
+            [columns[name] for name in schema.names], schema=schema
+        )
@@ -1,8 +1,30 @@
 # chisel/extraction/formatters/torch_formatter.py
-from typing import List, Dict, Any
-from torch.utils.data import Dataset
+import json
+import os
+from itertools import chain, islice
+from typing import (
+    List,
+    Dict,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Union,
+)
+from torch.nn import functional as F
+from torch.nn.utils.rnn import pad_sequence
+from torch.utils.data import Dataset, IterableDataset, Sampler, get_worker_info
+import numpy as np
 import torch
+from chisel.extraction.labelers.label_encoder import IGNORE_INDEX
+from chisel.extraction.models.memmap_layout import FIELD_FILE, META_FILE, OFFSETS_FILE
 from chisel.extraction.models.models import ChiselRecord
+from chisel.extraction.models.sequences import TokenLabelMatrix
+
+# Per-token integer fields of a ChiselRecord, in output order.
+_FIELDS = ("input_ids", "attention_mask", "labels", "position_ids")
 
 
 class TorchNERDataset(Dataset):
@@ -16,6 +38,100 @@ class TorchNERDataset(Dataset):
         return self.data[idx]
 
 
+class ContiguousTorchNERDataset(Dataset):
+    """
+    Stores all records in a few flat tensors instead of small tensors per record.
+
+    Every field holds the values of all records back to back, and record `i` spans
+    ``offsets[i]:offsets[i + 1]`` of each of them; items are views into that storage.
+
+    Parameters
+    ----------
+    values : Dict[str, torch.Tensor]
+        Concatenated values per field. `multi_labels` is a boolean ``(tokens, tags)``
+        tensor, returned as float per item.
+    offsets : torch.Tensor
+        Start of every record in the flat tensors, plus the total length.
+    """
+
+    def __init__(self, values: Dict[str, torch.Tensor], offsets: torch.Tensor):
+        self.values = values
+        self.offsets = offsets
+        self.lengths = (offsets[1:] - offsets[:-1]).tolist()
+        self._starts = offsets[:-1].tolist()
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def __getitem__(self, idx):
+        start = self._starts[idx]
+        stop = start + self.lengths[idx]
+        item = {name: value[start:stop] for name, value in self.values.items()}
+        if "multi_labels" in item:
+            item["multi_labels"] = item["multi_labels"].float()
+        return item
+
+
+class MemmapTorchNERDataset(Dataset):
+    """
+    Reads a directory written by `MemmapExporter` without loading it into memory.
+
+    Every field file is opened with `np.memmap`, and items are zero-copy
+    `torch.from_numpy` views of it in the stored (compact) dtype; `PaddingCollator`
+    converts them to int64 per batch. DataLoader workers share the operating system's
+    page cache instead of each holding a copy, and opening the dataset is instant.
+
+    Parameters
+    ----------
+    path : str
+        Directory written by `MemmapExporter`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.offsets = np.load(os.path.join(path, OFFSETS_FILE))
+        self.lengths = np.diff(self.offsets).tolist()
+        self._starts = self.offsets[:-1].tolist()
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def __getitem__(self, idx):
+        arrays = self._open()
+        start = self._starts[idx]
+        stop = start + self.lengths[idx]
+        return {
+            name: torch.from_numpy(array[start:stop]) for name, array in arrays.items()
+        }
+
+    def __getstate__(self):
+        # Workers started with "spawn" reopen the files instead of pickling the data.
+        state = self.__dict__.copy()
+        state["_arrays"] = None
+        return state
+
+    def _open(self) -> Dict[str, np.ndarray]:
+        if self._arrays is None:
+            # Copy-on-write mapping: writable for torch.from_numpy, never written back.
+            self._arrays = {
+                name: (
+                    np.memmap(
+                        os.path.join(self.path, FIELD_FILE.format(name)),
+                        dtype=np.dtype(dtype),
+                        mode="c",
+                        shape=(self.meta["num_tokens"],),
+                    )
+                    if self.meta["num_tokens"]
+                    else np.zeros(0, dtype=np.dtype(dtype))
+                )
+                for name, dtype in self.meta["fields"].items()
+            }
+        return self._arrays
+
+
 class TorchDatasetFormatter:
     """
     Converts a list of ChiselRecord instances into a PyTorch Dataset for training.
@@ -24,15 +140,314 @@ class TorchDatasetFormatter:
     - input_ids
     - attention_mask
     - labels
+    - position_ids (packed records only)
+    - multi_labels (records labeled by `MultiLabelLabeler` only): float multi-hot
+      tensor of shape (tokens, tags), e.g. for `BCEWithLogitsLoss`
+
+    Parameters
+    ----------
+    contiguous : bool
+        If True, returns a `ContiguousTorchNERDataset` that holds every field of all
+        records in one flat tensor, instead of a list of per-record tensors. Combine it
+        with `LengthBucketSampler` and `PaddingCollator` to batch it.
+
+    `stream` formats records lazily instead, as a `StreamingTorchNERDataset`.
     """
 
+    def __init__(self, contiguous: bool = False):
+        self.contiguous = contiguous
+
     def format(self, records: List[ChiselRecord]) -> Dataset:
-        formatted = []
+        if self.contiguous:
+            return self._format_contiguous(records)
+        return TorchNERDataset([self._item(record) for record in records])
+
+    def stream(
+        self,
+        source: Union[Iterable, Callable[[], Iterable]],
+        process: Optional[Callable[[Any], Iterable[ChiselRecord]]] = None,
+        shuffle_buffer: int = 0,
+        seed: Optional[int] = None,
+    ) -> "StreamingTorchNERDataset":
+        """
+        Returns an IterableDataset that formats records as they are produced, so that
+        training can start before preprocessing has finished. See
+        `StreamingTorchNERDataset` for the arguments.
+        """
+        return StreamingTorchNERDataset(source, process, shuffle_buffer, seed)
+
+    @classmethod
+    def _item(cls, record: ChiselRecord) -> Dict[str, torch.Tensor]:
+        item = {
+            "input_ids": torch.tensor(record.input_ids, dtype=torch.long),
+            "attention_mask": torch.tensor(record.attention_mask, dtype=torch.long),
+            "labels": torch.tensor(record.labels, dtype=torch.long),
+        }
+        if record.position_ids is not None:
+            item["position_ids"] = torch.tensor(record.position_ids, dtype=torch.long)
+        if record.multi_labels is not None:
+            item["multi_labels"] = torch.from_numpy(cls._multi_hot(record.multi_labels))
+        return item
+
+    def _format_contiguous(
+        self, records: List[ChiselRecord]
+    ) -> ContiguousTorchNERDataset:
+        if not records:
+            return ContiguousTorchNERDataset(
+                {
+                    name: torch.zeros(0, dtype=torch.long)
+                    for name in ("input_ids", "attention_mask", "labels")
+                },
+                torch.zeros(1, dtype=torch.long),
+            )
+        lengths = np.fromiter(
+            (len(r.input_ids) for r in records), dtype=np.int64, count=len(records)
+        )
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        total = int(offsets[-1])
+
+        values = {}
+        for name in _FIELDS + ("multi_labels",):
+            present = [getattr(r, name) is not None for r in records]
+            if not any(present):
+                if name in ("input_ids", "attention_mask", "labels"):
+                    raise ValueError(f"All records must have {name}.")
+                continue
+            if not all(present):
+                raise ValueError(f"Either all records or none must have {name}.")
+            if name == "multi_labels":
+                values[name] = torch.from_numpy(
+                    np.concatenate(
+                        [self._multi_hot(r.multi_labels) for r in records]
+                    ).astype(bool)
+                )
+                continue
+            values[name] = torch.from_numpy(
+                np.fromiter(
+                    chain.from_iterable(getattr(r, name) for r in records),
+                    dtype=np.int64,
+                    count=total,
+                )
+            )
+        return ContiguousTorchNERDataset(values, torch.from_numpy(offsets))
+
+    @staticmethod
+    def _multi_hot(matrix) -> np.ndarray:
+        if isinstance(matrix, TokenLabelMatrix):
+            matrix = matrix.to_dense()
+        return np.asarray(matrix, dtype=np.float32)
+
+
+class StreamingTorchNERDataset(IterableDataset):
+    """
+    IterableDataset over a stream of ChiselRecords, formatted like
+    `TorchDatasetFormatter` as they arrive.
+
+    With several DataLoader workers, the stream is split deterministically: worker `w`
+    of `n` (from `get_worker_info`) takes the items at positions ``w, w + n, ...``.
+    When `process` is given, the split happens on the raw `source` items (e.g.
+    documents) before they are processed, so every worker only preprocesses its own
+    share; otherwise every worker iterates the full record stream and skips the records
+    of the other workers.
+
+    Parameters
+    ----------
+    source : Union[Iterable, Callable[[], Iterable]]
+        The records (or raw items, with `process`). A callable is called anew for every
+        epoch in every worker; a plain iterator can only be consumed once and must not
+        be used with spawned workers.
+    process : Optional[Callable[[Any], Iterable[ChiselRecord]]]
+        Turns one source item into its records, e.g. parse, tokenize, chunk and label
+        one document.
+    shuffle_buffer : int
+        If above 1, records are yielded in random order from a buffer of this many
+        records. 0 keeps the stream order.
+    seed : Optional[int]
+        Seed of the shuffle buffer; combined with the epoch (see `set_epoch`) and the
+        worker id, so every epoch and worker gets a different, reproducible order.
+    """
+
+    def __init__(
+        self,
+        source: Union[Iterable, Callable[[], Iterable]],
+        process: Optional[Callable[[Any], Iterable[ChiselRecord]]] = None,
+        shuffle_buffer: int = 0,
+        seed: Optional[int] = None,
+    ):
+        if shuffle_buffer < 0:
+            raise ValueError("shuffle_buffer must be non-negative.")
+        self.source = source
+        self.process = process
+        self.shuffle_buffer = shuffle_buffer
+        self.seed = seed
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int) -> None:
+        """Sets the epoch that seeds the shuffle buffer, as with `DistributedSampler`."""
+        self.epoch = epoch
+
+    def __iter__(self) -> Iterator[Dict[str, torch.Tensor]]:
+        worker = get_worker_info()
+        worker_id, num_workers = (
+            (0, 1) if worker is None else (worker.id, worker.num_workers)
+        )
+        source = self.source() if callable(self.source) else self.source
+
+        if self.process is not None:
+            shard = islice(source, worker_id, None, num_workers)
+            records = chain.from_iterable(map(self.process, shard))
+        else:
+            records = islice(source, worker_id, None, num_workers)
+
+        if self.shuffle_buffer > 1:
+            seed = None if self.seed is None else [self.seed, self.epoch, worker_id]
+            records = self._shuffle(records, np.random.default_rng(seed))
         for record in records:
-            item = {
-                "input_ids": torch.tensor(record.input_ids, dtype=torch.long),
-                "attention_mask": torch.tensor(record.attention_mask, dtype=torch.long),
-                "labels": torch.tensor(record.labels, dtype=torch.long),
-            }
-            formatted.append(item)
-        return TorchNERDataset(formatted)
+            yield TorchDatasetFormatter._item(record)
+
+    def _shuffle(
+        self, records: Iterable[ChiselRecord], rng: np.random.Generator
+    ) -> Iterator[ChiselRecord]:
+        buffer: List[ChiselRecord] = []
+        for record in records:
+            if len(buffer) < self.shuffle_buffer:
+                buffer.append(record)
+                continue
+            k = int(rng.integers(len(buffer)))
+            yield buffer[k]
+            buffer[k] = record
+        for k in rng.permutation(len(buffer)).tolist():
+            yield buffer[k]
+
+
+class LengthBucketSampler(Sampler[List[int]]):
+    """
+    Batch sampler that groups records of similar length, so that dynamic padding
+    (see `PaddingCollator`) adds few pad tokens.
+
+    Indices are shuffled, split into buckets of ``batch_size * bucket_batches`` records,
+    sorted by length within each bucket and cut into batches; the batches are then
+    shuffled. Batches stay random across epochs while every batch holds records of
+    nearly the same length.
+
+    Parameters
+    ----------
+    lengths : Sequence[int]
+        Length of every record, e.g. `ContiguousTorchNERDataset.lengths`.
+    batch_size : int
+        Number of records per batch.
+    bucket_batches : int
+        Number of batches per bucket; larger buckets give tighter length groups but
+        less random batches.
+    shuffle : bool
+        If False, batches are formed from the records sorted by length, in order.
+    drop_last : bool
+        Whether to drop the last, smaller batch of every bucket.
+    seed : Optional[int]
+        Seed of the shuffling; every epoch draws a new permutation.
+    """
+
+    def __init__(
+        self,
+        lengths: Sequence[int],
+        batch_size: int,
+        bucket_batches: int = 50,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        seed: Optional[int] = None,
+    ):
+        if batch_size < 1 or bucket_batches < 1:
+            raise ValueError("batch_size and bucket_batches must be at least 1.")
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.batch_size = batch_size
+        self.bucket_batches = bucket_batches
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self._rng = np.random.default_rng(seed)
+
+    def __iter__(self) -> Iterator[List[int]]:
+        n = len(self.lengths)
+        if not self.shuffle:
+            order = np.argsort(self.lengths, kind="stable")
+            yield from self._batches(order)
+            return
+
+        order = self._rng.permutation(n)
+        bucket_size = self.batch_size * self.bucket_batches
+        batches = []
+        for start in range(0, n, bucket_size):
+            bucket = order[start : start + bucket_size]
+            bucket = bucket[np.argsort(self.lengths[bucket], kind="stable")]
+            batches.extend(self._batches(bucket))
+        for k in self._rng.permutation(len(batches)).tolist():
+            yield batches[k]
+
+    def __len__(self) -> int:
+        n = len(self.lengths)
+        bucket_size = self.batch_size * self.bucket_batches if self.shuffle else n
+        sizes = [min(bucket_size, n - s) for s in range(0, n, max(1, bucket_size))]
+        if self.drop_last:
+            return sum(size // self.batch_size for size in sizes)
+        return sum(-(-size // self.batch_size) for size in sizes)
+
+    def _batches(self, indices: np.ndarray) -> List[List[int]]:
+        batches = [
+            indices[start : start + self.batch_size].tolist()
+            for start in range(0, len(indices), self.batch_size)
+        ]
+        if self.drop_last and batches and len(batches[-1]) < self.batch_size:
+            batches.pop()
+        return batches
+
+
+class PaddingCollator:
+    """
+    Collate function that pads every batch only to its own longest record.
+
+    Integer fields are returned as int64, whatever dtype the items use.
+
+    Parameters
+    ----------
+    pad_token_id : int
+        Padding value of `input_ids`.
+    label_pad_id : int
+        Padding value of `labels`, ignored by the loss.
+    pad_to_multiple_of : Optional[int]
+        If set, the padded length is rounded up to a multiple of it (e.g. 8 for tensor
+        cores).
+    """
+
+    def __init__(
+        self,
+        pad_token_id: int = 0,
+        label_pad_id: int = IGNORE_INDEX,
+        pad_to_multiple_of: Optional[int] = None,
+    ):
+        self.pad_token_id = pad_token_id
+        self.label_pad_id = label_pad_id
+        self.pad_to_multiple_of = pad_to_multiple_of
+
+    def __call__(self, items: List[Dict[str, torch.Tensor]]) -> Dict[str, torch.Tensor]:
+        length = max(len(item["input_ids"]) for item in items)
+        if self.pad_to_multiple_of:
+            length = -(-length // self.pad_to_multiple_of) * self.pad_to_multiple_of
+
+        pad_values = {"input_ids": self.pad_token_id, "labels": self.label_pad_id}
+        batch = {}
+        for name in items[0]:
+            value = pad_values.get(name, 0)
+            padded = pad_sequence(
+                [item[name] for item in items], batch_first=True, padding_value=value
+            )
+            if not padded.is_floating_point() and padded.dtype != torch.bool:
+                # Compact stored dtypes (see `MemmapTorchNERDataset`) become int64.
+                padded = padded.long()
+            extra = length - padded.shape[1]
+            if extra:
+                # Pads dimension 1 only; `multi_labels` has a trailing tag dimension.
+                padded = F.pad(
+                    padded, [0, 0] * (padded.dim() - 2) + [0, extra], value=value
+                )
+            batch[name] = padded
+        return batch
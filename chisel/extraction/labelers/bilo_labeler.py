@@ -1,5 +1,15 @@
-from typing import List
+from typing import List, Union
+import numpy as np
+from chisel.extraction.labelers.label_encoder import SimpleLabelEncoder
 from chisel.extraction.models.models import Token, TokenEntitySpan
+from chisel.extraction.models.sequences import (
+    SpanSet,
+    TokenSequence,
+    expand_ranges,
+    has_overlaps,
+    iter_token_ranges,
+    token_range_arrays,
+)
 from chisel.extraction.base.protocols import Labeler
 
 
@@ -16,22 +26,66 @@ class BILOLabeler(Labeler):
     """
 
     def label(
-        self, tokens: List[Token], token_entity_spans: List[TokenEntitySpan]
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        token_entity_spans: Union[List[TokenEntitySpan], SpanSet],
     ) -> List[str]:
         labels = ["O"] * len(tokens)
 
-        for span in token_entity_spans:
-            indices = span.token_indices
+        for k, (indices, label) in enumerate(iter_token_ranges(token_entity_spans)):
             n = len(indices)
 
             if n == 1:
-                labels[indices[0]] = f"U-{span.entity.label}"
+                labels[indices[0]] = f"U-{label}"
             elif n >= 2:
-                labels[indices[0]] = f"B-{span.entity.label}"
+                labels[indices[0]] = f"B-{label}"
                 for idx in indices[1:-1]:
-                    labels[idx] = f"I-{span.entity.label}"
-                labels[indices[-1]] = f"L-{span.entity.label}"
+                    labels[idx] = f"I-{label}"
+                labels[indices[-1]] = f"L-{label}"
             else:
-                raise ValueError(f"TokenEntitySpan with no token indices: {span}")
+                raise ValueError(
+                    f"TokenEntitySpan with no token indices: {token_entity_spans[k]}"
+                )
 
         return labels
+
+    def label_ids(
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        token_entity_spans: Union[List[TokenEntitySpan], SpanSet],
+        encoder: SimpleLabelEncoder,
+    ) -> np.ndarray:
+        """
+        Returns the encoded BILOU label ids, equal to ``encoder.encode(self.label(...))``.
+
+        The B/I/L/U ids of every entity type are looked up once and all spans are
+        written with array operations, so no label string is built per token.
+        """
+        arrays = token_range_arrays(token_entity_spans)
+        if arrays is None or has_overlaps(arrays[0], arrays[1]):
+            # Later spans overwrite earlier ones token by token.
+            return np.asarray(
+                encoder.encode(self.label(tokens, token_entity_spans)), dtype=np.int64
+            )
+        firsts, stops, labels = arrays
+
+        lengths = stops - firsts
+        if (lengths <= 0).any():
+            k = int(np.flatnonzero(lengths <= 0)[0])
+            raise ValueError(
+                f"TokenEntitySpan with no token indices: {token_entity_spans[k]}"
+            )
+
+        (outside,) = encoder.encode(["O"])
+        ids = np.full(len(tokens), outside, dtype=np.int64)
+        unit = lengths == 1
+        if unit.any():
+            (ids[firsts[unit]],) = encoder.scheme_id_arrays(labels[unit], "U")
+        multi = ~unit
+        if multi.any():
+            firsts, stops, labels = firsts[multi], stops[multi], labels[multi]
+            begin, inside, last = encoder.scheme_id_arrays(labels, "BIL")
+            ids[expand_ranges(firsts, stops)] = np.repeat(inside, stops - firsts)
+            ids[firsts] = begin
+            ids[stops - 1] = last
+        return ids
@@ -1,5 +1,14 @@
-from typing import List
+from typing import List, Union
+import numpy as np
+from chisel.extraction.labelers.label_encoder import SimpleLabelEncoder
 from chisel.extraction.models.models import Token, TokenEntitySpan
+from chisel.extraction.models.sequences import (
+    SpanSet,
+    TokenSequence,
+    expand_ranges,
+    iter_token_ranges,
+    token_range_arrays,
+)
 from chisel.extraction.base.protocols import Labeler
 
 
@@ -14,12 +23,38 @@ class BinaryLabeler(Labeler):
     """
 
     def label(
-        self, tokens: List[Token], token_entity_spans: List[TokenEntitySpan]
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        token_entity_spans: Union[List[TokenEntitySpan], SpanSet],
     ) -> List[str]:
         labels = ["O"] * len(tokens)
 
-        for span in token_entity_spans:
-            for idx in span.token_indices:
+        for indices, _ in iter_token_ranges(token_entity_spans):
+            for idx in indices:
                 labels[idx] = "ENTITY"
 
         return labels
+
+    def label_ids(
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        token_entity_spans: Union[List[TokenEntitySpan], SpanSet],
+        encoder: SimpleLabelEncoder,
+    ) -> np.ndarray:
+        """
+        Returns the encoded binary label ids, equal to ``encoder.encode(self.label(...))``,
+        writing all spans with one array assignment.
+        """
+        arrays = token_range_arrays(token_entity_spans)
+        if arrays is None:
+            return np.asarray(
+                encoder.encode(self.label(tokens, token_entity_spans)), dtype=np.int64
+            )
+        firsts, stops, _ = arrays
+
+        (outside,) = encoder.encode(["O"])
+        ids = np.full(len(tokens), outside, dtype=np.int64)
+        positions = expand_ranges(firsts, stops)
+        if len(positions):
+            (ids[positions],) = encoder.encode(["ENTITY"])
+        return ids
@@ -1,7 +1,17 @@
 import logging
-from typing import List, Literal
+from typing import List, Literal, Union
+import numpy as np
 from chisel.extraction.base.protocols import Labeler
+from chisel.extraction.labelers.label_encoder import SimpleLabelEncoder
 from chisel.extraction.models.models import Token, TokenEntitySpan
+from chisel.extraction.models.sequences import (
+    SpanSet,
+    TokenSequence,
+    expand_ranges,
+    has_overlaps,
+    iter_token_ranges,
+    token_range_arrays,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,19 +26,15 @@ class BIOLabeler(Labeler):
         self.misalignment_policy = misalignment_policy
 
     def label(
-        self, tokens: List[Token], token_entity_spans: List[TokenEntitySpan]
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        token_entity_spans: Union[List[TokenEntitySpan], SpanSet],
     ) -> List[str]:
         labels = ["O"] * len(tokens)
 
-        for span in token_entity_spans:
-            indices = span.token_indices
-            label = span.entity.label
+        for k, (indices, label) in enumerate(iter_token_ranges(token_entity_spans)):
             if not indices:
-                message = f"No aligned tokens for entity: {span.entity}"
-                if self.misalignment_policy == "warn":
-                    logger.warning(message)
-                elif self.misalignment_policy == "fail":
-                    raise ValueError(message)
+                self._misaligned(token_entity_spans, k)
                 continue
 
             if len(indices) == 1:
@@ -39,3 +45,42 @@ class BIOLabeler(Labeler):
                     labels[i] = f"I-{label}"
 
         return labels
+
+    def label_ids(
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        token_entity_spans: Union[List[TokenEntitySpan], SpanSet],
+        encoder: SimpleLabelEncoder,
+    ) -> np.ndarray:
+        """
+        Returns the encoded BIO label ids, equal to ``encoder.encode(self.label(...))``.
+
+        The B/I ids of every entity type are looked up once and all spans are written
+        with array operations, so no label string is built per token.
+        """
+        arrays = token_range_arrays(token_entity_spans)
+        if arrays is None or has_overlaps(arrays[0], arrays[1]):
+            # Later spans overwrite earlier ones token by token.
+            return np.asarray(
+                encoder.encode(self.label(tokens, token_entity_spans)), dtype=np.int64
+            )
+        firsts, stops, labels = arrays
+
+        (outside,) = encoder.encode(["O"])
+        ids = np.full(len(tokens), outside, dtype=np.int64)
+        aligned = stops > firsts
+        for k in np.flatnonzero(~aligned).tolist():
+            self._misaligned(token_entity_spans, k)
+        firsts, stops, labels = firsts[aligned], stops[aligned], labels[aligned]
+        if len(firsts):
+            begin, inside = encoder.scheme_id_arrays(labels, "BI")
+            ids[expand_ranges(firsts, stops)] = np.repeat(inside, stops - firsts)
+            ids[firsts] = begin
+        return ids
+
+    def _misaligned(self, token_entity_spans, k: int) -> None:
+        message = f"No aligned tokens for entity: {token_entity_spans[k].entity}"
+        if self.misalignment_policy == "warn":
+            logger.warning(message)
+        elif self.misalignment_policy == "fail":
+            raise ValueError(message)
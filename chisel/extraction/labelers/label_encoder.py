@@ -1,5 +1,10 @@
 import warnings
-from typing import Dict, List, Optional
+from collections import Counter
+from itertools import chain, repeat
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+IGNORE_INDEX = -100
 
 
 class SimpleLabelEncoder:
@@ -34,6 +39,15 @@ class SimpleLabelEncoder:
 
     label_normalizer : Dict[str, str]
         The mapping used for label normalization.
+
+    Notes
+    -----
+    Labels are interned once at initialization: every known (or normalizable) label is
+    mapped straight to its id, and ids (negative ones included) are decoded through an
+    array indexed from the smallest id, unless they are too sparse for one.
+    `encode_batch` / `decode_batch` work on whole batches with flat NumPy buffers, and
+    with ``strict=False`` unknown labels are counted and reported in a single warning
+    per call instead of one warning per token.
     """
 
     def __init__(
@@ -46,6 +60,7 @@ class SimpleLabelEncoder:
         self.id_to_label = {v: k for k, v in self.label_to_id.items()}
         self.label_normalizer = label_normalizer or {}
         self.strict = strict
+        self._scheme_ids: Dict[Tuple[str, str], Tuple[int, ...]] = {}
 
         for original, mapped in self.label_normalizer.items():
             if mapped not in self.label_to_id:
@@ -57,30 +72,173 @@ class SimpleLabelEncoder:
         if not self.strict and "O" not in self.label_to_id:
             raise ValueError("Label 'O' must be in label_to_id if strict=False.")
 
+        # label (raw or normalizable) -> id, and id -> label
+        self._lookup = dict(self.label_to_id)
+        for original, mapped in self.label_normalizer.items():
+            self._lookup[original] = self.label_to_id[mapped]
+        # Ids may be negative (e.g. IGNORE_INDEX); the table starts at the smallest one.
+        # Sparse ids would make the table huge, so they are decoded through the dict.
+        self._id_base = min(self.id_to_label, default=0)
+        size = max(self.id_to_label, default=0) - self._id_base + 1
+        self._id_table: Optional[np.ndarray] = None
+        if size <= 4 * len(self.id_to_label) + 16:
+            self._id_table = np.full(size, None, dtype=object)
+            for i, label in self.id_to_label.items():
+                self._id_table[i - self._id_base] = label
+
     def encode(self, labels: List[str]) -> List[int]:
-        encoded = []
-        for label in labels:
-            normalized = self.label_normalizer.get(label, label)
-            if normalized not in self.label_to_id:
-                if self.strict:
-                    raise ValueError(
-                        f"Unknown label '{label}' (normalized as '{normalized}'). To replace with 'O', set strict=False."
-                    )
-                warnings.warn(
-                    f"Unknown label '{label}' (normalized as '{normalized}'). "
-                    f"Substituting with 'O'."
-                )
-                normalized = "O"
-            encoded.append(self.label_to_id[normalized])
+        lookup = self._lookup
+        encoded = [lookup.get(label) for label in labels]
+        if None in encoded:
+            unknown = [label for label in labels if label not in lookup]
+            replacement = self._unknown(unknown)
+            encoded = [replacement if i is None else i for i in encoded]
         return encoded
 
+    def encode_batch(
+        self,
+        label_sequences: Sequence[Sequence[str]],
+        padding: bool = False,
+        pad_id: int = IGNORE_INDEX,
+    ) -> Union[Tuple[np.ndarray, np.ndarray], np.ndarray]:
+        """
+        Encodes many label sequences at once.
+
+        Returns ``(ids, offsets)``: the ids of all sequences in one flat int64 array, and
+        the ``len(label_sequences) + 1`` offsets such that sequence `i` is
+        ``ids[offsets[i]:offsets[i + 1]]``. With ``padding=True`` a
+        ``(len(label_sequences), longest)`` array padded with `pad_id` is returned instead.
+        """
+        lengths = np.fromiter(
+            map(len, label_sequences), dtype=np.int64, count=len(label_sequences)
+        )
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        flat_labels = list(chain.from_iterable(label_sequences))
+        # Any id can be a valid label id, so unknown labels are tracked in a mask.
+        known = np.fromiter(
+            map(self._lookup.__contains__, flat_labels),
+            dtype=bool,
+            count=len(flat_labels),
+        )
+        ids = np.fromiter(
+            map(self._lookup.get, flat_labels, repeat(0)),
+            dtype=np.int64,
+            count=len(flat_labels),
+        )
+
+        unknown = np.flatnonzero(~known)
+        if len(unknown):
+            ids[unknown] = self._unknown([flat_labels[k] for k in unknown.tolist()])
+
+        if not padding:
+            return ids, offsets
+        padded = np.full(
+            (len(lengths), int(lengths.max(initial=0))), pad_id, dtype=np.int64
+        )
+        padded[np.arange(padded.shape[1]) < lengths[:, None]] = ids
+        return padded
+
+    def _unknown(self, labels: List[str]) -> int:
+        """Handles the unknown labels of one call; returns the id that replaces them."""
+        counts = Counter(labels)
+        descriptions = [
+            f"Unknown label '{label}' "
+            f"(normalized as '{self.label_normalizer.get(label, label)}')"
+            for label in counts
+        ]
+        if self.strict:
+            raise ValueError(
+                f"{descriptions[0]}. To replace with 'O', set strict=False."
+            )
+        warnings.warn(
+            f"Substituting {len(labels)} unknown labels with 'O': "
+            + "; ".join(
+                f"{description} x{count}"
+                for description, count in zip(descriptions, counts.values())
+            )
+            + "."
+        )
+        return self.label_to_id["O"]
+
+    def scheme_ids(self, entity_label: str, prefixes: str) -> Tuple[int, ...]:
+        """
+        Returns the ids of ``f"{prefix}-{entity_label}"`` for each prefix, e.g. the B/I ids
+        of an entity type for ``prefixes="BI"``.
+
+        Labels go through `encode`, so normalization and unknown-label handling are the
+        same; the result is cached per entity type, which lets labelers emit label ids
+        without building a label string per token.
+        """
+        key = (entity_label, prefixes)
+        ids = self._scheme_ids.get(key)
+        if ids is None:
+            ids = tuple(
+                self.encode([f"{prefix}-{entity_label}" for prefix in prefixes])
+            )
+            self._scheme_ids[key] = ids
+        return ids
+
+    def scheme_id_arrays(
+        self, entity_labels: Sequence[str], prefixes: str
+    ) -> np.ndarray:
+        """
+        Returns an array of shape ``(len(prefixes), len(entity_labels))`` holding
+        `scheme_ids` for every entity label; each distinct label is looked up once.
+        """
+        codes: Dict[str, int] = {}
+        inverse = np.fromiter(
+            (codes.setdefault(label, len(codes)) for label in entity_labels),
+            dtype=np.int64,
+            count=len(entity_labels),
+        )
+        table = np.array(
+            [self.scheme_ids(label, prefixes) for label in codes], dtype=np.int64
+        ).reshape(len(codes), len(prefixes))
+        return table[inverse].T
+
     def decode(self, ids: List[int]) -> List[str]:
-        decoded = []
-        for i in ids:
-            if i not in self.id_to_label:
-                raise ValueError(f"Unknown ID '{i}' encountered during decoding.")
-            decoded.append(self.id_to_label[i])
-        return decoded
+        try:
+            return [self.id_to_label[i] for i in ids]
+        except KeyError as e:
+            raise ValueError(
+                f"Unknown ID '{e.args[0]}' encountered during decoding."
+            ) from None
+
+    def decode_batch(
+        self,
+        ids: np.ndarray,
+        offsets: Optional[np.ndarray] = None,
+        pad_id: int = IGNORE_INDEX,
+    ) -> List[List[str]]:
+        """
+        Decodes the output of `encode_batch`: either flat ids with their offsets, or a
+        padded 2-D array, in which case entries equal to `pad_id` are skipped.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if offsets is None:
+            if ids.ndim != 2:
+                raise ValueError("Flat ids need offsets; pass a 2-D array otherwise.")
+            keep = ids != pad_id
+            offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+            np.cumsum(keep.sum(axis=1), out=offsets[1:])
+            ids = ids[keep]
+        labels = self._decode_flat(ids)
+        bounds = np.asarray(offsets).tolist()
+        return [labels[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def _decode_flat(self, ids: np.ndarray) -> List[str]:
+        if self._id_table is None:
+            return self.decode(ids.tolist())
+        positions = ids - self._id_base
+        valid = (positions >= 0) & (positions < len(self._id_table))
+        labels = self._id_table[np.where(valid, positions, 0)]
+        invalid = ~valid | np.equal(labels, None)
+        if invalid.any():
+            raise ValueError(
+                f"Unknown ID '{ids[np.argmax(invalid)]}' encountered during decoding."
+            )
+        return labels.tolist()
 
     def get_label_to_id(self) -> Dict[str, int]:
         return self.label_to_id
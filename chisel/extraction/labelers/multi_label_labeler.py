@@ -0,0 +1,155 @@
+import logging
+from typing import List, Literal, Sequence, Tuple, Union
+import numpy as np
+from chisel.extraction.models.models import Token, TokenEntitySpan
+from chisel.extraction.models.sequences import (
+    SpanSet,
+    TokenLabelMatrix,
+    TokenSequence,
+    expand_ranges,
+)
+
+logger = logging.getLogger(__name__)
+
+_SCHEME_PREFIXES = {"bio": "BI", "bilou": "BILU"}
+
+
+class MultiLabelLabeler:
+    """
+    Assigns every tag of every entity to its tokens, so overlapping and nested entities
+    (e.g. from `HTMLTagParser(allow_nested=True)`) keep all their labels.
+
+    Instead of one label per token, the result is a boolean matrix of shape
+    ``(tokens, tags)`` with one column per scheme tag (e.g. "B-PER", "I-PER", ...);
+    a token outside every entity has no tag set, which plays the role of "O". All spans
+    are written with array operations, and the sparse output (a CSR `TokenLabelMatrix`)
+    only stores the tags that are set, so label sets with hundreds of tags stay cheap.
+
+    Parameters
+    ----------
+    entity_labels : Sequence[str]
+        The entity types, e.g. ``["PER", "LOC"]``. Their order defines the tag columns:
+        all prefixes of the first type, then all prefixes of the second, and so on.
+    scheme : Literal["bio", "bilou"]
+        Tagging scheme of every entity, as in `BIOLabeler` / `BILOLabeler`.
+    sparse : bool
+        If True, `label_matrix` returns a `TokenLabelMatrix`, otherwise a dense boolean
+        NumPy array.
+    misalignment_policy : Literal["skip", "warn", "fail"]
+        How to handle entities aligned to no tokens: skip them, log a warning, or raise
+        a ValueError.
+    """
+
+    def __init__(
+        self,
+        entity_labels: Sequence[str],
+        scheme: Literal["bio", "bilou"] = "bio",
+        sparse: bool = False,
+        misalignment_policy: Literal["skip", "warn", "fail"] = "skip",
+    ):
+        if scheme not in _SCHEME_PREFIXES:
+            raise ValueError(f"Unsupported labeling scheme: {scheme}")
+        if misalignment_policy not in ("skip", "warn", "fail"):
+            raise ValueError(f"Unsupported misalignment policy: {misalignment_policy}")
+        self.entity_labels = list(entity_labels)
+        self.scheme = scheme
+        self.sparse = sparse
+        self.misalignment_policy = misalignment_policy
+        self._label_index = {label: k for k, label in enumerate(self.entity_labels)}
+        if len(self._label_index) != len(self.entity_labels):
+            raise ValueError("entity_labels must not contain duplicates.")
+
+    @property
+    def tags(self) -> List[str]:
+        """Name of every column of the label matrix."""
+        prefixes = _SCHEME_PREFIXES[self.scheme]
+        return [f"{p}-{label}" for label in self.entity_labels for p in prefixes]
+
+    def label(
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        token_entity_spans: Union[List[TokenEntitySpan], SpanSet],
+    ) -> List[List[str]]:
+        """Returns the tag names of every token, for inspection and debugging."""
+        matrix = self.label_matrix(tokens, token_entity_spans)
+        if not isinstance(matrix, TokenLabelMatrix):
+            matrix = TokenLabelMatrix.from_dense(matrix, self.tags)
+        return matrix.to_tags()
+
+    def label_matrix(
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        token_entity_spans: Union[List[TokenEntitySpan], SpanSet],
+    ) -> Union[np.ndarray, TokenLabelMatrix]:
+        """Returns the ``(tokens, tags)`` boolean matrix, dense or sparse (see `sparse`)."""
+        n_tokens = len(tokens)
+        n_tags = len(self.tags)
+        rows, columns = self._positions(token_entity_spans)
+
+        if not self.sparse:
+            matrix = np.zeros((n_tokens, n_tags), dtype=bool)
+            matrix[rows, columns] = True
+            return matrix
+
+        # One sorted, de-duplicated key per set cell gives the CSR layout directly.
+        keys = np.unique(rows * n_tags + columns)
+        indptr = np.searchsorted(keys, np.arange(n_tokens + 1) * n_tags)
+        return TokenLabelMatrix(indptr, keys % n_tags, self.tags)
+
+    def _positions(self, token_entity_spans) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the row (token) and column (tag) of every tag assignment."""
+        if isinstance(token_entity_spans, SpanSet):
+            firsts = token_entity_spans.token_starts
+            stops = token_entity_spans.token_ends
+            lengths = np.maximum(stops - firsts, 0)
+            rows = expand_ranges(firsts, firsts + lengths)
+            labels = token_entity_spans.labels
+        else:
+            indices = [span.token_indices for span in token_entity_spans]
+            lengths = np.fromiter(map(len, indices), dtype=np.int64, count=len(indices))
+            rows = np.fromiter(
+                (i for span in indices for i in span),
+                dtype=np.int64,
+                count=lengths.sum(),
+            )
+            labels = [span.entity.label for span in token_entity_spans]
+
+        for k in np.flatnonzero(lengths == 0).tolist():
+            self._misaligned(token_entity_spans, k)
+
+        label_ids = np.fromiter(
+            (self._label_id(label) for label in labels),
+            dtype=np.int64,
+            count=len(lengths),
+        )
+        span_ids = np.repeat(np.arange(len(lengths)), lengths)
+        # Position of every token within its entity, and the entity length.
+        span_starts = np.cumsum(lengths) - lengths
+        offsets = np.arange(len(rows)) - span_starts[span_ids]
+        span_lengths = lengths[span_ids]
+
+        prefixes = _SCHEME_PREFIXES[self.scheme]
+        prefix = np.full(len(rows), prefixes.index("I"), dtype=np.int64)
+        if self.scheme == "bilou":
+            prefix[offsets == span_lengths - 1] = prefixes.index("L")
+            prefix[offsets == 0] = prefixes.index("B")
+            prefix[span_lengths == 1] = prefixes.index("U")
+        else:
+            prefix[offsets == 0] = prefixes.index("B")
+        columns = label_ids[span_ids] * len(prefixes) + prefix
+        return rows, columns
+
+    def _label_id(self, label: str) -> int:
+        try:
+            return self._label_index[label]
+        except KeyError:
+            raise ValueError(
+                f"Unknown entity label '{label}'; expected one of {self.entity_labels}."
+            ) from None
+
+    def _misaligned(self, token_entity_spans, k: int) -> None:
+        message = f"No aligned tokens for entity: {token_entity_spans[k].entity}"
+        if self.misalignment_policy == "warn":
+            logger.warning(message)
+        elif self.misalignment_policy == "fail":
+            raise ValueError(message)
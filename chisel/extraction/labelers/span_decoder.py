@@ -0,0 +1,309 @@
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Union
+import numpy as np
+from chisel.extraction.base.protocols import LabelAlignmentValidator
+from chisel.extraction.labelers.label_encoder import IGNORE_INDEX, SimpleLabelEncoder
+from chisel.extraction.models.models import (
+    EntitySpan,
+    Token,
+    TokenEntitySpan,
+    ValidationIssue,
+)
+from chisel.extraction.models.sequences import (
+    SpanSet,
+    TokenSequence,
+    iter_token_ranges,
+)
+from chisel.extraction.validators.report import ValidationReport
+
+# Prefix codes; "E-"/"S-" (BIOES) are read as "L-"/"U-".
+_O, _B, _I, _L, _U = range(5)
+_PREFIXES = {"B": _B, "I": _I, "L": _L, "E": _L, "U": _U, "S": _U}
+
+
+class SpanDecoder(LabelAlignmentValidator):
+    """
+    Decodes BIO/BILOU label ids back into entity spans.
+
+    Every label id is mapped once to a (prefix, entity type) pair, and entity boundaries
+    are found with array comparisons between neighbouring tokens instead of a per-token
+    state machine; batches are concatenated and decoded in one pass. A token continues
+    the entity of the previous token if both have the same type, the previous token is
+    B/I and the current one is I/L; any other tagged token starts a new entity (so, as
+    in conlleval, an "I-" after "O" starts an entity). Labels without a prefix (e.g.
+    "ENTITY" from `BinaryLabeler`) are read as "I-", so a run of them forms one entity.
+
+    Character offsets are taken from the token offsets, so with tokens from the clean
+    text of a parser (e.g. `HTMLTagParser`) the spans point into that clean text.
+
+    The decoder is also a `LabelAlignmentValidator`: `validate` checks that a label
+    sequence decodes back to exactly the expected token entity spans and records the
+    differences in a `ValidationReport`.
+
+    Parameters
+    ----------
+    label_to_id : Union[Dict[str, int], SimpleLabelEncoder]
+        The label mapping used to encode the labels, or the encoder itself.
+    ignore_index : int
+        Label id of tokens that carry no label (e.g. non-first subwords); such tokens
+        take the label of the previous token. Label ids may be negative.
+    on_error : Literal["warn", "raise"]
+        What `validate` does when the labels do not match the expected spans: record
+        the differences in the report, or raise a ValueError.
+    """
+
+    def __init__(
+        self,
+        label_to_id: Union[Dict[str, int], SimpleLabelEncoder],
+        ignore_index: int = IGNORE_INDEX,
+        on_error: Literal["warn", "raise"] = "warn",
+    ):
+        if isinstance(label_to_id, SimpleLabelEncoder):
+            label_to_id = label_to_id.get_label_to_id()
+        self.label_to_id = dict(label_to_id)
+        self.ignore_index = ignore_index
+        self.on_error = on_error
+
+        self.entity_types: List[str] = []
+        type_index: Dict[str, int] = {}
+        # Tables are indexed by the position of an id among the sorted known ids, so
+        # sparse or negative ids cost nothing; the last slot is shared by all unknown
+        # ids, which decode as "O".
+        self._ids = np.unique(
+            np.fromiter(self.label_to_id.values(), np.int64, len(self.label_to_id))
+        )
+        self._prefix = np.zeros(len(self._ids) + 1, dtype=np.int8)
+        self._type = np.full(len(self._ids) + 1, -1, dtype=np.int64)
+        for label, i in self.label_to_id.items():
+            if label == "O":
+                continue
+            head, sep, tail = label.partition("-")
+            if sep and head in _PREFIXES:
+                prefix, entity_type = _PREFIXES[head], tail
+            else:
+                prefix, entity_type = _I, label
+            if entity_type not in type_index:
+                type_index[entity_type] = len(self.entity_types)
+                self.entity_types.append(entity_type)
+            slot = np.searchsorted(self._ids, i)
+            self._prefix[slot] = prefix
+            self._type[slot] = type_index[entity_type]
+
+    def decode(
+        self,
+        label_ids: Sequence[int],
+        tokens: Union[List[Token], TokenSequence, Any],
+        text: Optional[str] = None,
+    ) -> List[EntitySpan]:
+        """
+        Returns the entities of one sequence.
+
+        `tokens` gives the character offsets: a list of Token objects, a TokenSequence,
+        or an ``(n, 2)`` array of ``(start, end)`` pairs such as a Hugging Face
+        ``offset_mapping``. `label_ids` may be longer than `tokens` (padding), in which
+        case the extra ids are ignored. If `text` is given, entity texts are sliced from it.
+        """
+        return self.decode_batch(
+            [label_ids], [tokens], None if text is None else [text]
+        )[0]
+
+    def decode_batch(
+        self,
+        label_ids_batch: Union[Sequence[Sequence[int]], np.ndarray],
+        tokens_batch: Sequence[Union[List[Token], TokenSequence, Any]],
+        texts: Optional[Sequence[str]] = None,
+    ) -> List[List[EntitySpan]]:
+        """Returns the entities of every sequence, decoded in a single vectorized pass."""
+        results = []
+        for d, spans in enumerate(self.decode_spans(label_ids_batch, tokens_batch)):
+            text = "" if texts is None else texts[d]
+            results.append(
+                [
+                    EntitySpan.trusted(
+                        text=text[start:end],
+                        start=start,
+                        end=end,
+                        label=label,
+                        attributes={},
+                    )
+                    for start, end, label in zip(
+                        spans.starts.tolist(), spans.ends.tolist(), spans.labels
+                    )
+                ]
+            )
+        return results
+
+    def decode_spans(
+        self,
+        label_ids_batch: Union[Sequence[Sequence[int]], np.ndarray],
+        tokens_batch: Sequence[Union[List[Token], TokenSequence, Any]],
+    ) -> List[SpanSet]:
+        """
+        Returns the entities of every sequence as an aligned SpanSet (character offsets
+        plus the token range ``[token_start, token_end)`` of each entity), without
+        creating one object per entity.
+        """
+        if len(label_ids_batch) != len(tokens_batch):
+            raise ValueError(
+                "label_ids_batch and tokens_batch must have the same length."
+            )
+        offsets = [self._offsets(tokens) for tokens in tokens_batch]
+        lengths = np.array([len(starts) for starts, _ in offsets], dtype=np.int64)
+        for d, n in enumerate(lengths.tolist()):
+            if len(label_ids_batch[d]) < n:
+                raise ValueError(
+                    f"Sequence {d} has {n} tokens but {len(label_ids_batch[d])} label ids."
+                )
+
+        firsts, stops, types, doc_ids = self._token_ranges(
+            self._concatenate(label_ids_batch, lengths), lengths
+        )
+
+        bounds = np.searchsorted(doc_ids, np.arange(len(lengths) + 1))
+        doc_starts = np.cumsum(lengths) - lengths
+        entity_types = np.array(self.entity_types, dtype=object)
+        results = []
+        for d, (starts, ends) in enumerate(offsets):
+            window = slice(bounds[d], bounds[d + 1])
+            first = firsts[window] - doc_starts[d]
+            stop = stops[window] - doc_starts[d]
+            results.append(
+                SpanSet(
+                    starts=starts[first],
+                    ends=ends[stop - 1],
+                    labels=entity_types[types[window]],
+                    texts=[""] * len(first),
+                    token_starts=first,
+                    token_ends=stop,
+                )
+            )
+        return results
+
+    def validate(
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        labels: List[str],
+        token_entity_spans: Union[List[TokenEntitySpan], SpanSet],
+        doc_id: Optional[str] = None,
+        report: Optional[ValidationReport] = None,
+    ) -> ValidationReport:
+        """
+        Checks that `labels` decode back to exactly the expected token entity spans.
+
+        Expected spans that are not decoded (``missing_span``) and decoded spans that
+        are not expected (``unexpected_span``) are recorded in `report` (a new one if
+        None), which is returned. With ``on_error="raise"`` any difference raises a
+        ValueError instead.
+        """
+        report = ValidationReport() if report is None else report
+        try:
+            label_ids = [self.label_to_id[label] for label in labels]
+        except KeyError as e:
+            raise ValueError(
+                f"Unknown label {e.args[0]!r} in label sequence."
+            ) from None
+        (decoded,) = self.decode_spans([label_ids], [tokens])
+        found = set(
+            zip(
+                decoded.token_starts.tolist(),
+                decoded.token_ends.tolist(),
+                decoded.labels.tolist(),
+            )
+        )
+        expected = {
+            (indices[0], indices[-1] + 1, label)
+            for indices, label in iter_token_ranges(token_entity_spans)
+            if indices
+        }
+        missing, unexpected = sorted(expected - found), sorted(found - expected)
+
+        if (missing or unexpected) and self.on_error == "raise":
+            raise ValueError(
+                f"Label sequence does not match the entity spans:\n"
+                f"  Missing (token range, label): {missing}\n"
+                f"  Unexpected (token range, label): {unexpected}"
+            )
+        issues = [
+            ValidationIssue.trusted(
+                error=error,
+                message=f"{description} {label!r} at tokens [{start}:{stop}].",
+                doc_id=doc_id,
+                index=start,
+            )
+            for error, description, spans in (
+                ("missing_span", "Labels do not encode entity", missing),
+                ("unexpected_span", "Labels encode unexpected entity", unexpected),
+            )
+            for start, stop, label in spans
+        ]
+        report.update(len(expected | found), issues, len(issues))
+        return report
+
+    def _token_ranges(
+        self, ids: np.ndarray, lengths: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns first token, stop token, type and sequence of every entity."""
+        n = len(ids)
+        doc_ids = np.repeat(np.arange(len(lengths)), lengths)
+        doc_start = np.zeros(n, dtype=bool)
+        doc_start[(np.cumsum(lengths) - lengths)[lengths > 0]] = True
+
+        # Ignored tokens (e.g. non-first subwords) extend the entity of the previous
+        # token of the same sequence.
+        filled = (ids == self.ignore_index) & ~doc_start
+        if filled.any():
+            ids = ids[np.maximum.accumulate(np.where(filled, -1, np.arange(n)))]
+
+        slots = np.searchsorted(self._ids, ids)
+        inside = slots < len(self._ids)
+        known = np.zeros(n, dtype=bool)
+        known[inside] = self._ids[slots[inside]] == ids[inside]
+        slots[~known] = len(self._ids)
+        prefix = self._prefix[slots]
+        types = self._type[slots]
+        tagged = prefix != _O
+
+        # continues[t]: token t continues the entity of token t - 1.
+        continues = np.zeros(n, dtype=bool)
+        continues[1:] = (
+            tagged[1:]
+            & tagged[:-1]
+            & (types[1:] == types[:-1])
+            & ((prefix[:-1] == _B) | (prefix[:-1] == _I))
+            & ((prefix[1:] == _I) | (prefix[1:] == _L))
+        )
+        continues |= filled & tagged
+        continues &= ~doc_start
+
+        firsts = np.flatnonzero(tagged & ~continues)
+        ends_here = tagged.copy()
+        ends_here[:-1] &= ~continues[1:]
+        stops = np.flatnonzero(ends_here) + 1
+        return firsts, stops, types[firsts], doc_ids[firsts]
+
+    @staticmethod
+    def _concatenate(label_ids_batch, lengths: np.ndarray) -> np.ndarray:
+        if isinstance(label_ids_batch, np.ndarray) and label_ids_batch.ndim == 2:
+            # Padded (batch, max_len) predictions, e.g. an argmax over logits.
+            mask = np.arange(label_ids_batch.shape[1]) < lengths[:, None]
+            return label_ids_batch[mask].astype(np.int64)
+        return np.concatenate(
+            [
+                np.asarray(ids, dtype=np.int64)[:n]
+                for ids, n in zip(label_ids_batch, lengths)
+            ]
+            + [np.zeros(0, dtype=np.int64)]
+        )
+
+    @staticmethod
+    def _offsets(tokens: Any) -> Tuple[np.ndarray, np.ndarray]:
+        if isinstance(tokens, TokenSequence):
+            return tokens.starts, tokens.ends
+        if isinstance(tokens, np.ndarray) or (
+            len(tokens) and not isinstance(tokens[0], Token)
+        ):
+            pairs = np.asarray(tokens, dtype=np.int64).reshape(-1, 2)
+            return pairs[:, 0], pairs[:, 1]
+        return (
+            np.array([t.start for t in tokens], dtype=np.int64),
+            np.array([t.end for t in tokens], dtype=np.int64),
+        )
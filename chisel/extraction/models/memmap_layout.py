@@ -0,0 +1,5 @@
+# File names of a directory written by `MemmapExporter` and read by
+# `MemmapTorchNERDataset`.
+META_FILE = "meta.json"
+OFFSETS_FILE = "offsets.npy"
+FIELD_FILE = "{}.bin"
@@ -1,15 +1,45 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+from typing import Any, List, Optional, Union
+import numpy as np
+from chisel.extraction.models.sequences import SpanSet, TokenLabelMatrix, TokenSequence
 
+_setattr = object.__setattr__
 
-class Token(BaseModel):
+
+class _TrustedModel(BaseModel):
+    @classmethod
+    def trusted(cls, **values: Any):
+        """
+        Builds an instance without running validation.
+
+        Intended for internal stages that construct models from values that are already
+        known to be valid (e.g. offsets shifted from validated tokens). User-facing entry
+        points should keep using the regular, validating constructor.
+
+        Mirrors `model_construct`, without its per-field alias and default bookkeeping.
+        """
+        fields = cls.model_fields
+        fields_set = set(values)
+        if len(fields_set) != len(fields):
+            for name, field in fields.items():
+                if name not in values:
+                    values[name] = field.get_default(call_default_factory=True)
+        instance = object.__new__(cls)
+        _setattr(instance, "__dict__", values)
+        _setattr(instance, "__pydantic_fields_set__", fields_set)
+        _setattr(instance, "__pydantic_extra__", None)
+        _setattr(instance, "__pydantic_private__", None)
+        return instance
+
+
+class Token(_TrustedModel):
     id: int
     text: str
     start: int
     end: int
 
 
-class EntitySpan(BaseModel):
+class EntitySpan(_TrustedModel):
     text: str
     start: int
     end: int
@@ -17,12 +47,42 @@ class EntitySpan(BaseModel):
     attributes: dict[str, str] = {}
 
 
-class TokenEntitySpan(BaseModel):
+class TokenEntitySpan(_TrustedModel):
     entity: EntitySpan
     token_indices: List[int]
 
 
-class ChiselRecord(BaseModel):
+class RecordSegment(_TrustedModel):
+    """
+    The part of a packed ChiselRecord that comes from one source record.
+
+    Token offsets are half-open indices into the packed record's tokens, and character
+    offsets are positions in its text.
+    """
+
+    id: str
+    chunk_id: int
+    token_start: int
+    token_end: int
+    char_start: int
+    char_end: int
+
+
+class ValidationIssue(_TrustedModel):
+    """
+    One failed validation check, as collected in a `ValidationReport`.
+
+    `index` is the position of the span in the list passed to `validate_many`, and
+    `doc_id` the document id given with it (None if none was given).
+    """
+
+    error: str
+    message: str
+    doc_id: Optional[str] = None
+    index: int
+
+
+class ChiselRecord(_TrustedModel):
     """
     A standardized representation of a processed data row in Chisel.
 
@@ -33,23 +93,34 @@ class ChiselRecord(BaseModel):
     - id: Unique identifier for the source document.
     - chunk_id: Unique chunk number for segmented inputs.
     - text: The original or cleaned text for this chunk.
-    - tokens: List of Token objects.
-    - entities: List of extracted EntitySpan objects.
+    - tokens: List of Token objects, or a columnar TokenSequence.
+    - entities: List of extracted EntitySpan objects, or a columnar SpanSet.
 
     Optional:
     - bio_labels: List of BIO-style string labels.
     - labels: List of numeric labels (encoded version of bio_labels).
+    - multi_labels: Boolean (tokens x tags) matrix from `MultiLabelLabeler`, dense or a
+      sparse TokenLabelMatrix.
     - input_ids: Tokenizer-specific IDs for model input.
     - attention_mask: Attention mask corresponding to input_ids.
+    - position_ids: Token positions that restart at 0 for every packed segment.
+    - segment_ids: Index of the packed segment each token belongs to.
+    - segments: Source record of each packed segment (see `SequencePacker`).
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     id: str
     chunk_id: int
     text: str
-    tokens: List[Token]
-    entities: List[EntitySpan]
+    tokens: Union[List[Token], TokenSequence]
+    entities: Union[List[EntitySpan], SpanSet]
 
     bio_labels: Optional[List[str]] = None
     labels: Optional[List[int]] = None
+    multi_labels: Optional[Union[np.ndarray, TokenLabelMatrix]] = None
     input_ids: Optional[List[int]] = None
     attention_mask: Optional[List[int]] = None
+    position_ids: Optional[List[int]] = None
+    segment_ids: Optional[List[int]] = None
+    segments: Optional[List[RecordSegment]] = None
@@ -0,0 +1,583 @@
+from itertools import chain
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Token and span models are imported lazily inside the adapters below, because
+# `ChiselRecord` in models.py refers to the containers defined here.
+
+_INDEX_DTYPE = np.int32
+
+
+def _as_index_array(values: Any) -> np.ndarray:
+    return np.asarray(values, dtype=_INDEX_DTYPE)
+
+
+def _as_object_array(values: Optional[Sequence[Any]]) -> Optional[np.ndarray]:
+    if values is None or isinstance(values, np.ndarray):
+        return values
+    array = np.empty(len(values), dtype=object)
+    array[:] = list(values)
+    return array
+
+
+class TokenSequence:
+    """
+    Columnar (struct-of-arrays) representation of a list of tokens.
+
+    Token ids and character offsets are stored in NumPy arrays rather than as one
+    `Token` object per subword. Token strings are only materialized when asked for,
+    either from a stored sequence of strings or by resolving the ids through
+    `text_resolver` (e.g. a Hugging Face tokenizer's `convert_ids_to_tokens`).
+
+    Slicing (``seq[i:j]``) returns a view that shares the underlying arrays.
+    `rebase` and `shift` return views with shifted character offsets without copying.
+
+    Parameters
+    ----------
+    ids : array-like of int
+        Vocabulary ids, one per token.
+    starts, ends : array-like of int
+        Character offsets of each token (end exclusive).
+    texts : Optional[Sequence[str]], default=None
+        Token strings. Stored as-is and sliced alongside the arrays.
+    text_resolver : Optional[Callable[[List[int]], List[str]]], default=None
+        Used to materialize token strings from ids when `texts` is not given.
+    char_offset : int, default=0
+        Value subtracted from the stored character offsets when they are read.
+    """
+
+    __slots__ = ("ids", "_starts", "_ends", "_texts", "_text_resolver", "char_offset")
+
+    def __init__(
+        self,
+        ids: Any,
+        starts: Any,
+        ends: Any,
+        texts: Optional[Sequence[str]] = None,
+        text_resolver: Optional[Callable[[List[int]], List[str]]] = None,
+        char_offset: int = 0,
+    ):
+        self.ids = _as_index_array(ids)
+        self._starts = _as_index_array(starts)
+        self._ends = _as_index_array(ends)
+        self._texts = _as_object_array(texts)
+        self._text_resolver = text_resolver
+        self.char_offset = int(char_offset)
+
+        n = len(self.ids)
+        if len(self._starts) != n or len(self._ends) != n:
+            raise ValueError("ids, starts and ends must have the same length.")
+        if self._texts is not None and len(self._texts) != n:
+            raise ValueError("texts must have one entry per token.")
+
+    @classmethod
+    def from_tokens(cls, tokens: Sequence[Any]) -> "TokenSequence":
+        """Builds a TokenSequence from a list of `Token` objects."""
+        if isinstance(tokens, TokenSequence):
+            return tokens
+        return cls(
+            ids=[t.id for t in tokens],
+            starts=[t.start for t in tokens],
+            ends=[t.end for t in tokens],
+            texts=[t.text for t in tokens],
+        )
+
+    @property
+    def starts(self) -> np.ndarray:
+        if self.char_offset:
+            return self._starts - self.char_offset
+        return self._starts
+
+    @property
+    def ends(self) -> np.ndarray:
+        if self.char_offset:
+            return self._ends - self.char_offset
+        return self._ends
+
+    @property
+    def texts(self) -> List[str]:
+        """Materializes the token strings."""
+        if self._texts is not None:
+            return self._texts.tolist()
+        if self._text_resolver is not None:
+            return list(self._text_resolver(self.ids.tolist()))
+        raise ValueError("TokenSequence has no token text source.")
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the array storage in bytes (excluding materialized strings)."""
+        total = self.ids.nbytes + self._starts.nbytes + self._ends.nbytes
+        if self._texts is not None:
+            total += self._texts.nbytes
+        return total
+
+    def _view(self, key: slice, char_offset: int) -> "TokenSequence":
+        view = object.__new__(TokenSequence)
+        view.ids = self.ids[key]
+        view._starts = self._starts[key]
+        view._ends = self._ends[key]
+        view._texts = None if self._texts is None else self._texts[key]
+        view._text_resolver = self._text_resolver
+        view.char_offset = char_offset
+        return view
+
+    def shift(self, delta: int) -> "TokenSequence":
+        """Returns a view whose character offsets are reduced by `delta`."""
+        return self._view(slice(None), self.char_offset + int(delta))
+
+    def rebase(self) -> "TokenSequence":
+        """Returns a view whose first token starts at character 0."""
+        if not len(self):
+            return self
+        return self._view(slice(None), int(self._starts[0]))
+
+    def to_tokens(self) -> List[Any]:
+        """Materializes the sequence as a list of `Token` objects."""
+        from chisel.extraction.models.models import Token
+
+        return [
+            Token.trusted(id=i, text=text, start=start, end=end)
+            for i, text, start, end in zip(
+                self.ids.tolist(),
+                self.texts,
+                self.starts.tolist(),
+                self.ends.tolist(),
+            )
+        ]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, key: Union[int, slice]) -> Any:
+        if isinstance(key, slice):
+            return self._view(key, self.char_offset)
+
+        from chisel.extraction.models.models import Token
+
+        if self._texts is not None:
+            text = self._texts[key]
+        elif self._text_resolver is not None:
+            text = self._text_resolver([int(self.ids[key])])[0]
+        else:
+            raise ValueError("TokenSequence has no token text source.")
+        return Token.trusted(
+            id=int(self.ids[key]),
+            text=text,
+            start=int(self._starts[key]) - self.char_offset,
+            end=int(self._ends[key]) - self.char_offset,
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.to_tokens())
+
+    def __repr__(self) -> str:
+        return f"TokenSequence(len={len(self)}, char_offset={self.char_offset})"
+
+
+class SpanSet:
+    """
+    Columnar representation of entity spans, optionally aligned to token ranges.
+
+    Character offsets, labels and texts are stored per span. Aligned spans also
+    carry a half-open token range ``[token_start, token_end)``; an empty range means
+    that no token was aligned to the span. This is the columnar counterpart of a list
+    of `EntitySpan` (unaligned) or `TokenEntitySpan` (aligned) objects.
+
+    Parameters
+    ----------
+    starts, ends : array-like of int
+        Character offsets of each span (end exclusive).
+    labels : Sequence[str]
+        Entity label per span.
+    texts : Sequence[str]
+        Entity text per span.
+    token_starts, token_ends : Optional array-like of int, default=None
+        Half-open token range per span. Both or neither must be given.
+    attributes : Optional[Sequence[Dict[str, str]]], default=None
+        Span attributes, as on `EntitySpan`.
+    char_offset, token_offset : int, default=0
+        Values subtracted from the stored character and token offsets when read.
+    """
+
+    __slots__ = (
+        "_starts",
+        "_ends",
+        "labels",
+        "texts",
+        "_token_starts",
+        "_token_ends",
+        "attributes",
+        "char_offset",
+        "token_offset",
+    )
+
+    def __init__(
+        self,
+        starts: Any,
+        ends: Any,
+        labels: Sequence[str],
+        texts: Sequence[str],
+        token_starts: Any = None,
+        token_ends: Any = None,
+        attributes: Optional[Sequence[Dict[str, str]]] = None,
+        char_offset: int = 0,
+        token_offset: int = 0,
+    ):
+        self._starts = _as_index_array(starts)
+        self._ends = _as_index_array(ends)
+        self.labels = _as_object_array(labels)
+        self.texts = _as_object_array(texts)
+        if (token_starts is None) != (token_ends is None):
+            raise ValueError("token_starts and token_ends must be given together.")
+        self._token_starts = (
+            None if token_starts is None else _as_index_array(token_starts)
+        )
+        self._token_ends = None if token_ends is None else _as_index_array(token_ends)
+        self.attributes = _as_object_array(attributes)
+        self.char_offset = int(char_offset)
+        self.token_offset = int(token_offset)
+
+        n = len(self._starts)
+        columns = [self._ends, self.labels, self.texts]
+        if self._token_starts is not None:
+            columns += [self._token_starts, self._token_ends]
+        if self.attributes is not None:
+            columns.append(self.attributes)
+        if any(len(column) != n for column in columns):
+            raise ValueError("All SpanSet columns must have the same length.")
+
+    @classmethod
+    def from_entities(cls, entities: Sequence[Any]) -> "SpanSet":
+        """Builds an unaligned SpanSet from a list of `EntitySpan` objects."""
+        if isinstance(entities, SpanSet):
+            return entities
+        return cls(
+            starts=[e.start for e in entities],
+            ends=[e.end for e in entities],
+            labels=[e.label for e in entities],
+            texts=[e.text for e in entities],
+            attributes=[e.attributes for e in entities],
+        )
+
+    @classmethod
+    def from_token_entity_spans(cls, spans: Sequence[Any]) -> "SpanSet":
+        """
+        Builds an aligned SpanSet from a list of `TokenEntitySpan` objects.
+
+        Raises a ValueError if a span's token indices are not a contiguous, increasing range.
+        """
+        if isinstance(spans, SpanSet):
+            return spans
+        token_starts = []
+        token_ends = []
+        for span in spans:
+            indices = span.token_indices
+            if not indices:
+                token_starts.append(0)
+                token_ends.append(0)
+                continue
+            first = indices[0]
+            if list(indices) != list(range(first, first + len(indices))):
+                raise ValueError(
+                    f"Token indices must form a contiguous range, got {indices}."
+                )
+            token_starts.append(first)
+            token_ends.append(first + len(indices))
+
+        entities = [span.entity for span in spans]
+        return cls(
+            starts=[e.start for e in entities],
+            ends=[e.end for e in entities],
+            labels=[e.label for e in entities],
+            texts=[e.text for e in entities],
+            token_starts=token_starts,
+            token_ends=token_ends,
+            attributes=[e.attributes for e in entities],
+        )
+
+    @property
+    def is_aligned(self) -> bool:
+        return self._token_starts is not None
+
+    @property
+    def starts(self) -> np.ndarray:
+        if self.char_offset:
+            return self._starts - self.char_offset
+        return self._starts
+
+    @property
+    def ends(self) -> np.ndarray:
+        if self.char_offset:
+            return self._ends - self.char_offset
+        return self._ends
+
+    @property
+    def token_starts(self) -> Optional[np.ndarray]:
+        if self._token_starts is None or not self.token_offset:
+            return self._token_starts
+        return self._token_starts - self.token_offset
+
+    @property
+    def token_ends(self) -> Optional[np.ndarray]:
+        if self._token_ends is None or not self.token_offset:
+            return self._token_ends
+        return self._token_ends - self.token_offset
+
+    def token_ranges(self) -> Iterator[Tuple[range, str]]:
+        """Yields ``(token index range, label)`` for each aligned span."""
+        if not self.is_aligned:
+            raise ValueError("SpanSet is not aligned to tokens.")
+        for first, stop, label in zip(
+            self.token_starts.tolist(), self.token_ends.tolist(), self.labels
+        ):
+            if stop <= first:
+                yield range(0), label
+            else:
+                yield range(first, stop), label
+
+    def shift(self, char_delta: int = 0, token_delta: int = 0) -> "SpanSet":
+        """Returns a view with character and token offsets reduced by the given deltas."""
+        return self._select(
+            slice(None),
+            self.char_offset + int(char_delta),
+            self.token_offset + int(token_delta),
+        )
+
+    def take(self, indices: Any) -> "SpanSet":
+        """Returns the spans at `indices` (a slice gives a view, an index array a copy)."""
+        return self._select(indices, self.char_offset, self.token_offset)
+
+    def _select(self, key: Any, char_offset: int, token_offset: int) -> "SpanSet":
+        view = object.__new__(SpanSet)
+        view._starts = self._starts[key]
+        view._ends = self._ends[key]
+        view.labels = self.labels[key]
+        view.texts = self.texts[key]
+        aligned = self._token_starts is not None
+        view._token_starts = self._token_starts[key] if aligned else None
+        view._token_ends = self._token_ends[key] if aligned else None
+        view.attributes = None if self.attributes is None else self.attributes[key]
+        view.char_offset = char_offset
+        view.token_offset = token_offset
+        return view
+
+    def to_entities(self) -> List[Any]:
+        """Materializes the spans as a list of `EntitySpan` objects."""
+        from chisel.extraction.models.models import EntitySpan
+
+        attributes = (
+            [{}] * len(self) if self.attributes is None else self.attributes.tolist()
+        )
+        return [
+            EntitySpan.trusted(
+                text=text, start=start, end=end, label=label, attributes=dict(attrs)
+            )
+            for text, start, end, label, attrs in zip(
+                self.texts.tolist(),
+                self.starts.tolist(),
+                self.ends.tolist(),
+                self.labels.tolist(),
+                attributes,
+            )
+        ]
+
+    def to_token_entity_spans(self) -> List[Any]:
+        """Materializes aligned spans as a list of `TokenEntitySpan` objects."""
+        from chisel.extraction.models.models import TokenEntitySpan
+
+        ranges = [list(indices) for indices, _ in self.token_ranges()]
+        return [
+            TokenEntitySpan.trusted(entity=entity, token_indices=indices)
+            for entity, indices in zip(self.to_entities(), ranges)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, key: Union[int, slice]) -> Any:
+        if isinstance(key, slice):
+            return self.take(key)
+        single = self.take(slice(key, key + 1 if key != -1 else None))
+        if self.is_aligned:
+            return single.to_token_entity_spans()[0]
+        return single.to_entities()[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.is_aligned:
+            return iter(self.to_token_entity_spans())
+        return iter(self.to_entities())
+
+    def __repr__(self) -> str:
+        return f"SpanSet(len={len(self)}, aligned={self.is_aligned})"
+
+
+class TokenLabelMatrix:
+    """
+    Sparse (CSR) boolean matrix of shape ``(tokens, tags)`` for multi-label tagging.
+
+    Row `i` holds the column indices of the tags of token `i`, so memory grows with the
+    number of assigned tags, not with ``tokens * tags``; this keeps label sets with
+    hundreds of tags cheap. Slicing rows (``matrix[i:j]``) returns a view.
+
+    Parameters
+    ----------
+    indptr : array-like of int
+        Row pointers: the tags of token `i` are ``indices[indptr[i]:indptr[i + 1]]``.
+    indices : array-like of int
+        Tag (column) indices, sorted within each row.
+    tags : Sequence[str]
+        Name of each column, e.g. ``["B-PER", "I-PER", "B-LOC", "I-LOC"]``.
+    """
+
+    __slots__ = ("indptr", "indices", "tags")
+
+    def __init__(self, indptr: Any, indices: Any, tags: Sequence[str]):
+        self.indptr = _as_index_array(indptr)
+        self.indices = _as_index_array(indices)
+        self.tags = tuple(tags)
+        if len(self.indptr) == 0 or self.indptr[-1] - self.indptr[0] != len(
+            self.indices
+        ):
+            raise ValueError("indptr must start each row of indices and end with nnz.")
+
+    @classmethod
+    def from_dense(cls, matrix: Any, tags: Sequence[str]) -> "TokenLabelMatrix":
+        """Builds a TokenLabelMatrix from a dense boolean ``(tokens, tags)`` array."""
+        matrix = np.asarray(matrix, dtype=bool).reshape(-1, len(tags))
+        rows, columns = np.nonzero(matrix)
+        indptr = np.zeros(len(matrix) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(matrix)), out=indptr[1:])
+        return cls(indptr, columns, tags)
+
+    @classmethod
+    def concatenate(cls, matrices: Sequence["TokenLabelMatrix"]) -> "TokenLabelMatrix":
+        """Stacks the rows of matrices that share the same tags."""
+        tags = matrices[0].tags
+        if any(m.tags != tags for m in matrices):
+            raise ValueError("Only matrices with the same tags can be concatenated.")
+        sizes = np.cumsum([0] + [len(m.indices) for m in matrices])
+        indptr = np.concatenate(
+            [[0]]
+            + [m.indptr[1:] - m.indptr[0] + size for m, size in zip(matrices, sizes)]
+        )
+        indices = np.concatenate([m.indices for m in matrices])
+        return cls(indptr, indices, tags)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self), len(self.tags)
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes
+
+    def to_dense(self) -> np.ndarray:
+        """Materializes the boolean ``(tokens, tags)`` array."""
+        dense = np.zeros(self.shape, dtype=bool)
+        rows = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+        dense[rows, self.indices] = True
+        return dense
+
+    def rows(self) -> List[List[int]]:
+        """Returns the tag indices of every token."""
+        indices = self.indices.tolist()
+        bounds = (self.indptr - self.indptr[0]).tolist()
+        return [indices[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def to_tags(self) -> List[List[str]]:
+        """Returns the tag names of every token."""
+        return [[self.tags[c] for c in row] for row in self.rows()]
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def __getitem__(self, key: slice) -> "TokenLabelMatrix":
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("TokenLabelMatrix only supports contiguous row slices.")
+        start, stop, _ = key.indices(len(self))
+        stop = max(start, stop)
+        indptr = self.indptr[start : stop + 1]
+        view = object.__new__(TokenLabelMatrix)
+        view.indptr = indptr
+        view.indices = self.indices[
+            indptr[0] - self.indptr[0] : indptr[-1] - self.indptr[0]
+        ]
+        view.tags = self.tags
+        return view
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, TokenLabelMatrix):
+            return NotImplemented
+        return (
+            self.tags == other.tags
+            and np.array_equal(
+                self.indptr - self.indptr[0], other.indptr - other.indptr[0]
+            )
+            and np.array_equal(self.indices, other.indices)
+        )
+
+    def __repr__(self) -> str:
+        return f"TokenLabelMatrix(shape={self.shape}, nnz={len(self.indices)})"
+
+
+def iter_token_ranges(token_entity_spans: Any) -> Iterator[Tuple[Sequence[int], str]]:
+    """
+    Yields ``(token indices, label)`` for a list of `TokenEntitySpan` or an aligned `SpanSet`.
+
+    Lets labelers consume either representation without materializing model objects.
+    """
+    if isinstance(token_entity_spans, SpanSet):
+        yield from token_entity_spans.token_ranges()
+        return
+    for span in token_entity_spans:
+        yield span.token_indices, span.entity.label
+
+
+def token_range_arrays(
+    token_entity_spans: Any,
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Returns ``(first token, stop token, label)`` arrays for a list of `TokenEntitySpan` or
+    an aligned `SpanSet`; spans without tokens get ``first == stop == 0``.
+
+    Returns None if some span's token indices are not a contiguous, increasing range.
+    """
+    if isinstance(token_entity_spans, SpanSet):
+        firsts = token_entity_spans.token_starts
+        stops = token_entity_spans.token_ends
+        empty = stops <= firsts
+        if empty.any():
+            firsts = np.where(empty, 0, firsts)
+            stops = np.where(empty, 0, stops)
+        return firsts, stops, token_entity_spans.labels
+
+    indices = [span.token_indices for span in token_entity_spans]
+    lengths = np.fromiter(map(len, indices), dtype=np.int64, count=len(indices))
+    firsts = np.fromiter(
+        (i[0] if i else 0 for i in indices), dtype=np.int64, count=len(indices)
+    )
+    stops = firsts + lengths
+    flat = np.fromiter(chain.from_iterable(indices), dtype=np.int64)
+    if not np.array_equal(flat, expand_ranges(firsts, stops)):
+        return None
+    labels = _as_object_array([span.entity.label for span in token_entity_spans])
+    return firsts, stops, labels
+
+
+def expand_ranges(firsts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Returns the concatenation of ``range(first, stop)`` for every pair, as one array."""
+    lengths = stops - firsts
+    ends = np.cumsum(lengths)
+    return np.arange(ends[-1] if len(ends) else 0) + np.repeat(
+        firsts - (ends - lengths), lengths
+    )
+
+
+def has_overlaps(firsts: np.ndarray, stops: np.ndarray) -> bool:
+    """Returns True if any two non-empty token ranges share a token."""
+    nonempty = stops > firsts
+    order = np.argsort(firsts[nonempty], kind="stable")
+    sorted_firsts = firsts[nonempty][order]
+    sorted_stops = stops[nonempty][order]
+    return bool((sorted_stops[:-1] > sorted_firsts[1:]).any())
@@ -0,0 +1,304 @@
+from typing import Iterable, Iterator, List, Literal
+import numpy as np
+from chisel.extraction.models.models import (
+    ChiselRecord,
+    EntitySpan,
+    RecordSegment,
+    Token,
+)
+from chisel.extraction.models.sequences import (
+    SpanSet,
+    TokenLabelMatrix,
+    TokenSequence,
+)
+
+# Per-token fields that are concatenated when records are packed.
+_TOKEN_FIELDS = ("bio_labels", "labels", "multi_labels", "input_ids", "attention_mask")
+
+
+class _FirstFitIndex:
+    """
+    Max segment tree over the free space of bins, in bin creation order.
+
+    `find(size)` returns the first bin with at least `size` free tokens in O(log bins),
+    which keeps first-fit packing O(n log n) instead of scanning every open bin.
+    """
+
+    def __init__(self, capacity: int, n_bins: int):
+        self._size = 1
+        while self._size < max(1, n_bins):
+            self._size *= 2
+        # Bins that do not exist yet have the full capacity.
+        self._tree = [capacity] * (2 * self._size)
+
+    def find(self, size: int) -> int:
+        node = 1
+        while node < self._size:
+            node = 2 * node if self._tree[2 * node] >= size else 2 * node + 1
+        return node - self._size
+
+    def use(self, bin_index: int, size: int) -> None:
+        node = bin_index + self._size
+        self._tree[node] -= size
+        node //= 2
+        while node:
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+            node //= 2
+
+
+class SequencePacker:
+    """
+    Packs records from several documents into sequences of up to `max_tokens` tokens.
+
+    Short documents (or the last chunk of a long one) otherwise each become one mostly
+    padded model input. Packing concatenates them instead; every packed record keeps
+    `position_ids` that restart at 0 per segment, per-token `segment_ids`, and a
+    `segments` list mapping each segment back to its source record `id` and `chunk_id`.
+    `unpack` restores the source records.
+
+    Parameters
+    ----------
+    max_tokens : int
+        Maximum number of tokens per packed record. Records must already be chunked to
+        at most this length.
+    strategy : Literal["ffd", "streaming"]
+        "ffd" (first-fit decreasing) sorts all records by length and places each in the
+        first packed record with room; it gives the tightest packing but needs every
+        record up front. "streaming" keeps up to `open_bins` packed records open, places
+        each record in the first one with room, and emits the fullest record when a new
+        one must be opened, so it works on iterators with bounded memory.
+    open_bins : int
+        Number of packed records kept open by the "streaming" strategy.
+    separator : str
+        Text inserted between the texts of packed segments.
+    id_prefix : str
+        Packed records get the id ``f"{id_prefix}{n}"``.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 512,
+        strategy: Literal["ffd", "streaming"] = "ffd",
+        open_bins: int = 8,
+        separator: str = " ",
+        id_prefix: str = "packed-",
+    ):
+        if strategy not in ("ffd", "streaming"):
+            raise ValueError(f"Unsupported packing strategy: {strategy}")
+        if max_tokens < 1 or open_bins < 1:
+            raise ValueError("max_tokens and open_bins must be at least 1.")
+        self.max_tokens = max_tokens
+        self.strategy = strategy
+        self.open_bins = open_bins
+        self.separator = separator
+        self.id_prefix = id_prefix
+
+    def pack(self, records: Iterable[ChiselRecord]) -> List[ChiselRecord]:
+        """Packs records into as few records of at most `max_tokens` tokens as possible."""
+        return list(self.iter_pack(records))
+
+    def iter_pack(self, records: Iterable[ChiselRecord]) -> Iterator[ChiselRecord]:
+        """Yields packed records; with the "streaming" strategy, as soon as they are full."""
+        if self.strategy == "ffd":
+            bins = self._first_fit_decreasing(list(records))
+        else:
+            bins = self._streaming(records)
+        for n, packed in enumerate(bins):
+            yield self._merge(packed, f"{self.id_prefix}{n}")
+
+    def unpack(self, record: ChiselRecord) -> List[ChiselRecord]:
+        """Splits a packed record back into its source records."""
+        if record.segments is None:
+            return [record]
+
+        if isinstance(record.entities, SpanSet):
+            entities = record.entities.to_entities()
+        else:
+            entities = record.entities
+        entity_starts = np.array([e.start for e in entities], dtype=np.int64)
+        empty = np.array([e.start == e.end for e in entities], dtype=bool)
+        order = np.argsort(entity_starts, kind="stable")
+        sorted_starts = entity_starts[order]
+        assigned = np.zeros(len(entities), dtype=bool)
+
+        records = []
+        for segment in record.segments:
+            shift = segment.char_start
+            # Entities start in [char_start, char_end); zero-length entities may also
+            # sit at char_end. Each entity goes to the first segment that holds it.
+            lo, hi = np.searchsorted(
+                sorted_starts, [segment.char_start, segment.char_end], side="left"
+            )
+            stop = np.searchsorted(sorted_starts, segment.char_end, side="right")
+            candidates = order[lo:stop]
+            candidates = candidates[
+                ((np.arange(lo, stop) < hi) | empty[candidates]) & ~assigned[candidates]
+            ]
+            assigned[candidates] = True
+            segment_entities = [
+                self._shift_entity(entities[k], shift) for k in np.sort(candidates)
+            ]
+            tokens = record.tokens[segment.token_start : segment.token_end]
+            if isinstance(tokens, TokenSequence):
+                tokens = tokens.shift(shift)
+            else:
+                tokens = [self._shift_token(t, shift) for t in tokens]
+            fields = {
+                name: getattr(record, name)[segment.token_start : segment.token_end]
+                for name in _TOKEN_FIELDS
+                if getattr(record, name) is not None
+            }
+            records.append(
+                ChiselRecord.trusted(
+                    id=segment.id,
+                    chunk_id=segment.chunk_id,
+                    text=record.text[segment.char_start : segment.char_end],
+                    tokens=tokens,
+                    entities=segment_entities,
+                    **fields,
+                )
+            )
+        return records
+
+    def _first_fit_decreasing(
+        self, records: List[ChiselRecord]
+    ) -> List[List[ChiselRecord]]:
+        index = _FirstFitIndex(self.max_tokens, len(records))
+        bins: List[List[ChiselRecord]] = []
+        for record in sorted(records, key=lambda r: len(r.tokens), reverse=True):
+            size = self._size(record)
+            b = index.find(size)
+            if b == len(bins):
+                bins.append([])
+            bins[b].append(record)
+            index.use(b, size)
+        return bins
+
+    def _streaming(
+        self, records: Iterable[ChiselRecord]
+    ) -> Iterator[List[ChiselRecord]]:
+        open_bins: List[List[ChiselRecord]] = []
+        used: List[int] = []
+        for record in records:
+            size = self._size(record)
+            b = next(
+                (i for i, u in enumerate(used) if u + size <= self.max_tokens), None
+            )
+            if b is None:
+                if len(open_bins) == self.open_bins:
+                    fullest = max(range(len(used)), key=used.__getitem__)
+                    yield open_bins.pop(fullest)
+                    used.pop(fullest)
+                open_bins.append([])
+                used.append(0)
+                b = len(open_bins) - 1
+            open_bins[b].append(record)
+            used[b] += size
+        yield from open_bins
+
+    def _size(self, record: ChiselRecord) -> int:
+        size = len(record.tokens)
+        if size > self.max_tokens:
+            raise ValueError(
+                f"Record {record.id!r} (chunk {record.chunk_id}) has {size} tokens, "
+                f"more than max_tokens={self.max_tokens}; chunk it before packing."
+            )
+        return size
+
+    def _merge(self, records: List[ChiselRecord], packed_id: str) -> ChiselRecord:
+        segments = []
+        texts = []
+        tokens_parts = []
+        entities = []
+        position_ids: List[int] = []
+        segment_ids: List[int] = []
+        char_start = 0
+        token_start = 0
+        for s, record in enumerate(records):
+            n_tokens = len(record.tokens)
+            char_end = char_start + len(record.text)
+            segments.append(
+                RecordSegment.trusted(
+                    id=record.id,
+                    chunk_id=record.chunk_id,
+                    token_start=token_start,
+                    token_end=token_start + n_tokens,
+                    char_start=char_start,
+                    char_end=char_end,
+                )
+            )
+            texts.append(record.text)
+            tokens_parts.append(record.tokens)
+            record_entities = (
+                record.entities.to_entities()
+                if isinstance(record.entities, SpanSet)
+                else record.entities
+            )
+            entities.extend(self._shift_entity(e, -char_start) for e in record_entities)
+            position_ids.extend(range(n_tokens))
+            segment_ids.extend([s] * n_tokens)
+            char_start = char_end + len(self.separator)
+            token_start += n_tokens
+
+        fields = {}
+        for name in _TOKEN_FIELDS:
+            values = [getattr(record, name) for record in records]
+            if all(v is not None for v in values):
+                fields[name] = self._concatenate(values)
+
+        return ChiselRecord.trusted(
+            id=packed_id,
+            chunk_id=0,
+            text=self.separator.join(texts),
+            tokens=self._merge_tokens(tokens_parts, segments),
+            entities=entities,
+            position_ids=position_ids,
+            segment_ids=segment_ids,
+            segments=segments,
+            **fields,
+        )
+
+    @staticmethod
+    def _concatenate(values):
+        if isinstance(values[0], TokenLabelMatrix):
+            return TokenLabelMatrix.concatenate(values)
+        if isinstance(values[0], np.ndarray):
+            return np.concatenate(values)
+        return [item for value in values for item in value]
+
+    def _merge_tokens(self, parts, segments: List[RecordSegment]):
+        if parts and all(isinstance(p, TokenSequence) for p in parts):
+            return TokenSequence(
+                ids=np.concatenate([p.ids for p in parts]),
+                starts=np.concatenate(
+                    [p.starts + seg.char_start for p, seg in zip(parts, segments)]
+                ),
+                ends=np.concatenate(
+                    [p.ends + seg.char_start for p, seg in zip(parts, segments)]
+                ),
+                texts=[text for p in parts for text in p.texts],
+            )
+        return [
+            self._shift_token(t, -seg.char_start)
+            for p, seg in zip(parts, segments)
+            for t in p
+        ]
+
+    @staticmethod
+    def _shift_token(token: Token, delta: int) -> Token:
+        return Token.trusted(
+            id=token.id,
+            text=token.text,
+            start=token.start - delta,
+            end=token.end - delta,
+        )
+
+    @staticmethod
+    def _shift_entity(entity: EntitySpan, delta: int) -> EntitySpan:
+        return EntitySpan.trusted(
+            text=entity.text,
+            start=entity.start - delta,
+            end=entity.end - delta,
+            label=entity.label,
+            attributes=entity.attributes,
+        )
@@ -1,8 +1,199 @@
-from bs4 import BeautifulSoup, Tag
-from typing import List, Tuple, Optional, Set, Literal
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional, Set, Literal
 from chisel.extraction.models.models import EntitySpan
 from chisel.extraction.base.protocols import Parser
 
+# Elements that never have content; they are closed as soon as they are opened.
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "basefont",
+    "bgsound",
+    "br",
+    "col",
+    "command",
+    "embed",
+    "frame",
+    "hr",
+    "image",
+    "img",
+    "input",
+    "isindex",
+    "keygen",
+    "link",
+    "menuitem",
+    "meta",
+    "nextid",
+    "param",
+    "source",
+    "spacer",
+    "track",
+    "wbr",
+}
+
+
+class _AnnotationBuilder:
+    """
+    Event sink shared by the parser backends.
+
+    Receives start/end/data events, appends text fragments to a list and tracks open
+    annotation spans on a stack, so that a document is processed in a single linear pass.
+    `drain` hands out the text and closed spans accumulated so far and releases every
+    fragment that no open span still needs.
+    """
+
+    def __init__(self, parser: "HTMLTagParser"):
+        self._parser = parser
+        # Text from global offset `_base` up to `length`.
+        self._fragments: List[str] = []
+        self._base = 0
+        self._emitted = 0
+        self.length = 0
+        # Open elements as (tag name, span record or None); a span record is
+        # [start, end, label, attributes].
+        self._stack: List[Tuple[str, Optional[list]]] = []
+        self._open_annotations = 0
+        # Span records closed since the last drain, in closing order.
+        self._closed: List[list] = []
+
+    def start(self, tag: str, attrs: Dict[str, str]) -> None:
+        record = None
+        if self._parser._is_annotation_tag(tag) and (
+            self._parser.allow_nested or self._open_annotations == 0
+        ):
+            label = self._parser._extract_label(tag, attrs)
+            record = [self.length, None, label, attrs]
+            self._open_annotations += 1
+        self._stack.append((tag, record))
+
+    def end(self, tag: str) -> None:
+        # Like BeautifulSoup, an end tag closes the most recent open element with the
+        # same name (and everything opened after it); unmatched end tags are ignored.
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth][0] == tag:
+                break
+        else:
+            return
+        while len(self._stack) > depth:
+            self._pop()
+
+    def data(self, text: str) -> None:
+        if text:
+            self._fragments.append(text)
+            self.length += len(text)
+
+    def close(self) -> None:
+        while self._stack:
+            self._pop()
+
+    def drain(self) -> Tuple[str, List[EntitySpan]]:
+        """Returns the text not yet drained and the spans closed since the last drain."""
+        buffered = "".join(self._fragments)
+        base = self._base
+        segment = buffered[self._emitted - base :]
+        entities = [
+            EntitySpan(
+                text=buffered[start - base : end - base],
+                start=start,
+                end=end,
+                label=label,
+                attributes=attributes,
+            )
+            for start, end, label, attributes in self._closed
+        ]
+        self._closed = []
+
+        # Keep only the text that still-open spans will need for their `text`.
+        new_base = next(
+            (record[0] for _, record in self._stack if record is not None),
+            self.length,
+        )
+        remainder = buffered[new_base - base :]
+        self._fragments = [remainder] if remainder else []
+        self._base = new_base
+        self._emitted = self.length
+        return segment, entities
+
+    def _pop(self) -> None:
+        _, record = self._stack.pop()
+        if record is not None:
+            record[1] = self.length
+            self._closed.append(record)
+            self._open_annotations -= 1
+
+
+class _StdlibBackend(HTMLParser):
+    """Feeds `html.parser` events into an `_AnnotationBuilder`."""
+
+    def __init__(self, builder: _AnnotationBuilder):
+        super().__init__(convert_charrefs=True)
+        self._builder = builder
+
+    def handle_starttag(self, tag, attrs):
+        self._builder.start(tag, {k: "" if v is None else v for k, v in attrs})
+        if tag in VOID_ELEMENTS:
+            self._builder.end(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._builder.start(tag, {k: "" if v is None else v for k, v in attrs})
+        self._builder.end(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in VOID_ELEMENTS:
+            self._builder.end(tag)
+
+    def handle_data(self, data):
+        self._builder.data(data)
+
+    def unknown_decl(self, data):
+        # <![CDATA[...]]> sections are text content.
+        if data.upper().startswith("CDATA["):
+            self._builder.data(data[6:])
+
+    def close(self):
+        super().close()
+        self._builder.close()
+
+
+class _LxmlTarget:
+    """lxml parser target that forwards element and text events to an `_AnnotationBuilder`."""
+
+    def __init__(self, builder: _AnnotationBuilder):
+        self._builder = builder
+
+    def start(self, tag, attrib):
+        self._builder.start(tag, dict(attrib))
+
+    def end(self, tag):
+        self._builder.end(tag)
+
+    def data(self, data):
+        self._builder.data(data)
+
+    def close(self):
+        return None
+
+
+class _LxmlBackend:
+    """Feeds events from lxml's (C-implemented) HTML parser into an `_AnnotationBuilder`."""
+
+    def __init__(self, builder: _AnnotationBuilder):
+        try:
+            from lxml import etree
+        except ImportError as e:
+            raise ImportError(
+                "The 'lxml' backend requires lxml. Install it with `pip install lxml`."
+            ) from e
+        self._builder = builder
+        self._parser = etree.HTMLParser(target=_LxmlTarget(builder))
+
+    def feed(self, data: str) -> None:
+        self._parser.feed(data)
+
+    def close(self) -> None:
+        self._parser.close()
+        self._builder.close()
+
 
 class HTMLTagParser(Parser):
     def __init__(
@@ -11,6 +202,7 @@ class HTMLTagParser(Parser):
         attribute_name: Optional[str] = None,
         excluded_tags: Optional[Set[str]] = None,
         allow_nested: bool = False,
+        backend: Literal["html.parser", "lxml"] = "html.parser",
     ):
         """
         Initializes the HTMLTagParser.
@@ -26,64 +218,97 @@ class HTMLTagParser(Parser):
         allow_nested : bool
             If True, allows nested tags to be processed and annotated. If False, only the outermost
             tags are annotated.
+        backend : Literal["html.parser", "lxml"]
+            Event source used to scan the markup. "html.parser" uses the standard library;
+            "lxml" uses lxml's C parser (requires lxml) and, like browsers, may insert implied
+            elements such as <html>, <body> or <p> into malformed markup.
         """
+        if backend not in ("html.parser", "lxml"):
+            raise ValueError(f"Unsupported backend: {backend}")
         self.label_strategy = label_strategy
         self.attribute_name = attribute_name
         self.excluded_tags = excluded_tags or {"html", "body", "div", "p", "span"}
         self.allow_nested = allow_nested
+        self.backend = backend
+        self._session: Optional[Tuple[_AnnotationBuilder, Any]] = None
 
-    def _extract_label(self, tag: Tag) -> str:
+    def _extract_label(self, tag: str, attrs: Dict[str, str]) -> str:
         if self.label_strategy == "tag":
-            return tag.name.upper()
+            return tag.upper()
         elif self.label_strategy == "attribute":
-            return tag.attrs.get(self.attribute_name, tag.name.upper())
+            return attrs.get(self.attribute_name, tag.upper())
         else:
             raise ValueError(f"Unsupported label strategy: {self.label_strategy}")
 
-    def _is_annotation_tag(self, tag: Tag) -> bool:
-        return tag.name not in self.excluded_tags
+    def _is_annotation_tag(self, tag: str) -> bool:
+        return tag not in self.excluded_tags
+
+    def _make_backend(self, builder: _AnnotationBuilder):
+        if self.backend == "lxml":
+            return _LxmlBackend(builder)
+        return _StdlibBackend(builder)
 
     def parse(self, doc: str) -> Tuple[str, List[EntitySpan]]:
-        soup = BeautifulSoup(doc, "html.parser")
-        clean_text = ""
-        entities: List[EntitySpan] = []
-
-        def handle_node(node) -> str:
-            nonlocal clean_text, entities
-
-            if isinstance(node, Tag):
-                if self._is_annotation_tag(node):
-                    if self.allow_nested:
-                        inner_text = ""
-                        for child in node.children:
-                            inner_text += handle_node(child)
-                    else:
-                        inner_text = node.get_text()
-
-                    label = self._extract_label(node)
-                    attributes = {k: v for k, v in node.attrs.items()}
-                    start = len(clean_text)
-                    end = start + len(inner_text)
-                    entities.append(
-                        EntitySpan(
-                            text=inner_text,
-                            start=start,
-                            end=end,
-                            label=label,
-                            attributes=attributes,
-                        )
-                    )
-                    return inner_text
-                else:
-                    # Process children but skip annotating this tag
-                    inner_text = ""
-                    for child in node.children:
-                        inner_text += handle_node(child)
-                    return inner_text
-            elif isinstance(node, str):
-                return node
-            return ""
-
-        for child in soup.contents:
-            clean_text += handle_node(child)
-        return clean_text, entities
+        builder = _AnnotationBuilder(self)
+        backend = self._make_backend(builder)
+        backend.feed(doc)
+        backend.close()
+        return builder.drain()
+
+    def feed(self, chunk: str) -> Tuple[str, List[EntitySpan]]:
+        """
+        Feeds the next piece of an annotated document to an incremental parse.
+
+        Returns the clean text produced since the previous call and the entity spans
+        closed since then. Span offsets are global, i.e. relative to the start of the
+        whole clean text, so a span may start in a segment returned earlier. Only the
+        text of currently open spans is retained between calls, so memory stays bounded
+        by the chunk size and the longest entity rather than the document size.
+        """
+        if self._session is None:
+            builder = _AnnotationBuilder(self)
+            self._session = (builder, self._make_backend(builder))
+        builder, backend = self._session
+        backend.feed(chunk)
+        return builder.drain()
+
+    def close(self) -> Tuple[str, List[EntitySpan]]:
+        """
+        Finishes an incremental parse started with `feed`.
+
+        Flushes buffered markup, closes any unclosed tags and returns the remaining
+        text and spans. The parser can then be used for a new document.
+        """
+        if self._session is None:
+            return "", []
+        builder, backend = self._session
+        self._session = None
+        backend.close()
+        return builder.drain()
+
+    def parse_stream(
+        self, chunks: Iterable[str]
+    ) -> Iterator[Tuple[str, List[EntitySpan]]]:
+        """
+        Incrementally parses a document given as an iterable of string pieces.
+
+        Yields ``(text segment, spans)`` tuples as they become available; see `feed`.
+        """
+        for chunk in chunks:
+            segment, entities = self.feed(chunk)
+            if segment or entities:
+                yield segment, entities
+        segment, entities = self.close()
+        if segment or entities:
+            yield segment, entities
+
+    def parse_file(
+        self, path: str, block_size: int = 1 << 20, encoding: str = "utf-8"
+    ) -> Iterator[Tuple[str, List[EntitySpan]]]:
+        """
+        Incrementally parses an annotated file, reading it in blocks of `block_size` characters.
+
+        Yields ``(text segment, spans)`` tuples; the whole file is never held in memory.
+        """
+        with open(path, encoding=encoding) as f:
+            yield from self.parse_stream(iter(lambda: f.read(block_size), ""))
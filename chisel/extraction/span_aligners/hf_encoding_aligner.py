@@ -0,0 +1,183 @@
+import logging
+from typing import List, Literal, Optional, Sequence, Tuple
+import numpy as np
+from transformers import BatchEncoding
+from chisel.extraction.labelers.label_encoder import IGNORE_INDEX
+from chisel.extraction.models.models import EntitySpan, TokenEntitySpan
+
+logger = logging.getLogger(__name__)
+
+
+class HFEncodingSpanAligner:
+    """
+    Aligns entity spans using the lookups of a Hugging Face fast tokenizer encoding.
+
+    Instead of comparing every token offset in Python, entity boundaries are resolved
+    with the (Rust-side) `char_to_token` / `token_to_chars` lookups of the `BatchEncoding`
+    returned by `HFTokenizer.encode`, and subword strategies use its `word_ids`.
+
+    Parameters
+    ----------
+    subword_strategy : Literal["first", "all", "strict"]
+        How subword tokens are treated:
+        - "first": entities cover all their tokens, but `mask_labels` replaces the label of
+          every non-first subword of a word with the ignore index (-100).
+        - "all": every subword token keeps its label.
+        - "strict": like "all", but an entity whose boundary falls inside a word is
+          considered misaligned.
+    misalignment_policy : Literal["skip", "warn", "fail"]
+        How to handle entities whose boundaries fall inside a token (or inside a word, for
+        "strict"). Such entities are aligned to no tokens, so they never produce a truncated
+        label; "warn" additionally logs a warning and "fail" raises a ValueError.
+    """
+
+    def __init__(
+        self,
+        subword_strategy: Literal["first", "all", "strict"] = "all",
+        misalignment_policy: Literal["skip", "warn", "fail"] = "skip",
+    ):
+        if subword_strategy not in ("first", "all", "strict"):
+            raise ValueError(f"Unsupported subword strategy: {subword_strategy}")
+        if misalignment_policy not in ("skip", "warn", "fail"):
+            raise ValueError(f"Unsupported misalignment policy: {misalignment_policy}")
+        self.subword_strategy = subword_strategy
+        self.misalignment_policy = misalignment_policy
+
+    def align(
+        self, entities: List[EntitySpan], encoding: BatchEncoding, index: int = 0
+    ) -> List[TokenEntitySpan]:
+        """
+        For each EntitySpan, finds the token indices of text `index` of the encoding that
+        cover its character span. Returns a list of TokenEntitySpan objects.
+        """
+        self._check_fast(encoding)
+        word_ids = (
+            self._word_ids(encoding, index)
+            if self.subword_strategy == "strict"
+            else None
+        )
+        results = []
+        for entity in entities:
+            first, stop = self._resolve(entity, encoding, index, word_ids)
+            results.append(
+                TokenEntitySpan.trusted(
+                    entity=entity, token_indices=list(range(first, stop))
+                )
+            )
+        return results
+
+    def align_batch(
+        self, entities_batch: Sequence[List[EntitySpan]], encoding: BatchEncoding
+    ) -> List[List[TokenEntitySpan]]:
+        """Aligns the entities of every text of a batch encoding, in input order."""
+        if len(entities_batch) != len(encoding["input_ids"]):
+            raise ValueError(
+                "entities_batch must contain one entity list per encoded text."
+            )
+        return [
+            self.align(entities, encoding, i)
+            for i, entities in enumerate(entities_batch)
+        ]
+
+    def label_mask(self, encoding: BatchEncoding, index: int = 0) -> np.ndarray:
+        """
+        Returns a boolean array that is True for the tokens of text `index` that carry a label.
+
+        Tokens without a word (special tokens) never carry a label; with the "first"
+        strategy neither do the non-first subwords of a word.
+        """
+        self._check_fast(encoding)
+        word_ids = self._word_ids(encoding, index)
+        mask = word_ids >= 0
+        if self.subword_strategy == "first" and len(word_ids):
+            mask[1:] &= word_ids[1:] != word_ids[:-1]
+        return mask
+
+    def mask_labels(
+        self,
+        label_ids: Sequence[int],
+        encoding: BatchEncoding,
+        index: int = 0,
+        ignore_index: int = IGNORE_INDEX,
+    ) -> List[int]:
+        """
+        Replaces the label ids of tokens that carry no label (see `label_mask`) with
+        `ignore_index`, so that they are ignored by the loss.
+        """
+        mask = self.label_mask(encoding, index)
+        if len(label_ids) != len(mask):
+            raise ValueError(
+                f"Expected {len(mask)} label ids for text {index}, got {len(label_ids)}."
+            )
+        return np.where(
+            mask, np.asarray(label_ids, dtype=np.int64), ignore_index
+        ).tolist()
+
+    def _resolve(
+        self,
+        entity: EntitySpan,
+        encoding: BatchEncoding,
+        index: int,
+        word_ids: Optional[np.ndarray],
+    ) -> Tuple[int, int]:
+        # Tokens covering the first and last non-whitespace characters of the entity.
+        first = self._token_at(encoding, index, range(entity.start, entity.end))
+        if first is None:
+            return self._misaligned(entity, "no token overlaps the entity")
+        last = self._token_at(
+            encoding, index, range(entity.end - 1, entity.start - 1, -1)
+        )
+
+        if (
+            encoding.token_to_chars(index, first).start < entity.start
+            or encoding.token_to_chars(index, last).end > entity.end
+        ):
+            return self._misaligned(entity, "entity boundary falls inside a token")
+
+        if word_ids is not None and (
+            (
+                first > 0
+                and word_ids[first] >= 0
+                and word_ids[first - 1] == word_ids[first]
+            )
+            or (
+                last + 1 < len(word_ids)
+                and word_ids[last] >= 0
+                and word_ids[last + 1] == word_ids[last]
+            )
+        ):
+            return self._misaligned(entity, "entity boundary falls inside a word")
+
+        return first, last + 1
+
+    def _misaligned(self, entity: EntitySpan, reason: str) -> Tuple[int, int]:
+        message = f"Misaligned entity ({reason}): {entity}"
+        if self.misalignment_policy == "warn":
+            logger.warning(message)
+        elif self.misalignment_policy == "fail":
+            raise ValueError(message)
+        return 0, 0
+
+    @staticmethod
+    def _token_at(
+        encoding: BatchEncoding, index: int, positions: range
+    ) -> Optional[int]:
+        # Whitespace maps to no token, so step over it towards the other boundary.
+        for position in positions:
+            token = encoding.char_to_token(index, position)
+            if token is not None:
+                return token
+        return None
+
+    @staticmethod
+    def _word_ids(encoding: BatchEncoding, index: int) -> np.ndarray:
+        return np.array(
+            [-1 if w is None else w for w in encoding.word_ids(index)], dtype=np.int64
+        )
+
+    @staticmethod
+    def _check_fast(encoding: BatchEncoding) -> None:
+        if not encoding.is_fast:
+            raise ValueError(
+                "HFEncodingSpanAligner requires an encoding from a fast (Rust) tokenizer."
+            )
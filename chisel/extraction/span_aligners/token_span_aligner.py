@@ -1,20 +1,168 @@
-from typing import List
+from typing import List, Optional, Sequence, Tuple, Union
+import numpy as np
 from chisel.extraction.models.models import Token, EntitySpan, TokenEntitySpan
+from chisel.extraction.models.sequences import SpanSet, TokenSequence
+
+
+def _is_sorted(values: np.ndarray) -> bool:
+    return bool(np.all(values[1:] >= values[:-1]))
+
+
+def _contained_ranges(
+    token_starts: np.ndarray,
+    token_ends: np.ndarray,
+    entity_starts: np.ndarray,
+    entity_ends: np.ndarray,
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Returns half-open token ranges ``[lo, hi)`` of the tokens contained in each entity.
+
+    When both token start and end offsets are non-decreasing, the tokens with
+    ``start >= entity.start`` form a suffix and those with ``end <= entity.end`` form a
+    prefix, so the contained tokens are their (contiguous) intersection and can be found
+    with two binary searches per entity. Returns None when the offsets are not sorted.
+    """
+    if not (_is_sorted(token_starts) and _is_sorted(token_ends)):
+        return None
+    lo = np.searchsorted(token_starts, entity_starts, side="left")
+    hi = np.searchsorted(token_ends, entity_ends, side="right")
+    return lo, np.maximum(hi, lo)
+
+
+def _offsets(
+    items: Union[Sequence, TokenSequence, SpanSet],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end offset arrays of a token/entity list or columnar container."""
+    if isinstance(items, (TokenSequence, SpanSet)):
+        return items.starts.astype(np.int64), items.ends.astype(np.int64)
+    return (
+        np.fromiter((item.start for item in items), dtype=np.int64, count=len(items)),
+        np.fromiter((item.end for item in items), dtype=np.int64, count=len(items)),
+    )
+
+
+def _concat(arrays: List[np.ndarray]) -> np.ndarray:
+    return np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int64)
 
 
 class TokenSpanAligner:
     """
     Aligns entity spans to tokens by finding which tokens fall within the character spans of the entities.
     This is useful for tasks like NER where entities need to be mapped to tokenized text.
+
+    Tokens produced by a tokenizer are sorted by offset, so alignment uses binary search
+    over the token offsets (O(entities * log(tokens))) instead of scanning every token for
+    every entity. Unsorted token lists fall back to the exhaustive scan.
+
+    Accepts either lists of model objects or the columnar `TokenSequence` / `SpanSet`
+    containers. When `tokens` is a TokenSequence the result is an aligned SpanSet.
     """
 
     def align(
-        self, entities: List[EntitySpan], tokens: List[Token]
-    ) -> List[TokenEntitySpan]:
+        self,
+        entities: Union[List[EntitySpan], SpanSet],
+        tokens: Union[List[Token], TokenSequence],
+    ) -> Union[List[TokenEntitySpan], SpanSet]:
         """
         For each EntitySpan, find the list of token indices that fall fully within its character span.
         Returns a list of TokenEntitySpan objects.
         """
+        if isinstance(tokens, TokenSequence):
+            return self._align_columnar(SpanSet.from_entities(entities), tokens)
+
+        if not entities:
+            return []
+
+        ranges = _contained_ranges(*_offsets(tokens), *_offsets(entities))
+        if ranges is None:
+            return self._align_exhaustive(entities, tokens)
+
+        return [
+            TokenEntitySpan.trusted(entity=entity, token_indices=list(range(lo, hi)))
+            for entity, lo, hi in zip(entities, ranges[0].tolist(), ranges[1].tolist())
+        ]
+
+    def align_batch(
+        self,
+        entities_batch: Sequence[Union[List[EntitySpan], SpanSet]],
+        tokens_batch: Sequence[Union[List[Token], TokenSequence]],
+    ) -> List[Union[List[TokenEntitySpan], SpanSet]]:
+        """
+        Aligns many documents with a single vectorized search.
+
+        The offsets of each document are shifted past those of the previous one, so all
+        documents can be searched as one sorted sequence. Returns one result per document,
+        in the same form as `align`.
+        """
+        if len(entities_batch) != len(tokens_batch):
+            raise ValueError(
+                "entities_batch and tokens_batch must have the same length."
+            )
+
+        token_offsets = [_offsets(tokens) for tokens in tokens_batch]
+        span_offsets = [_offsets(entities) for entities in entities_batch]
+        token_counts = np.array([len(s) for s, _ in token_offsets], dtype=np.int64)
+        span_counts = np.array([len(s) for s, _ in span_offsets], dtype=np.int64)
+
+        # Shift each document's offsets past the largest offset of the previous one.
+        extents = np.array(
+            [
+                max(
+                    int(token_ends.max()) if len(token_ends) else 0,
+                    int(span_ends.max()) if len(span_ends) else 0,
+                )
+                + 1
+                for (_, token_ends), (_, span_ends) in zip(token_offsets, span_offsets)
+            ],
+            dtype=np.int64,
+        )
+        bases = np.concatenate([[0], np.cumsum(extents)[:-1]])
+        token_bases = np.repeat(bases, token_counts)
+        span_bases = np.repeat(bases, span_counts)
+
+        ranges = _contained_ranges(
+            _concat([starts for starts, _ in token_offsets]) + token_bases,
+            _concat([ends for _, ends in token_offsets]) + token_bases,
+            _concat([starts for starts, _ in span_offsets]) + span_bases,
+            _concat([ends for _, ends in span_offsets]) + span_bases,
+        )
+        if ranges is None:
+            return [
+                self.align(entities, tokens)
+                for entities, tokens in zip(entities_batch, tokens_batch)
+            ]
+
+        # Convert global token positions back to per-document indices.
+        first_token = np.repeat(
+            np.concatenate([[0], np.cumsum(token_counts)[:-1]]), span_counts
+        )
+        lo = ranges[0] - first_token
+        hi = ranges[1] - first_token
+        bounds = np.concatenate([[0], np.cumsum(span_counts)]).tolist()
+
+        results = []
+        for d, (entities, tokens) in enumerate(zip(entities_batch, tokens_batch)):
+            doc_lo = lo[bounds[d] : bounds[d + 1]]
+            doc_hi = hi[bounds[d] : bounds[d + 1]]
+            if isinstance(tokens, TokenSequence):
+                spans = SpanSet.from_entities(entities)
+                results.append(self._aligned_span_set(spans, doc_lo, doc_hi))
+            else:
+                results.append(
+                    [
+                        TokenEntitySpan.trusted(
+                            entity=entity, token_indices=list(range(first, stop))
+                        )
+                        for entity, first, stop in zip(
+                            entities, doc_lo.tolist(), doc_hi.tolist()
+                        )
+                    ]
+                )
+        return results
+
+    def _align_exhaustive(
+        self, entities: List[EntitySpan], tokens: List[Token]
+    ) -> List[TokenEntitySpan]:
         results = []
         for entity in entities:
             token_indices = [
@@ -22,5 +170,44 @@ class TokenSpanAligner:
                 for idx, token in enumerate(tokens)
                 if token.start >= entity.start and token.end <= entity.end
             ]
-            results.append(TokenEntitySpan(entity=entity, token_indices=token_indices))
+            results.append(
+                TokenEntitySpan.trusted(entity=entity, token_indices=token_indices)
+            )
         return results
+
+    def _align_columnar(self, spans: SpanSet, tokens: TokenSequence) -> SpanSet:
+        token_starts = tokens.starts
+        token_ends = tokens.ends
+        ranges = _contained_ranges(token_starts, token_ends, spans.starts, spans.ends)
+        if ranges is not None:
+            return self._aligned_span_set(spans, *ranges)
+
+        firsts = np.zeros(len(spans), dtype=np.int64)
+        stops = np.zeros(len(spans), dtype=np.int64)
+        for k, (start, end) in enumerate(
+            zip(spans.starts.tolist(), spans.ends.tolist())
+        ):
+            indices = np.flatnonzero((token_starts >= start) & (token_ends <= end))
+            if not len(indices):
+                continue
+            if indices[-1] - indices[0] + 1 != len(indices):
+                raise ValueError(
+                    "Aligned token indices are not contiguous; "
+                    "TokenSequence offsets must be sorted."
+                )
+            firsts[k] = indices[0]
+            stops[k] = indices[-1] + 1
+        return self._aligned_span_set(spans, firsts, stops)
+
+    def _aligned_span_set(
+        self, spans: SpanSet, firsts: np.ndarray, stops: np.ndarray
+    ) -> SpanSet:
+        return SpanSet(
+            starts=spans.starts,
+            ends=spans.ends,
+            labels=spans.labels,
+            texts=spans.texts,
+            token_starts=firsts,
+            token_ends=stops,
+            attributes=spans.attributes,
+        )
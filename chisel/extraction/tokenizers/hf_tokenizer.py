@@ -1,6 +1,8 @@
-from typing import List
+from typing import List, Optional
+import numpy as np
 from chisel.extraction.models.models import Token
-from transformers import AutoTokenizer
+from chisel.extraction.models.sequences import TokenSequence
+from transformers import AutoTokenizer, BatchEncoding
 
 
 class HFTokenizer:
@@ -10,6 +12,7 @@ class HFTokenizer:
             model_name (str): Name of the pre-trained model to use for tokenization.
         """
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self._space_prefixed: Optional[np.ndarray] = None
 
     def tokenize(self, text: str) -> List[Token]:
         """Tokenizes the input text into a list of Token objects.
@@ -18,22 +21,105 @@ class HFTokenizer:
             Returns:
             List[Token]: A list of Token objects, each containing the token text, start and end positions.
         """
-        encoding = self.tokenizer(
-            text,
+        return self.tokenize_batch([text])[0]
+
+    def tokenize_batch(self, texts: List[str]) -> List[List[Token]]:
+        """Tokenizes several texts with a single batched call to the underlying tokenizer.
+        Args:
+            texts (List[str]): The input texts to be tokenized.
+            Returns:
+            List[List[Token]]: One list of Token objects per input text, in input order.
+        """
+        if not texts:
+            return []
+
+        return self.tokens_from_encoding(self.encode(texts))
+
+    def encode(self, texts: List[str]) -> BatchEncoding:
+        """Runs the underlying tokenizer once over several texts and returns its BatchEncoding.
+
+        The encoding keeps the fast tokenizer's offset and word lookups (`char_to_token`,
+        `token_to_chars`, `word_ids`), which `HFEncodingSpanAligner` uses for alignment.
+        Token lists can be built from it with `tokens_from_encoding`.
+        Args:
+            texts (List[str]): The input texts to be tokenized.
+            Returns:
+            BatchEncoding: The encoding of all texts, without special tokens.
+        """
+        return self.tokenizer(
+            list(texts),
             return_offsets_mapping=True,
             add_special_tokens=False,
             return_tensors=None,
         )
-        tokens = self.tokenizer.tokenize(text)
+
+    def tokens_from_encoding(self, encoding: BatchEncoding) -> List[List[Token]]:
+        """Builds one list of Token objects per text of an encoding returned by `encode`.
+        Args:
+            encoding (BatchEncoding): The encoding of a batch of texts.
+            Returns:
+            List[List[Token]]: One list of Token objects per encoded text.
+        """
+        return [
+            self._tokens_from_encoding(encoding, i)
+            for i in range(len(encoding["input_ids"]))
+        ]
+
+    def tokenize_sequences(self, texts: List[str]) -> List[TokenSequence]:
+        """Tokenizes several texts into columnar TokenSequence objects.
+
+        No Token objects are created. Token strings are resolved from the ids on demand.
+        Args:
+            texts (List[str]): The input texts to be tokenized.
+            Returns:
+            List[TokenSequence]: One TokenSequence per input text, in input order.
+        """
+        if not texts:
+            return []
+
+        encoding = self.encode(texts)
+        space_prefixed = self._space_prefix_mask()
+        sequences = []
+        for input_ids, offsets in zip(
+            encoding["input_ids"], encoding["offset_mapping"]
+        ):
+            ids = np.asarray(input_ids, dtype=np.int64)
+            offsets = np.asarray(offsets, dtype=np.int64).reshape(-1, 2)
+            sequences.append(
+                TokenSequence(
+                    ids=ids,
+                    starts=offsets[:, 0] + space_prefixed[ids],
+                    ends=offsets[:, 1],
+                    text_resolver=self.tokenizer.convert_ids_to_tokens,
+                )
+            )
+        return sequences
+
+    def _space_prefix_mask(self) -> np.ndarray:
+        # Per-vocabulary flag for "Ġ"-prefixed tokens, whose start offset is shifted
+        # by one in `tokenize`. Computed once so sequences never need token strings.
+        if self._space_prefixed is None:
+            vocab = self.tokenizer.convert_ids_to_tokens(range(len(self.tokenizer)))
+            self._space_prefixed = np.array(
+                [bool(tok) and tok.startswith("Ġ") for tok in vocab], dtype=np.int64
+            )
+        return self._space_prefixed
+
+    def _tokens_from_encoding(self, encoding: BatchEncoding, index: int) -> List[Token]:
+        input_ids = encoding["input_ids"][index]
+        if encoding.is_fast:
+            tokens = encoding.tokens(index)
+        else:
+            tokens = self.tokenizer.convert_ids_to_tokens(input_ids)
 
         return [
-            Token(
+            Token.trusted(
                 id=idx,
                 text=tok,
                 start=start + 1 if tok.startswith("Ġ") else start,
                 end=end,
             )
             for tok, idx, (start, end) in zip(
-                tokens, encoding["input_ids"], encoding["offset_mapping"]
+                tokens, input_ids, encoding["offset_mapping"][index]
             )
         ]
@@ -0,0 +1,170 @@
+import math
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from chisel.extraction.models.models import ValidationIssue
+
+
+class ErrorBudgetExceeded(ValueError):
+    """Raised when the error rate of a `ValidationReport` passes its `max_error_rate`."""
+
+    def __init__(self, report: "ValidationReport"):
+        super().__init__(
+            f"Validation error rate {report.error_rate:.2%} exceeds the budget of "
+            f"{report.max_error_rate:.2%} after {report.n_checked} checks.\n"
+            f"{report.summary()}"
+        )
+        self.report = report
+
+
+class ValidationReport:
+    """
+    Aggregated result of `validate_many` / `validate_batch` calls.
+
+    Instead of printing every failure, validators record it here: failures are counted
+    by error type, the first `max_examples` issues of each type are kept, and the ids of
+    the affected documents are collected. One report can be passed to many calls (and
+    to several validators) to cover a whole run.
+
+    The report also decides which spans are checked. With `sample_rate` below 1, every
+    span is checked with that probability, so large corpora can be validated at a
+    bounded cost; `confidence_interval` gives the uncertainty of the sampled error rate.
+    With `max_error_rate`, the run is aborted with `ErrorBudgetExceeded` as soon as the
+    error rate passes the budget, once at least `min_checked` spans were checked.
+
+    Parameters
+    ----------
+    sample_rate : float
+        Probability that a span is checked, in ``(0, 1]``.
+    max_error_rate : Optional[float]
+        Largest tolerated fraction of failed checks; None disables the budget.
+    min_checked : int
+        Number of checks before the budget is enforced, so that a few early failures
+        do not abort the run.
+    max_examples : int
+        Number of issues kept per error type.
+    seed : Optional[int]
+        Seed of the sampling random number generator.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        max_error_rate: Optional[float] = None,
+        min_checked: int = 100,
+        max_examples: int = 5,
+        seed: Optional[int] = None,
+    ):
+        if not 0.0 < sample_rate <= 1.0:
+            raise ValueError("sample_rate must be in (0, 1].")
+        if max_error_rate is not None and not 0.0 <= max_error_rate <= 1.0:
+            raise ValueError("max_error_rate must be between 0 and 1.")
+        self.sample_rate = sample_rate
+        self.max_error_rate = max_error_rate
+        self.min_checked = min_checked
+        self.max_examples = max_examples
+        self._rng = np.random.default_rng(seed)
+
+        self.n_checked = 0
+        self.n_skipped = 0
+        self.n_failed = 0
+        self.counts: Counter = Counter()
+        self.examples: Dict[str, List[ValidationIssue]] = {}
+        self.doc_ids: Set[str] = set()
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of checked spans with at least one issue."""
+        return self.n_failed / self.n_checked if self.n_checked else 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.n_failed == 0
+
+    def confidence_interval(self, z: float = 1.96) -> Tuple[float, float]:
+        """Wilson score interval of the error rate (95% for the default `z`)."""
+        n = self.n_checked
+        if not n:
+            return 0.0, 1.0
+        p = self.error_rate
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return max(0.0, center - margin), min(1.0, center + margin)
+
+    def sample(self, n: int) -> List[int]:
+        """Returns the indices of the spans to check out of `n`."""
+        if self.sample_rate >= 1.0:
+            return list(range(n))
+        selected = np.flatnonzero(self._rng.random(n) < self.sample_rate).tolist()
+        self.n_skipped += n - len(selected)
+        return selected
+
+    def update(
+        self,
+        n_checked: int,
+        issues: Sequence[ValidationIssue],
+        n_failed: Optional[int] = None,
+    ) -> None:
+        """
+        Records `n_checked` checks and their issues, then enforces the error budget.
+
+        `n_failed` is the number of checked spans with issues; by default, issues with
+        the same ``(doc_id, index)`` are counted as one failed span.
+        """
+        self.n_checked += n_checked
+        if n_failed is None:
+            n_failed = len({(issue.doc_id, issue.index) for issue in issues})
+        self.n_failed += n_failed
+        for issue in issues:
+            self.counts[issue.error] += 1
+            examples = self.examples.setdefault(issue.error, [])
+            if len(examples) < self.max_examples:
+                examples.append(issue)
+            if issue.doc_id is not None:
+                self.doc_ids.add(issue.doc_id)
+
+        if (
+            self.max_error_rate is not None
+            and self.n_checked >= self.min_checked
+            and self.error_rate > self.max_error_rate
+        ):
+            raise ErrorBudgetExceeded(self)
+
+    def merge(self, other: "ValidationReport") -> "ValidationReport":
+        """Adds the results of `other` (e.g. from another worker) to this report."""
+        self.n_checked += other.n_checked
+        self.n_skipped += other.n_skipped
+        self.n_failed += other.n_failed
+        self.counts.update(other.counts)
+        for error, issues in other.examples.items():
+            examples = self.examples.setdefault(error, [])
+            examples.extend(issues[: self.max_examples - len(examples)])
+        self.doc_ids |= other.doc_ids
+        return self
+
+    def summary(self) -> str:
+        low, high = self.confidence_interval()
+        lines = [
+            f"Checked {self.n_checked} spans ({self.n_skipped} skipped by sampling), "
+            f"{self.n_failed} failed: {self.error_rate:.2%} "
+            f"(95% CI {low:.2%}-{high:.2%})."
+        ]
+        for error, count in self.counts.most_common():
+            lines.append(f"  {error}: {count}")
+            for issue in self.examples[error]:
+                where = f"#{issue.index}"
+                if issue.doc_id is not None:
+                    where = f"{issue.doc_id} {where}"
+                lines.append(f"    [{where}] {issue.message}")
+        if self.doc_ids:
+            lines.append(f"  Affected documents: {len(self.doc_ids)}")
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.summary()
+
+    def __repr__(self) -> str:
+        return (
+            f"ValidationReport(n_checked={self.n_checked}, n_failed={self.n_failed}, "
+            f"counts={dict(self.counts)})"
+        )
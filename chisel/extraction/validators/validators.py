@@ -1,10 +1,17 @@
-from chisel.extraction.models.models import EntitySpan, Token, TokenEntitySpan
+from chisel.extraction.models.models import (
+    EntitySpan,
+    Token,
+    TokenEntitySpan,
+    ValidationIssue,
+)
 from chisel.extraction.base.protocols import (
     ParseValidator,
     TokenAlignmentValidator,
 )
+from chisel.extraction.models.sequences import TokenSequence
+from chisel.extraction.validators.report import ValidationReport
 from transformers import PreTrainedTokenizerBase
-from typing import Literal
+from typing import List, Literal, Optional, Sequence, Tuple, Union
 
 
 class DefaultParseValidator(ParseValidator):
@@ -13,41 +20,71 @@ class DefaultParseValidator(ParseValidator):
     - Checks if entity text exists in the full text.
     - Checks if `entity.text` matches `text[start:end]`.
     - Checks for valid index boundaries.
+
+    `validate` checks one span and prints (or raises) every failure; `validate_many`
+    checks all spans of a document and collects the failures in a `ValidationReport`.
     """
 
     def __init__(self, on_error: Literal["warn", "raise"] = "warn"):
         self.on_error = on_error
 
     def validate(self, text: str, span: EntitySpan) -> None:
+        for _, message in self._errors(text, span):
+            _report(self.on_error, message)
+
+    def validate_many(
+        self,
+        text: str,
+        spans: Sequence[EntitySpan],
+        doc_id: Optional[str] = None,
+        report: Optional[ValidationReport] = None,
+    ) -> ValidationReport:
+        """
+        Validates the (sampled) spans of one document and records the failures in
+        `report` (a new one if None) instead of printing them. With ``on_error="raise"``
+        the first failure raises a ValueError.
+        """
+        report = ValidationReport() if report is None else report
+        indices = report.sample(len(spans))
+        issues = [
+            ValidationIssue.trusted(
+                error=error, message=message, doc_id=doc_id, index=k
+            )
+            for k in indices
+            for error, message in self._errors(text, spans[k])
+        ]
+        n_failed = len({issue.index for issue in issues})
+        _collect(self.on_error, report, len(indices), issues, n_failed)
+        return report
+
+    @staticmethod
+    def _errors(text: str, span: EntitySpan) -> List[Tuple[str, str]]:
+        errors = []
         if not span.text:
-            if self.on_error == "warn":
-                print(f"Warning: Empty span text found at {span.start}-{span.end}")
-            else:
-                raise ValueError(f"Empty span text found at {span.start}-{span.end}")
+            errors.append(
+                ("empty_text", f"Empty span text found at {span.start}-{span.end}")
+            )
         if not (0 <= span.start < span.end <= len(text)):
-            if self.on_error == "warn":
-                print(
-                    f"Warning: Invalid span indices {span.start}-{span.end} for text length {len(text)}"
-                )
-            else:
-                raise ValueError(
-                    f"Invalid span indices: {span.start}-{span.end} for text length {len(text)}"
+            errors.append(
+                (
+                    "invalid_offsets",
+                    f"Invalid span indices: {span.start}-{span.end} for text length {len(text)}",
                 )
+            )
         if span.text not in text:
-            if self.on_error == "warn":
-                print(f"Warning: Span text '{span.text}' not found in full text.")
-            else:
-                raise ValueError(f"Span text '{span.text}' not found in full text.")
-        if text[span.start : span.end] != span.text:
-            if self.on_error == "warn":
-                print(
-                    f"Warning: Span text mismatch at {span.start}-{span.end}: "
-                    f"expected '{span.text}', found '{text[span.start:span.end]}'"
-                )
-            else:
-                raise ValueError(
-                    f"Span text mismatch: expected '{span.text}', found '{text[span.start:span.end]}'"
+            errors.append(
+                ("text_not_found", f"Span text '{span.text}' not found in full text.")
+            )
+        found = text[span.start : span.end]
+        if found != span.text:
+            errors.append(
+                (
+                    "text_mismatch",
+                    f"Span text mismatch at {span.start}-{span.end}: "
+                    f"expected '{span.text}', found '{found}'",
                 )
+            )
+        return errors
 
 
 class LabelSchemaValidator(ParseValidator):
@@ -63,58 +100,267 @@ class LabelSchemaValidator(ParseValidator):
 
     def validate(self, text: str, span: EntitySpan) -> None:
         if span.label not in self.allowed_labels:
-            if self.on_error == "warn":
-                print(
-                    f"Warning: Entity label '{span.label}' not in allowed labels {self.allowed_labels}."
-                )
-            else:
-                raise ValueError(
-                    f"Entity label '{span.label}' not in allowed labels {self.allowed_labels}."
-                )
+            _report(self.on_error, self._message(span.label))
+
+    def validate_many(
+        self,
+        text: str,
+        spans: Sequence[EntitySpan],
+        doc_id: Optional[str] = None,
+        report: Optional[ValidationReport] = None,
+    ) -> ValidationReport:
+        """Validates the (sampled) spans of one document; see `DefaultParseValidator`."""
+        report = ValidationReport() if report is None else report
+        indices = report.sample(len(spans))
+        issues = [
+            ValidationIssue.trusted(
+                error="unknown_label",
+                message=self._message(spans[k].label),
+                doc_id=doc_id,
+                index=k,
+            )
+            for k in indices
+            if spans[k].label not in self.allowed_labels
+        ]
+        _collect(self.on_error, report, len(indices), issues, len(issues))
+        return report
+
+    def _message(self, label: str) -> str:
+        return f"Entity label '{label}' not in allowed labels {self.allowed_labels}."
 
 
 class HFTokenAlignmentValidator(TokenAlignmentValidator):
     """
-    Validates that the tokens within each TokenEntitySpan, when decoded using
-    the provided tokenizer, match the original entity text.
+    Validates that the tokens within each TokenEntitySpan match the original entity.
+
+    Modes:
+    - "retokenize": tokenizes and decodes `entity.text` and compares it with the decoded
+      ids of the aligned tokens (one tokenizer call and two decodes per entity).
+    - "offsets": compares the character range covered by the aligned tokens,
+      ``text[tokens[first].start:tokens[last].end]``, with the entity span. It uses the
+      offsets the pipeline already produced and never calls the tokenizer; if no `text`
+      is passed, the token range must start and end exactly at the entity offsets.
+    - "batch_decode": like "retokenize", but `validate_many` / `validate_batch` check
+      all spans of one or many documents with one tokenizer call and one `batch_decode`.
+
+    `validate` prints (or raises) a failure of one span; `validate_many` and
+    `validate_batch` collect the failures in a `ValidationReport`.
     """
 
     def __init__(
         self,
         tokenizer: PreTrainedTokenizerBase,
         on_error: Literal["warn", "raise"] = "warn",
+        mode: Literal["retokenize", "offsets", "batch_decode"] = "retokenize",
     ):
+        if mode not in ("retokenize", "offsets", "batch_decode"):
+            raise ValueError(f"Unsupported validation mode: {mode}")
         self.tokenizer = tokenizer
         self.on_error = on_error
+        self.mode = mode
 
     def validate(
         self,
         tokens: list[Token],
         span: TokenEntitySpan,
+        text: Optional[str] = None,
     ) -> None:
-        # 1. Tokenize and decode the expected text
-        encoded_expected = self.tokenizer(span.entity.text, add_special_tokens=False)
-        decoded_expected = self.tokenizer.decode(encoded_expected["input_ids"]).strip()
-        decoded_expected = decoded_expected.replace("##", "").strip()
-        decoded_expected = decoded_expected.replace("Ġ", "").strip()
-
-        # 2. Reconstruct the token ids from the original token list
-        token_ids = [tokens[i].id for i in span.token_indices]
-        decoded_actual = self.tokenizer.decode(token_ids).strip()
-        decoded_actual = decoded_actual.replace("##", "").strip()
-        decoded_actual = decoded_actual.replace("Ġ", "").strip()
-
-        # 3. Compare
-        if decoded_expected != decoded_actual:
-            if self.on_error == "warn":
-                print(
-                    f"Warning: Token span and entity span mismatch:\n"
-                    f"  Decoded actual: '{decoded_actual}'\n"
-                    f"  Decoded expected: '{decoded_expected}'"
+        for issue in self._issues([tokens], [[span]], [text], [None], [[0]]):
+            _report(self.on_error, issue.message)
+
+    def validate_many(
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        spans: Sequence[TokenEntitySpan],
+        text: Optional[str] = None,
+        doc_id: Optional[str] = None,
+        report: Optional[ValidationReport] = None,
+    ) -> ValidationReport:
+        """
+        Validates the (sampled) spans of one document and records the failures in
+        `report` (a new one if None) instead of printing them. With ``on_error="raise"``
+        the first failure raises a ValueError.
+        """
+        return self.validate_batch(
+            [tokens],
+            [spans],
+            None if text is None else [text],
+            None if doc_id is None else [doc_id],
+            report,
+        )
+
+    def validate_batch(
+        self,
+        tokens_batch: Sequence[Union[List[Token], TokenSequence]],
+        spans_batch: Sequence[Sequence[TokenEntitySpan]],
+        texts: Optional[Sequence[str]] = None,
+        doc_ids: Optional[Sequence[str]] = None,
+        report: Optional[ValidationReport] = None,
+    ) -> ValidationReport:
+        """Validates the (sampled) spans of many documents into one report."""
+        if len(tokens_batch) != len(spans_batch):
+            raise ValueError("tokens_batch and spans_batch must have the same length.")
+        report = ValidationReport() if report is None else report
+        indices_batch = [report.sample(len(spans)) for spans in spans_batch]
+        issues = self._issues(
+            tokens_batch,
+            spans_batch,
+            [None] * len(spans_batch) if texts is None else texts,
+            [None] * len(spans_batch) if doc_ids is None else doc_ids,
+            indices_batch,
+        )
+        _collect(
+            self.on_error,
+            report,
+            sum(len(indices) for indices in indices_batch),
+            issues,
+            len(issues),
+        )
+        return report
+
+    def _issues(
+        self, tokens_batch, spans_batch, texts, doc_ids, indices_batch
+    ) -> List[ValidationIssue]:
+        if self.mode == "offsets":
+            issues = [
+                self._check_offsets(tokens, spans, text, doc_id, indices)
+                for tokens, spans, text, doc_id, indices in zip(
+                    tokens_batch, spans_batch, texts, doc_ids, indices_batch
+                )
+            ]
+        elif self.mode == "batch_decode":
+            issues = [
+                self._check_decoded(tokens_batch, spans_batch, doc_ids, indices_batch)
+            ]
+        else:
+            issues = [
+                self._check_decoded([tokens], [spans], [doc_id], [[k]])
+                for tokens, spans, doc_id, indices in zip(
+                    tokens_batch, spans_batch, doc_ids, indices_batch
+                )
+                for k in indices
+            ]
+        return [issue for group in issues for issue in group]
+
+    def _check_offsets(
+        self,
+        tokens: Union[List[Token], TokenSequence],
+        spans: Sequence[TokenEntitySpan],
+        text: Optional[str],
+        doc_id: Optional[str],
+        indices: List[int],
+    ) -> List[ValidationIssue]:
+        if isinstance(tokens, TokenSequence):
+            starts, ends = tokens.starts.tolist(), tokens.ends.tolist()
+        else:
+            starts = [t.start for t in tokens]
+            ends = [t.end for t in tokens]
+
+        issues = []
+        for k in indices:
+            span = spans[k]
+            entity = span.entity
+            if not span.token_indices:
+                actual = None
+            else:
+                actual = (
+                    starts[span.token_indices[0]],
+                    ends[span.token_indices[-1]],
+                )
+            if text is not None:
+                ok = actual is not None and (
+                    text[actual[0] : actual[1]].strip() == entity.text.strip()
                 )
+                covered = "" if actual is None else text[actual[0] : actual[1]]
             else:
-                raise ValueError(
-                    f"Token span and entity span mismatch:\n"
-                    f"  Decoded actual: '{decoded_actual}'\n"
-                    f"  Decoded expected: '{decoded_expected}'"
+                ok = actual == (entity.start, entity.end)
+                covered = f"characters {actual}"
+            if not ok:
+                issues.append(
+                    ValidationIssue.trusted(
+                        error="token_mismatch",
+                        message=f"Token span and entity span mismatch:\n"
+                        f"  Tokens cover: {covered!r}\n"
+                        f"  Entity: {entity.text!r} ({entity.start}-{entity.end})",
+                        doc_id=doc_id,
+                        index=k,
+                    )
                 )
+        return issues
+
+    def _check_decoded(
+        self,
+        tokens_batch: Sequence[Union[List[Token], TokenSequence]],
+        spans_batch: Sequence[Sequence[TokenEntitySpan]],
+        doc_ids: Sequence[Optional[str]],
+        indices_batch: Sequence[List[int]],
+    ) -> List[ValidationIssue]:
+        checked = [
+            (doc_id, k, spans[k])
+            for spans, doc_id, indices in zip(spans_batch, doc_ids, indices_batch)
+            for k in indices
+        ]
+        if not checked:
+            return []
+
+        # 1. Tokenize the expected texts in one call
+        expected_ids = self.tokenizer(
+            [span.entity.text for _, _, span in checked], add_special_tokens=False
+        )["input_ids"]
+
+        # 2. Reconstruct the token ids from the original token lists
+        actual_ids = []
+        for tokens, spans, indices in zip(tokens_batch, spans_batch, indices_batch):
+            ids = (
+                tokens.ids.tolist()
+                if isinstance(tokens, TokenSequence)
+                else [t.id for t in tokens]
+            )
+            actual_ids.extend([ids[i] for i in spans[k].token_indices] for k in indices)
+
+        # 3. Decode both sides in one call and compare
+        decoded = [
+            self._normalize(d)
+            for d in self.tokenizer.batch_decode(list(expected_ids) + actual_ids)
+        ]
+        n = len(checked)
+        return [
+            ValidationIssue.trusted(
+                error="token_mismatch",
+                message=f"Token span and entity span mismatch:\n"
+                f"  Decoded actual: '{decoded_actual}'\n"
+                f"  Decoded expected: '{decoded_expected}'",
+                doc_id=doc_id,
+                index=k,
+            )
+            for (doc_id, k, _), decoded_expected, decoded_actual in zip(
+                checked, decoded[:n], decoded[n:]
+            )
+            if decoded_expected != decoded_actual
+        ]
+
+    @staticmethod
+    def _normalize(decoded: str) -> str:
+        decoded = decoded.strip()
+        decoded = decoded.replace("##", "").strip()
+        decoded = decoded.replace("Ġ", "").strip()
+        return decoded
+
+
+def _report(on_error: Literal["warn", "raise"], message: str) -> None:
+    if on_error == "warn":
+        print(f"Warning: {message}")
+    else:
+        raise ValueError(message)
+
+
+def _collect(
+    on_error: Literal["warn", "raise"],
+    report: ValidationReport,
+    n_checked: int,
+    issues: List[ValidationIssue],
+    n_failed: int,
+) -> None:
+    if issues and on_error == "raise":
+        raise ValueError(issues[0].message)
+    report.update(n_checked, issues, n_failed)
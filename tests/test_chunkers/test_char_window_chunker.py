@@ -0,0 +1,85 @@
+import pytest
+from chisel.extraction.chunkers.char_window_chunker import CharWindowTextChunker
+from chisel.extraction.models.models import EntitySpan
+
+
+def make_entity(text, surface, label="ENT"):
+    start = text.index(surface)
+    return EntitySpan(text=surface, start=start, end=start + len(surface), label=label)
+
+
+@pytest.fixture
+def document():
+    text = (
+        "Barack Obama visited Paris. He met Emmanuel Macron there. "
+        "They discussed climate policy at length. The meeting ended late."
+    )
+    entities = [
+        make_entity(text, "Barack Obama", "PER"),
+        make_entity(text, "Paris", "LOC"),
+        make_entity(text, "Emmanuel Macron", "PER"),
+    ]
+    return text, entities
+
+
+def test_windows_respect_max_chars_and_shift_entities(document):
+    text, entities = document
+    chunker = CharWindowTextChunker(max_chars=40)
+
+    chunks = chunker.chunk(text, entities)
+
+    assert "".join(window for window, _ in chunks) == text
+    assert sum(len(chunk_entities) for _, chunk_entities in chunks) == len(entities)
+    for window, chunk_entities in chunks:
+        assert len(window) <= 40
+        for entity in chunk_entities:
+            assert window[entity.start : entity.end] == entity.text
+
+
+def test_prefers_sentence_boundaries(document):
+    text, entities = document
+    chunker = CharWindowTextChunker(max_chars=40, min_fill=0.5)
+
+    windows = [window for window, _ in chunker.chunk(text, entities)]
+
+    assert windows[0] == "Barack Obama visited Paris. "
+
+
+def test_never_cuts_inside_entities():
+    text = "aaaa bbbbbbbbbbbbbbbb cc"
+    entities = [make_entity(text, "bbbbbbbbbbbbbbbb")]
+    chunker = CharWindowTextChunker(max_chars=18)
+
+    chunks = chunker.chunk(text, entities)
+
+    assert [window for window, _ in chunks] == ["aaaa ", "bbbbbbbbbbbbbbbb ", "cc"]
+    assert chunks[1][1][0].start == 0
+
+
+def test_overlap_starts_at_word_boundary(document):
+    text, entities = document
+    chunker = CharWindowTextChunker(max_chars=40, overlap=10)
+
+    windows = list(chunker.windows(text, entities))
+
+    assert windows[0][0] == 0 and windows[-1][1] == len(text)
+    for (start, end), (next_start, _) in zip(windows, windows[1:]):
+        assert start < next_start < end
+        assert text[next_start - 1] == " "
+
+
+def test_iter_chunks_is_lazy(document):
+    text, entities = document
+    chunks = CharWindowTextChunker(max_chars=40).iter_chunks(text, entities)
+
+    window, _ = next(chunks)
+    assert text.startswith(window)
+
+
+def test_short_text_is_a_single_chunk(document):
+    text, entities = document
+    chunks = CharWindowTextChunker(max_chars=1000).chunk(text, entities)
+
+    assert len(chunks) == 1
+    assert chunks[0][0] == text
+    assert chunks[0][1] == entities
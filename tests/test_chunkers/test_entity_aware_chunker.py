@@ -0,0 +1,111 @@
+import random
+
+import pytest
+from chisel.extraction.chunkers.entity_aware_chunker import EntityAwareTokenChunker
+from chisel.extraction.models.models import Token, EntitySpan, TokenEntitySpan
+from chisel.extraction.models.sequences import SpanSet, TokenSequence
+
+
+def make_tokens(words):
+    """Tokens for space separated words; a word given as a tuple is split into subwords."""
+    tokens = []
+    pos = 0
+    for word in words:
+        for piece in word if isinstance(word, tuple) else (word,):
+            tokens.append(
+                Token(id=len(tokens), text=piece, start=pos, end=pos + len(piece))
+            )
+            pos += len(piece)
+        pos += 1
+    return tokens
+
+
+def make_entity(tokens, first, last, label="ENT"):
+    return TokenEntitySpan(
+        entity=EntitySpan(
+            text="x", start=tokens[first].start, end=tokens[last].end, label=label
+        ),
+        token_indices=list(range(first, last + 1)),
+    )
+
+
+def test_never_splits_entities():
+    tokens = make_tokens([f"w{i}" for i in range(20)])
+    entities = [make_entity(tokens, 4, 6), make_entity(tokens, 9, 11)]
+    chunker = EntityAwareTokenChunker(max_tokens=5, min_fill=1.0)
+
+    token_chunks, entity_chunks = chunker.chunk(tokens, entities)
+
+    assert all(len(chunk) <= 5 for chunk in token_chunks)
+    assert sum(len(chunk) for chunk in token_chunks) == len(tokens)
+    assert sum(len(chunk) for chunk in entity_chunks) == 2
+    for tokens_chunk, entities_chunk in zip(token_chunks, entity_chunks):
+        for e in entities_chunk:
+            assert all(0 <= idx < len(tokens_chunk) for idx in e.token_indices)
+            assert e.entity.start == tokens_chunk[e.token_indices[0]].start
+
+
+def test_prefers_sentence_boundary():
+    words = ["a", "b", "c", ".", "d", "e", "f", "g", "h"]
+    tokens = make_tokens(words)
+    chunker = EntityAwareTokenChunker(max_tokens=6, min_fill=0.5)
+
+    token_chunks, _ = chunker.chunk(tokens, [])
+
+    assert [t.text for t in token_chunks[0]] == ["a", "b", "c", "."]
+
+
+def test_prefers_whitespace_over_subword_boundary():
+    tokens = make_tokens(["aa", "bb", ("cc", "##dd", "##ee"), "ff"])
+    chunker = EntityAwareTokenChunker(max_tokens=4, min_fill=0.5)
+
+    token_chunks, _ = chunker.chunk(tokens, [])
+
+    assert [t.text for t in token_chunks[0]] == ["aa", "bb"]
+    assert [t.text for t in token_chunks[1]] == ["cc", "##dd", "##ee", "ff"]
+
+
+def test_fills_chunks_and_uses_fewer_chunks_than_overlap():
+    tokens = make_tokens([f"w{i}" for i in range(100)])
+    chunker = EntityAwareTokenChunker(max_tokens=10, min_fill=1.0)
+
+    token_chunks, _ = chunker.chunk(tokens, [])
+
+    assert [len(chunk) for chunk in token_chunks] == [10] * 10
+
+
+def test_entity_longer_than_max_tokens_is_dropped():
+    tokens = make_tokens([f"w{i}" for i in range(10)])
+    entities = [make_entity(tokens, 1, 8)]
+    chunker = EntityAwareTokenChunker(max_tokens=4)
+
+    token_chunks, entity_chunks = chunker.chunk(tokens, entities)
+
+    assert all(len(chunk) <= 4 for chunk in token_chunks)
+    assert all(chunk == [] for chunk in entity_chunks)
+
+
+def test_columnar_matches_list_path():
+    rng = random.Random(0)
+    words = [rng.choice(["word", ".", ("sub", "##word"), "x"]) for _ in range(200)]
+    tokens = make_tokens(words)
+    entities = []
+    for _ in range(30):
+        first = rng.randrange(len(tokens) - 3)
+        entities.append(make_entity(tokens, first, first + rng.randrange(3)))
+    chunker = EntityAwareTokenChunker(max_tokens=16)
+
+    token_chunks, entity_chunks = chunker.chunk(tokens, entities)
+    columnar_tokens, columnar_entities = chunker.chunk(
+        TokenSequence.from_tokens(tokens), SpanSet.from_token_entity_spans(entities)
+    )
+
+    assert [c.to_tokens() for c in columnar_tokens] == token_chunks
+    assert [c.to_token_entity_spans() for c in columnar_entities] == entity_chunks
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        EntityAwareTokenChunker(max_tokens=0)
+    with pytest.raises(ValueError):
+        EntityAwareTokenChunker(min_fill=1.5)
@@ -1,6 +1,7 @@
 import pytest
 from chisel.extraction.chunkers.fixed_length_chunker import FixedLengthTokenChunker
 from chisel.extraction.models.models import Token, EntitySpan, TokenEntitySpan
+from chisel.extraction.models.sequences import SpanSet, TokenSequence
 
 
 @pytest.fixture
@@ -53,3 +54,76 @@ def test_no_entities_still_chunks():
     assert len(token_chunks) == 3
     assert all(isinstance(chunk, list) for chunk in token_chunks)
     assert all(ec == [] for ec in entity_chunks)
+
+
+def brute_force_chunk(tokens, entities, max_tokens, overlap):
+    """Reference: checks every entity against every window."""
+    windows = []
+    i = 0
+    while i < len(tokens):
+        if len(tokens[i : i + max_tokens]) < overlap and i != 0:
+            break
+        windows.append(
+            [
+                k
+                for k, e in enumerate(entities)
+                if all(i <= idx < i + max_tokens for idx in e.token_indices)
+            ]
+        )
+        i += max_tokens - overlap
+    return windows
+
+
+def test_chunk_matches_brute_force_window_selection():
+    import random
+
+    rng = random.Random(0)
+    tokens = [Token(id=i, text=f"T{i}", start=i * 2, end=(i + 1) * 2) for i in range(60)]
+    entities = []
+    for _ in range(40):
+        first = rng.randrange(60)
+        last = min(59, first + rng.randrange(4))
+        indices = list(range(first, last + 1)) if rng.random() > 0.1 else []
+        entities.append(
+            TokenEntitySpan(
+                entity=EntitySpan(text="x", start=first * 2, end=(last + 1) * 2, label="E"),
+                token_indices=indices,
+            )
+        )
+
+    for max_tokens, overlap in [(7, 0), (7, 3), (16, 5), (100, 0)]:
+        chunker = FixedLengthTokenChunker(max_tokens=max_tokens, overlap=overlap)
+        token_chunks, entity_chunks = chunker.chunk(tokens, entities)
+        expected = brute_force_chunk(tokens, entities, max_tokens, overlap)
+
+        assert len(entity_chunks) == len(expected)
+        stride = max_tokens - overlap
+        for w, (chunk, selected) in enumerate(zip(entity_chunks, expected)):
+            i = w * stride
+            offset = tokens[i].start
+            assert [e.entity.start + offset for e in chunk] == [
+                entities[k].entity.start for k in selected
+            ]
+            assert [[idx + i for idx in e.token_indices] for e in chunk] == [
+                entities[k].token_indices for k in selected
+            ]
+
+        columnar_tokens, columnar_entities = chunker.chunk(
+            TokenSequence.from_tokens(tokens), SpanSet.from_token_entity_spans(entities)
+        )
+        assert [c.to_tokens() for c in columnar_tokens] == token_chunks
+        assert [c.to_token_entity_spans() for c in columnar_entities] == entity_chunks
+
+
+def test_chunk_preserves_entity_order(simple_data):
+    tokens, _ = simple_data
+    late = TokenEntitySpan(
+        entity=EntitySpan(text="T3", start=6, end=8, label="B"), token_indices=[3]
+    )
+    early = TokenEntitySpan(
+        entity=EntitySpan(text="T1", start=2, end=4, label="A"), token_indices=[1]
+    )
+    chunker = FixedLengthTokenChunker(max_tokens=5, overlap=0)
+    _, entity_chunks = chunker.chunk(tokens, [late, early])
+
+    assert [e.entity.label for e in entity_chunks[0]] == ["B", "A"]
@@ -0,0 +1,79 @@
+import pytest
+from chisel.extraction.chunkers.fixed_length_chunker import FixedLengthTokenChunker
+from chisel.extraction.chunkers.hf_overflow_chunker import HFOverflowTokenChunker
+from chisel.extraction.models.models import EntitySpan
+from chisel.extraction.span_aligners.token_span_aligner import TokenSpanAligner
+from chisel.extraction.tokenizers.hf_tokenizer import HFTokenizer
+
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    return HFTokenizer()
+
+
+def make_entity(text, surface, label="ENT"):
+    start = text.index(surface)
+    return EntitySpan(text=surface, start=start, end=start + len(surface), label=label)
+
+
+@pytest.fixture
+def document():
+    text = (
+        "Barack Obama visited Paris in 2009. He met Emmanuel Macron there, and "
+        "they discussed climate policy at the Élysée Palace for hours."
+    )
+    entities = [
+        make_entity(text, "Barack Obama", "PER"),
+        make_entity(text, "Paris", "LOC"),
+        make_entity(text, "Emmanuel Macron", "PER"),
+        make_entity(text, "Élysée Palace", "LOC"),
+    ]
+    return text, entities
+
+
+@pytest.mark.parametrize("max_tokens,overlap", [(8, 0), (8, 3), (5, 2), (64, 0)])
+def test_matches_tokenize_align_and_fixed_length_chunking(
+    tokenizer, document, max_tokens, overlap
+):
+    text, entities = document
+    tokens = tokenizer.tokenize(text)
+    expected = FixedLengthTokenChunker(max_tokens, overlap).chunk(
+        tokens, TokenSpanAligner().align(entities, tokens)
+    )
+
+    chunker = HFOverflowTokenChunker(tokenizer, max_tokens=max_tokens, overlap=overlap)
+
+    assert chunker.tokenize_and_chunk(text, entities) == expected
+
+
+def test_columnar_output_matches_list_output(tokenizer, document):
+    text, entities = document
+    token_chunks, entity_chunks = HFOverflowTokenChunker(
+        tokenizer, max_tokens=8, overlap=3
+    ).tokenize_and_chunk(text, entities)
+
+    columnar_tokens, columnar_entities = HFOverflowTokenChunker(
+        tokenizer, max_tokens=8, overlap=3, columnar=True
+    ).tokenize_and_chunk(text, entities)
+
+    assert [chunk.to_tokens() for chunk in columnar_tokens] == token_chunks
+    assert [
+        chunk.to_token_entity_spans() for chunk in columnar_entities
+    ] == entity_chunks
+
+
+def test_batch_groups_windows_per_document(tokenizer, document):
+    text, entities = document
+    chunker = HFOverflowTokenChunker(tokenizer, max_tokens=6, overlap=2)
+
+    results = chunker.tokenize_and_chunk_batch(["", text, "Paris"], [[], entities, []])
+
+    assert results[0] == ([], [])
+    assert results[1] == chunker.tokenize_and_chunk(text, entities)
+    assert [[t.text for t in chunk] for chunk in results[2][0]] == [["Paris"]]
+
+
+def test_rejects_overlap_the_tokenizer_cannot_stride(tokenizer):
+    # BERT adds [CLS] and [SEP], so the tokenizer only accepts strides below max_tokens - 2.
+    with pytest.raises(ValueError):
+        HFOverflowTokenChunker(tokenizer, max_tokens=8, overlap=6)
@@ -0,0 +1,66 @@
+import json
+import pytest
+import torch
+from chisel.extraction.exporters.memmap_exporter import MemmapExporter
+from chisel.extraction.formatters.torch_formatter import (
+    MemmapTorchNERDataset,
+    PaddingCollator,
+    TorchDatasetFormatter,
+)
+from chisel.extraction.models.models import ChiselRecord
+
+
+def _records(lengths):
+    return [
+        ChiselRecord(
+            id=str(i),
+            chunk_id=0,
+            text="",
+            tokens=[],
+            entities=[],
+            input_ids=list(range(100, 100 + n)),
+            attention_mask=[1] * n,
+            labels=[-100] + [i] * (n - 1),
+        )
+        for i, n in enumerate(lengths)
+    ]
+
+
+def test_memmap_exporter_round_trip(tmp_path):
+    records = _records([3, 1, 4, 2, 5])
+    MemmapExporter(str(tmp_path), batch_size=2).export(iter(records))
+
+    meta = json.loads((tmp_path / "meta.json").read_text())
+    assert meta["num_records"] == 5
+    assert meta["num_tokens"] == 15
+    assert (tmp_path / "input_ids.bin").stat().st_size == 15 * 4
+
+    dataset = MemmapTorchNERDataset(str(tmp_path))
+    expected = TorchDatasetFormatter().format(records)
+    assert len(dataset) == 5
+    assert dataset.lengths == [3, 1, 4, 2, 5]
+    for i in range(5):
+        assert dataset[i].keys() == expected[i].keys()
+        for name in expected[i]:
+            assert torch.equal(dataset[i][name].long(), expected[i][name])
+
+    batch = PaddingCollator()([dataset[0], dataset[1]])
+    assert batch["labels"].dtype == torch.long
+    assert batch["labels"].tolist() == [[-100, 0, 0], [-100, -100, -100]]
+
+
+def test_memmap_exporter_rejects_values_that_do_not_fit(tmp_path):
+    records = _records([2])
+    records[0].labels = [0, 40_000]
+    with pytest.raises(ValueError, match="do not fit"):
+        MemmapExporter(str(tmp_path)).export(records)
+
+    MemmapExporter(str(tmp_path), dtypes={"labels": "int32"}).export(records)
+    assert MemmapTorchNERDataset(str(tmp_path))[0]["labels"].tolist() == [0, 40_000]
+
+
+def test_memmap_exporter_requires_fields_on_every_record(tmp_path):
+    records = _records([2, 2])
+    records[1].labels = None
+    with pytest.raises(ValueError, match="must have 2 labels"):
+        MemmapExporter(str(tmp_path)).export(records)
@@ -0,0 +1,165 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from chisel.extraction.exporters.parquet_exporter import ParquetExporter
+from chisel.extraction.models.models import (
+    ChiselRecord,
+    EntitySpan,
+    RecordSegment,
+    Token,
+)
+from chisel.extraction.models.sequences import SpanSet, TokenSequence
+
+
+def _records(n, chunks=1):
+    records = []
+    for i in range(n):
+        records.append(
+            ChiselRecord(
+                id=f"doc-{i % chunks}",
+                chunk_id=i,
+                text="Alice met Bob",
+                tokens=[
+                    Token(id=0, text="Alice", start=0, end=5),
+                    Token(id=1, text="met", start=6, end=9),
+                    Token(id=2, text="Bob", start=10, end=13),
+                ],
+                entities=[
+                    EntitySpan(
+                        text="Alice", start=0, end=5, label="PER", attributes={"k": "v"}
+                    ),
+                    EntitySpan(text="Bob", start=10, end=13, label="PER"),
+                ],
+                bio_labels=["B-PER", "O", "B-PER"],
+                labels=[1, 0, 1],
+                input_ids=[101, 102, 103],
+                attention_mask=[1, 1, 1],
+            )
+        )
+    return records
+
+
+def test_parquet_exporter_round_trip(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    ParquetExporter(path).export(iter(_records(3)))
+
+    table = pq.read_table(path)
+    assert table.num_rows == 3
+    row = table.slice(2, 1).to_pylist()[0]
+    assert row["id"] == "doc-0"
+    assert row["chunk_id"] == 2
+    assert [t["text"] for t in row["tokens"]] == ["Alice", "met", "Bob"]
+    assert row["tokens"][2] == {"id": 2, "text": "Bob", "start": 10, "end": 13}
+    assert row["entities"][0]["label"] == "PER"
+    assert row["entities"][0]["attributes"] == [("k", "v")]
+    assert row["bio_labels"] == ["B-PER", "O", "B-PER"]
+    assert row["input_ids"] == [101, 102, 103]
+    assert row["position_ids"] is None
+    assert row["segments"] is None
+
+
+def test_parquet_exporter_columnar_inputs(tmp_path):
+    record = ChiselRecord.trusted(
+        id="a",
+        chunk_id=0,
+        text="Alice met Bob",
+        tokens=TokenSequence(
+            ids=[0, 1, 2],
+            starts=[0, 6, 10],
+            ends=[5, 9, 13],
+            texts=["Alice", "met", "Bob"],
+        ),
+        entities=SpanSet(starts=[10], ends=[13], labels=["PER"], texts=["Bob"]),
+        multi_labels=np.array([[1, 0], [0, 0], [1, 1]]),
+        segments=[
+            RecordSegment(
+                id="a",
+                chunk_id=0,
+                token_start=0,
+                token_end=3,
+                char_start=0,
+                char_end=13,
+            )
+        ],
+    )
+    path = str(tmp_path / "out.parquet")
+    ParquetExporter(path).export([record])
+
+    row = pq.read_table(path).to_pylist()[0]
+    assert [t["start"] for t in row["tokens"]] == [0, 6, 10]
+    assert row["entities"] == [
+        {"text": "Bob", "start": 10, "end": 13, "label": "PER", "attributes": []}
+    ]
+    assert row["multi_labels"] == [[0], [], [0, 1]]
+    assert row["segments"][0]["char_end"] == 13
+
+
+def test_parquet_exporter_row_groups_and_projection(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    ParquetExporter(path, row_group_size=4, compression="snappy").export(_records(10))
+
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_row_groups == 3
+    assert metadata.row_group(0).num_rows == 4
+    assert metadata.row_group(0).column(0).compression == "SNAPPY"
+
+    table = pq.read_table(path, columns=["input_ids", "labels"])
+    assert table.column_names == ["input_ids", "labels"]
+    assert table.column("labels").to_pylist()[0] == [1, 0, 1]
+
+
+def test_parquet_exporter_dictionary_labels(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    ParquetExporter(path).export(_records(2))
+    schema = pq.read_schema(path)
+    assert pa.types.is_dictionary(schema.field("bio_labels").type.value_type)
+
+    path = str(tmp_path / "plain.parquet")
+    ParquetExporter(path, dictionary_labels=False).export(_records(2))
+    assert pq.read_schema(path).field("bio_labels").type == pa.list_(pa.string())
+
+
+def test_parquet_exporter_partitioning(tmp_path):
+    ParquetExporter(str(tmp_path), row_group_size=2, partition_by="id").export(
+        _records(5, chunks=2)
+    )
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["id=doc-0", "id=doc-1"]
+    part = pq.read_table(str(tmp_path / "id=doc-0" / "part-0.parquet"))
+    assert "id" not in part.column_names
+    assert part.column("chunk_id").to_pylist() == [0, 2, 4]
+
+    table = pq.read_table(str(tmp_path))
+    assert table.num_rows == 5
+    assert sorted(table.column("id").to_pylist()) == ["doc-0"] * 3 + ["doc-1"] * 2
+
+
+def test_parquet_exporter_many_partitions(tmp_path):
+    records = _records(300, chunks=100)
+    exporter = ParquetExporter(
+        str(tmp_path), row_group_size=50, partition_by="id", max_open_files=8
+    )
+    exporter.export(iter(records))
+
+    assert len(list(tmp_path.iterdir())) == 100
+    # doc-0 was closed between flushes, so its records span several part files.
+    parts = sorted(p.name for p in (tmp_path / "id=doc-0").iterdir())
+    assert parts == ["part-0.parquet", "part-1.parquet", "part-2.parquet"]
+
+    table = pq.read_table(str(tmp_path))
+    assert table.num_rows == 300
+    assert sorted(table.column("chunk_id").to_pylist()) == list(range(300))
+
+
+def test_parquet_exporter_empty_and_invalid(tmp_path):
+    path = str(tmp_path / "empty.parquet")
+    ParquetExporter(path).export([])
+    assert pq.read_table(path).num_rows == 0
+
+    with pytest.raises(ValueError):
+        ParquetExporter(path, partition_by="tokens")
+    with pytest.raises(ValueError):
+        ParquetExporter(path, row_group_size=0)
+    with pytest.raises(ValueError):
+        ParquetExporter(path, max_open_files=0)
@@ -0,0 +1,203 @@
+import gc
+import multiprocessing
+import os
+import pickle
+import numpy as np
+import pytest
+from chisel.extraction.exporters.shard_exporter import (
+    ShardExporter,
+    ShardReader,
+    decode_record,
+    encode_record,
+)
+from chisel.extraction.models.models import (
+    ChiselRecord,
+    EntitySpan,
+    RecordSegment,
+    Token,
+)
+from chisel.extraction.models.sequences import TokenLabelMatrix
+
+
+def _record(i=0, **fields):
+    return ChiselRecord(
+        id=f"doc-{i}",
+        chunk_id=i,
+        text="Alice met Bob",
+        tokens=[
+            Token(id=0, text="Alice", start=0, end=5),
+            Token(id=1, text="met", start=6, end=9),
+            Token(id=2, text="##bob", start=10, end=13),
+        ],
+        entities=[
+            EntitySpan(text="Alice", start=0, end=5, label="PER"),
+            EntitySpan(
+                text="Bob", start=10, end=13, label="PER", attributes={"k": "v"}
+            ),
+        ],
+        bio_labels=["B-PER", "O", "B-PER"],
+        labels=[1, -100, 1],
+        input_ids=[101, 70_000, i],
+        attention_mask=[1, 1, 1],
+        **fields,
+    )
+
+
+def _assert_same(decoded, record):
+    assert decoded.id == record.id
+    assert decoded.chunk_id == record.chunk_id
+    assert decoded.text == record.text
+    assert decoded.tokens.to_tokens() == record.tokens
+    assert decoded.entities.to_entities() == record.entities
+    for name in ("bio_labels", "labels", "input_ids", "attention_mask", "segments"):
+        assert getattr(decoded, name) == getattr(record, name)
+
+
+def test_encode_decode_round_trip():
+    record = _record(
+        position_ids=[0, 1, 0],
+        segment_ids=[0, 0, 1],
+        segments=[
+            RecordSegment(
+                id="a", chunk_id=0, token_start=0, token_end=2, char_start=0, char_end=9
+            ),
+            RecordSegment(
+                id="b",
+                chunk_id=4,
+                token_start=2,
+                token_end=3,
+                char_start=10,
+                char_end=13,
+            ),
+        ],
+        multi_labels=TokenLabelMatrix([0, 1, 1, 3], [0, 0, 1], ["PER", "ORG"]),
+    )
+    decoded = decode_record(encode_record(record))
+
+    _assert_same(decoded, record)
+    assert decoded.position_ids == [0, 1, 0]
+    assert decoded.segment_ids == [0, 0, 1]
+    assert decoded.multi_labels == record.multi_labels
+
+
+def test_encode_dense_multi_labels_and_missing_fields():
+    matrix = np.array([[True, False], [False, False], [True, True]])
+    record = ChiselRecord(
+        id="a",
+        chunk_id=0,
+        text="",
+        tokens=[],
+        entities=[],
+        multi_labels=matrix,
+    )
+    decoded = decode_record(encode_record(record))
+
+    assert len(decoded.tokens) == 0 and len(decoded.entities) == 0
+    assert decoded.labels is None and decoded.bio_labels is None
+    np.testing.assert_array_equal(decoded.multi_labels, matrix)
+    assert decoded.multi_labels.dtype == bool
+
+
+def test_encode_record_is_compact():
+    n = 128
+    record = ChiselRecord(
+        id="a",
+        chunk_id=0,
+        text=" ".join(["word"] * n),
+        tokens=[Token(id=i, text="word", start=5 * i, end=5 * i + 4) for i in range(n)],
+        entities=[],
+        labels=[0] * n,
+        input_ids=list(range(1000, 1000 + n)),
+        attention_mask=[1] * n,
+    )
+    assert len(encode_record(record)) < len(pickle.dumps(record)) / 4
+
+
+def test_shard_exporter_random_access(tmp_path):
+    records = [_record(i) for i in range(7)]
+    ShardExporter(str(tmp_path), shard_size=3).export(iter(records))
+
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == [
+        f"shard-0000{n}.bin{suffix}" for n in range(3) for suffix in ("", ".idx")
+    ]
+
+    with ShardReader(str(tmp_path)) as reader:
+        assert len(reader) == 7
+        for i in (6, 0, 3, 2, -1):
+            _assert_same(reader[i], records[i])
+        assert [r.id for r in reader] == [r.id for r in records]
+        with pytest.raises(IndexError):
+            reader[7]
+
+        with pickle.loads(pickle.dumps(reader)) as restored:
+            _assert_same(restored[4], records[4])
+
+
+def test_shard_exporter_replaces_previous_export(tmp_path):
+    ShardExporter(str(tmp_path), shard_size=1).export([_record(i) for i in range(3)])
+    ShardExporter(str(tmp_path), shard_size=1).export([_record(9)])
+
+    with ShardReader(str(tmp_path)) as reader:
+        assert len(reader) == 1
+        assert reader[0].id == "doc-9"
+
+
+def test_shard_reader_closes_files(tmp_path):
+    ShardExporter(str(tmp_path), shard_size=2).export([_record(i) for i in range(4)])
+
+    with ShardReader(str(tmp_path)) as reader:
+        reader[0]
+        reader[3]
+        fds = list(reader._files.values())
+        assert len(fds) == 2
+    for fd in fds:
+        with pytest.raises(OSError):
+            os.fstat(fd)
+
+    reader = ShardReader(str(tmp_path))
+    reader[0]
+    (fd,) = reader._files.values()
+    del reader
+    gc.collect()
+    with pytest.raises(OSError):
+        os.fstat(fd)
+
+
+def test_shard_reader_missing_directory(tmp_path):
+    with pytest.raises(ValueError):
+        ShardReader(str(tmp_path / "missing"))
+    with pytest.raises(ValueError):
+        ShardExporter(str(tmp_path), shard_size=0)
+
+
+def _read_ids(reader, indices, queue):
+    queue.put([reader[i].id for i in indices])
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_shard_reader_forked_workers(tmp_path):
+    records = [_record(i) for i in range(200)]
+    ShardExporter(str(tmp_path), shard_size=64).export(records)
+    reader = ShardReader(str(tmp_path))
+    reader[0]  # The parent opens a shard before forking.
+
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    rng = np.random.default_rng(0)
+    jobs = [rng.integers(0, 200, 500).tolist() for _ in range(4)]
+    workers = [
+        context.Process(target=_read_ids, args=(reader, indices, queue))
+        for indices in jobs
+    ]
+    for worker in workers:
+        worker.start()
+    results = sorted(queue.get(timeout=60) for _ in workers)
+    for worker in workers:
+        worker.join()
+
+    assert results == sorted([f"doc-{i}" for i in indices] for indices in jobs)
+    assert reader[199].id == "doc-199"
+    reader.close()
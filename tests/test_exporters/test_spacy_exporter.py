@@ -0,0 +1,87 @@
+import pytest
+import spacy
+from spacy.tokens import DocBin
+from chisel.extraction.exporters.spacy_exporter import SpacyDocBinExporter
+from chisel.extraction.models.models import ChiselRecord, EntitySpan
+from chisel.extraction.models.sequences import SpanSet
+
+
+def _record(i, text, entities):
+    return ChiselRecord(
+        id=f"doc-{i}", chunk_id=i, text=text, tokens=[], entities=entities
+    )
+
+
+def _docs(path):
+    nlp = spacy.blank("en")
+    docs = []
+    for shard in sorted(path.glob("*.spacy")):
+        docs.extend(DocBin().from_disk(shard).get_docs(nlp.vocab))
+    return docs
+
+
+def test_spacy_exporter_writes_shards(tmp_path):
+    records = [
+        _record(
+            i,
+            "Alice met Bob in Paris.",
+            [
+                EntitySpan(text="Alice", start=0, end=5, label="PER"),
+                EntitySpan(text="Paris", start=17, end=22, label="LOC"),
+            ],
+        )
+        for i in range(5)
+    ]
+    exporter = SpacyDocBinExporter(str(tmp_path), shard_size=2, batch_size=3)
+    exporter.export(iter(records))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "shard-00000.spacy",
+        "shard-00001.spacy",
+        "shard-00002.spacy",
+    ]
+    docs = _docs(tmp_path)
+    assert len(docs) == 5
+    assert [(e.text, e.label_) for e in docs[3].ents] == [
+        ("Alice", "PER"),
+        ("Paris", "LOC"),
+    ]
+    assert docs[3].user_data["id"] == "doc-3"
+    assert docs[3].user_data["chunk_id"] == 3
+    assert exporter.report.n_checked == 10
+    assert exporter.report.ok
+
+
+def test_spacy_exporter_alignment_and_overlaps(tmp_path):
+    record = _record(
+        0,
+        "New York City is big.",
+        SpanSet(
+            starts=[0, 0, 4],
+            ends=[13, 3, 6],
+            labels=["LOC", "LOC", "MISC"],
+            texts=["New York City", "New", "Yo"],
+        ),
+    )
+    exporter = SpacyDocBinExporter(str(tmp_path), spans_key="sc")
+    exporter.export([record])
+
+    doc = _docs(tmp_path)[0]
+    assert [e.text for e in doc.ents] == ["New York City"]
+    assert [s.text for s in doc.spans["sc"]] == ["New York City", "New"]
+    assert exporter.report.counts == {"misaligned_span": 1, "overlapping_span": 1}
+
+    SpacyDocBinExporter(str(tmp_path), alignment_mode="expand").export([record])
+    doc = _docs(tmp_path)[0]
+    assert [e.text for e in doc.ents] == ["New York City"]
+
+
+def test_spacy_exporter_raise_and_empty(tmp_path):
+    record = _record(0, "Alice", [EntitySpan(text="Ali", start=0, end=3, label="PER")])
+    with pytest.raises(ValueError):
+        SpacyDocBinExporter(str(tmp_path), on_error="raise").export([record])
+
+    SpacyDocBinExporter(str(tmp_path)).export([])
+    assert _docs(tmp_path) == []
+    with pytest.raises(ValueError):
+        SpacyDocBinExporter(str(tmp_path), alignment_mode="nearest")
@@ -33,3 +33,103 @@ def test_hf_formatter_basic():
     assert row["attention_mask"] == [1, 1]
     assert row["labels"] == [0, 1]
     assert row["bio_labels"] == ["B-GREETING", "O"]
+
+
+def test_hf_formatter_columnar_tokens():
+    from chisel.extraction.models.sequences import TokenSequence
+
+    tokens = TokenSequence(
+        ids=[101, 102], starts=[0, 6], ends=[5, 11], texts=["Hello", "world"]
+    )
+    record = ChiselRecord(
+        id="1",
+        chunk_id=0,
+        text="Hello world",
+        tokens=tokens,
+        entities=[],
+        input_ids=[101, 102],
+        attention_mask=[1, 1],
+        labels=[0, 0],
+    )
+
+    ds = HFDatasetFormatter().format([record])
+    assert ds[0]["tokens"] == ["Hello", "world"]
+
+
+def test_hf_formatter_multi_labels_as_tag_index_sequences():
+    import numpy as np
+
+    record = ChiselRecord(
+        id="1",
+        chunk_id=0,
+        text="Hello world",
+        tokens=[
+            Token(id=101, text="Hello", start=0, end=5),
+            Token(id=102, text="world", start=6, end=11),
+        ],
+        entities=[],
+        input_ids=[101, 102],
+        attention_mask=[1, 1],
+        labels=[0, 0],
+        multi_labels=np.array([[True, True], [False, False]]),
+    )
+
+    ds = HFDatasetFormatter().format([record])
+    assert ds[0]["multi_labels"] == [[0, 1], []]
+
+
+def _records(n):
+    import numpy as np
+    from chisel.extraction.models.sequences import TokenLabelMatrix
+
+    records = []
+    for i in range(n):
+        multi_labels = np.array([[True, False, True], [False, False, False]])
+        records.append(
+            ChiselRecord(
+                id=str(i),
+                chunk_id=i,
+                text="Hello world",
+                tokens=[
+                    Token(id=101, text="Hello", start=0, end=5),
+                    Token(id=102, text="world", start=6, end=11),
+                ],
+                entities=[],
+                input_ids=[101, 102],
+                attention_mask=[1, 1],
+                labels=[0, i] if i % 2 else None,
+                multi_labels=(
+                    TokenLabelMatrix.from_dense(multi_labels, ["A", "B", "C"])
+                    if i % 3
+                    else multi_labels
+                ),
+            )
+        )
+    return records
+
+
+def test_hf_formatter_batches_missing_fields_and_sparse_multi_labels():
+    ds = HFDatasetFormatter(shard_size=2).format(_records(5))
+
+    assert len(ds) == 5
+    assert ds["id"] == ["0", "1", "2", "3", "4"]
+    assert ds["labels"] == [None, [0, 1], None, [0, 3], None]
+    assert ds["bio_labels"] == [None] * 5
+    assert ds["multi_labels"] == [[[0, 2], []]] * 5
+
+
+def test_hf_formatter_streams_shards_to_cache_dir(tmp_path):
+    records = _records(5)
+    expected = HFDatasetFormatter().format(records)
+
+    ds = HFDatasetFormatter(shard_size=2, cache_dir=str(tmp_path)).format(iter(records))
+
+    (directory,) = tmp_path.iterdir()
+    assert sorted(p.name for p in directory.iterdir()) == [
+        "shard-00000.arrow",
+        "shard-00001.arrow",
+        "shard-00002.arrow",
+    ]
+    assert ds.features == expected.features
+    assert ds.to_list() == expected.to_list()
+    assert len(HFDatasetFormatter(cache_dir=str(tmp_path)).format([])) == 0
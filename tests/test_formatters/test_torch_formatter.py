@@ -30,3 +30,171 @@ def test_torch_formatter_basic():
     assert item["input_ids"].tolist() == [101, 102]
     assert item["attention_mask"].tolist() == [1, 1]
     assert item["labels"].tolist() == [0, 1]
+
+
+def test_torch_formatter_multi_labels_are_multi_hot():
+    from chisel.extraction.models.sequences import TokenLabelMatrix
+
+    record = ChiselRecord(
+        id="1",
+        chunk_id=0,
+        text="Hello world",
+        tokens=[
+            Token(id=101, text="Hello", start=0, end=5),
+            Token(id=102, text="world", start=6, end=11),
+        ],
+        entities=[],
+        input_ids=[101, 102],
+        attention_mask=[1, 1],
+        labels=[0, 0],
+        multi_labels=TokenLabelMatrix([0, 2, 2], [0, 1], ["B-A", "B-B"]),
+    )
+
+    item = TorchDatasetFormatter().format([record])[0]
+
+    assert item["multi_labels"].tolist() == [[1.0, 1.0], [0.0, 0.0]]
+
+
+def _records(lengths):
+    import numpy as np
+
+    return [
+        ChiselRecord(
+            id=str(i),
+            chunk_id=0,
+            text="",
+            tokens=[],
+            entities=[],
+            input_ids=list(range(1, n + 1)),
+            attention_mask=[1] * n,
+            labels=[i] * n,
+            multi_labels=np.eye(n, 2, dtype=bool),
+        )
+        for i, n in enumerate(lengths)
+    ]
+
+
+def test_torch_formatter_contiguous_matches_per_record_tensors():
+    import torch
+
+    records = _records([3, 1, 4])
+    dataset = TorchDatasetFormatter(contiguous=True).format(records)
+    expected = TorchDatasetFormatter().format(records)
+
+    assert len(dataset) == 3
+    assert dataset.lengths == [3, 1, 4]
+    assert dataset.offsets.tolist() == [0, 3, 4, 8]
+    assert dataset.values["input_ids"].shape == (8,)
+    for i in range(3):
+        assert dataset[i].keys() == expected[i].keys()
+        for name in expected[i]:
+            assert torch.equal(dataset[i][name], expected[i][name])
+
+
+def test_torch_formatter_contiguous_requires_fields_on_all_records():
+    records = _records([2, 2])
+    records[1].labels = None
+    with pytest.raises(ValueError, match="labels"):
+        TorchDatasetFormatter(contiguous=True).format(records)
+
+
+def test_torch_formatter_contiguous_empty():
+    dataset = TorchDatasetFormatter(contiguous=True).format([])
+    assert len(dataset) == 0
+    assert dataset.offsets.tolist() == [0]
+
+
+@pytest.mark.parametrize("shuffle", [True, False])
+@pytest.mark.parametrize("drop_last", [True, False])
+def test_length_bucket_sampler(shuffle, drop_last):
+    from chisel.extraction.formatters.torch_formatter import LengthBucketSampler
+
+    lengths = [5, 1, 9, 3, 7, 2, 8, 4, 6, 10, 11]
+    sampler = LengthBucketSampler(
+        lengths, batch_size=2, bucket_batches=3, shuffle=shuffle, drop_last=drop_last, seed=0
+    )
+    batches = list(sampler)
+
+    assert len(batches) == len(sampler)
+    indices = [i for batch in batches for i in batch]
+    assert len(indices) == len(set(indices))
+    if not drop_last:
+        assert sorted(indices) == list(range(len(lengths)))
+    else:
+        assert all(len(batch) == 2 for batch in batches)
+    if not shuffle:
+        assert [lengths[i] for i in indices] == sorted(lengths)[: len(indices)]
+
+
+def test_padding_collator_pads_each_batch_to_its_longest_record():
+    from chisel.extraction.formatters.torch_formatter import PaddingCollator
+
+    dataset = TorchDatasetFormatter(contiguous=True).format(_records([3, 1]))
+    batch = PaddingCollator(pad_token_id=9)([dataset[0], dataset[1]])
+
+    assert batch["input_ids"].tolist() == [[1, 2, 3], [1, 9, 9]]
+    assert batch["attention_mask"].tolist() == [[1, 1, 1], [1, 0, 0]]
+    assert batch["labels"].tolist() == [[0, 0, 0], [1, -100, -100]]
+    assert batch["multi_labels"].shape == (2, 3, 2)
+
+    batch = PaddingCollator(pad_to_multiple_of=8)([dataset[0], dataset[1]])
+    assert batch["input_ids"].shape == (2, 8)
+    assert batch["multi_labels"].shape == (2, 8, 2)
+    assert batch["labels"][0].tolist() == [0, 0, 0] + [-100] * 5
+
+
+def _record(i):
+    return ChiselRecord(
+        id=str(i),
+        chunk_id=0,
+        text="",
+        tokens=[],
+        entities=[],
+        input_ids=[i, i],
+        attention_mask=[1, 1],
+        labels=[0, 0],
+    )
+
+
+def _first_ids(dataset, **loader_kwargs):
+    from torch.utils.data import DataLoader
+
+    loader = DataLoader(dataset, batch_size=None, **loader_kwargs)
+    return [int(item["input_ids"][0]) for item in loader]
+
+
+def test_streaming_dataset_formats_records_in_order():
+    import torch
+
+    dataset = TorchDatasetFormatter().stream(_record(i) for i in range(5))
+
+    items = list(dataset)
+    assert [item["input_ids"].tolist() for item in items] == [[i, i] for i in range(5)]
+    assert items[0]["labels"].dtype == torch.long
+
+
+def test_streaming_dataset_splits_the_stream_across_workers():
+    def process(doc):
+        return [_record(doc), _record(doc + 100)]
+
+    dataset = TorchDatasetFormatter().stream(lambda: range(7), process=process)
+    assert _first_ids(dataset) == [0, 100, 1, 101, 2, 102, 3, 103, 4, 104, 5, 105, 6, 106]
+
+    ids = _first_ids(dataset, num_workers=2)
+    assert sorted(ids) == sorted(list(range(7)) + list(range(100, 107)))
+
+    records = TorchDatasetFormatter().stream(lambda: map(_record, range(9)))
+    assert sorted(_first_ids(records, num_workers=2)) == list(range(9))
+
+
+def test_streaming_dataset_shuffle_buffer_is_seeded_per_epoch():
+    dataset = TorchDatasetFormatter().stream(
+        lambda: map(_record, range(50)), shuffle_buffer=8, seed=0
+    )
+
+    first = _first_ids(dataset)
+    assert sorted(first) == list(range(50))
+    assert first != list(range(50))
+    assert _first_ids(dataset) == first
+    dataset.set_epoch(1)
+    assert _first_ids(dataset) != first
@@ -1,5 +1,6 @@
 import pytest
 from chisel.extraction.models.models import Token, EntitySpan, TokenEntitySpan
+from chisel.extraction.labelers.label_encoder import SimpleLabelEncoder
 from chisel.extraction.labelers.bilo_labeler import BILOLabeler
 
 def test_bilou_labeler_single_token_span():
@@ -60,3 +61,36 @@ def test_bilou_labeler_inside_span():
     labeler = BILOLabeler()
     labels = labeler.label(tokens, [token_entity_span])
     assert labels == ["O", "B-PER", "I-PER", "L-PER"]
+
+
+def test_bilou_label_ids_match_encoded_labels():
+    tokens = [
+        Token(id=1, text="The", start=0, end=3),
+        Token(id=2, text="Barack", start=4, end=10),
+        Token(id=3, text="Hussein", start=11, end=18),
+        Token(id=4, text="Obama", start=19, end=24),
+        Token(id=5, text="Paris", start=25, end=30),
+    ]
+    token_entity_spans = [
+        TokenEntitySpan(
+            entity=EntitySpan(
+                text="Barack Hussein Obama", start=4, end=24, label="PER"
+            ),
+            token_indices=[1, 2, 3],
+        ),
+        TokenEntitySpan(
+            entity=EntitySpan(text="Paris", start=25, end=30, label="LOC"),
+            token_indices=[4],
+        ),
+    ]
+    encoder = SimpleLabelEncoder(
+        label_to_id={"O": 0, "B-PER": 1, "I-PER": 2, "L-PER": 3, "U-LOC": 4}
+    )
+    labeler = BILOLabeler()
+
+    label_ids = labeler.label_ids(tokens, token_entity_spans, encoder)
+
+    assert label_ids.tolist() == [0, 1, 2, 3, 4]
+    assert encoder.decode(label_ids.tolist()) == labeler.label(
+        tokens, token_entity_spans
+    )
@@ -1,6 +1,7 @@
 import pytest
 from chisel.extraction.models.models import Token, TokenEntitySpan, EntitySpan
 from chisel.extraction.labelers.binary_labeler import BinaryLabeler
+from chisel.extraction.labelers.label_encoder import SimpleLabelEncoder
 
 @pytest.fixture
 def sample_tokens():
@@ -30,3 +31,20 @@ def test_binary_labeler_no_entities(sample_tokens):
     labels = labeler.label(sample_tokens, token_entity_spans)
 
     assert labels == ["O", "O", "O", "O", "O"]
+
+
+def test_binary_label_ids_match_encoded_labels(sample_tokens):
+    token_entity_spans = [
+        TokenEntitySpan(
+            entity=EntitySpan(text="Barack Obama", start=0, end=12, label="PER"),
+            token_indices=[0, 1],
+        ),
+    ]
+    encoder = SimpleLabelEncoder(label_to_id={"O": 0, "ENTITY": 1})
+    labeler = BinaryLabeler()
+
+    label_ids = labeler.label_ids(sample_tokens, token_entity_spans, encoder)
+
+    assert label_ids.tolist() == encoder.encode(
+        labeler.label(sample_tokens, token_entity_spans)
+    )
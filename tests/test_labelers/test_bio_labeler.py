@@ -1,5 +1,7 @@
 from chisel.extraction.models.models import Token, EntitySpan, TokenEntitySpan
 from chisel.extraction.labelers.bio_labeler import BIOLabeler
+from chisel.extraction.labelers.label_encoder import SimpleLabelEncoder
+from chisel.extraction.models.sequences import SpanSet, TokenSequence
 
 def test_bio_labeler_single_token_span():
     tokens = [
@@ -45,3 +47,64 @@ def test_bio_labeler_multiple_spans():
     labeler = BIOLabeler()
     labels = labeler.label(tokens, token_entity_spans)
     assert labels == ["B-PER", "I-PER", "O", "B-PER", "I-PER"]
+
+def test_bio_label_ids_match_encoded_labels():
+    tokens = [
+        Token(id=1, text="Barack", start=0, end=6),
+        Token(id=2, text="Obama", start=7, end=12),
+        Token(id=3, text="met", start=13, end=16),
+        Token(id=4, text="Merkel", start=17, end=23),
+    ]
+    token_entity_spans = [
+        TokenEntitySpan(
+            entity=EntitySpan(text="Barack Obama", start=0, end=12, label="PER"),
+            token_indices=[0, 1],
+        ),
+        TokenEntitySpan(
+            entity=EntitySpan(text="Merkel", start=17, end=23, label="PER"),
+            token_indices=[3],
+        ),
+    ]
+    encoder = SimpleLabelEncoder(label_to_id={"O": 0, "B-PER": 1, "I-PER": 2})
+    labeler = BIOLabeler()
+    expected = encoder.encode(labeler.label(tokens, token_entity_spans))
+
+    assert labeler.label_ids(tokens, token_entity_spans, encoder).tolist() == expected
+    assert labeler.label_ids(
+        TokenSequence.from_tokens(tokens),
+        SpanSet.from_token_entity_spans(token_entity_spans),
+        encoder,
+    ).tolist() == expected
+
+
+def test_bio_label_ids_overlapping_and_unaligned_spans():
+    tokens = [
+        Token(id=1, text="New", start=0, end=3),
+        Token(id=2, text="York", start=4, end=8),
+        Token(id=3, text="City", start=9, end=13),
+    ]
+    token_entity_spans = [
+        TokenEntitySpan(
+            entity=EntitySpan(text="New York City", start=0, end=13, label="LOC"),
+            token_indices=[0, 1, 2],
+        ),
+        TokenEntitySpan(
+            entity=EntitySpan(text="York", start=4, end=8, label="PER"),
+            token_indices=[1],
+        ),
+        TokenEntitySpan(
+            entity=EntitySpan(text="Yo", start=4, end=6, label="ORG"),
+            token_indices=[],
+        ),
+    ]
+    encoder = SimpleLabelEncoder(
+        label_to_id={"O": 0, "B-LOC": 1, "I-LOC": 2, "B-PER": 3, "I-PER": 4}
+    )
+    labeler = BIOLabeler()
+
+    label_ids = labeler.label_ids(tokens, token_entity_spans, encoder)
+
+    assert label_ids.tolist() == [1, 3, 2]
+    assert label_ids.tolist() == encoder.encode(
+        labeler.label(tokens, token_entity_spans)
+    )
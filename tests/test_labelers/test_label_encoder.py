@@ -57,3 +57,74 @@ def test_get_label_to_id_and_id_to_label():
     encoder = SimpleLabelEncoder(label_to_id=mapping)
     assert encoder.get_label_to_id() == mapping
     assert encoder.get_id_to_label() == {0: "O", 1: "B-PER"}
+
+
+def test_scheme_ids_normalizes_and_caches():
+    encoder = SimpleLabelEncoder(
+        label_to_id={"O": 0, "B-PER": 1, "I-PER": 2},
+        label_normalizer={"B-PERSON": "B-PER", "I-PERSON": "I-PER"},
+    )
+    assert encoder.scheme_ids("PERSON", "BI") == (1, 2)
+    assert encoder.scheme_ids("PER", "BI") == (1, 2)
+    with pytest.raises(ValueError, match="Unknown label 'B-LOC'"):
+        encoder.scheme_ids("LOC", "BI")
+
+
+def test_encode_batch_flat_and_padded():
+    encoder = SimpleLabelEncoder(label_to_id={"O": 0, "B-PER": 1, "I-PER": 2})
+    batch = [["B-PER", "I-PER", "O"], [], ["O"]]
+
+    ids, offsets = encoder.encode_batch(batch)
+    assert ids.tolist() == [1, 2, 0, 0]
+    assert offsets.tolist() == [0, 3, 3, 4]
+    assert encoder.decode_batch(ids, offsets) == batch
+
+    padded = encoder.encode_batch(batch, padding=True)
+    assert padded.tolist() == [[1, 2, 0], [-100, -100, -100], [0, -100, -100]]
+    assert encoder.decode_batch(padded) == batch
+
+
+def test_encode_batch_reports_unknown_labels_once():
+    encoder = SimpleLabelEncoder(label_to_id={"O": 0}, strict=False)
+    with pytest.warns(UserWarning) as record:
+        ids, _ = encoder.encode_batch([["B-PER", "O", "B-PER"], ["B-LOC"]])
+
+    assert ids.tolist() == [0, 0, 0, 0]
+    assert len(record) == 1
+    message = str(record[0].message)
+    assert "Unknown label 'B-PER' (normalized as 'B-PER') x2" in message
+    assert "Unknown label 'B-LOC' (normalized as 'B-LOC') x1" in message
+
+
+def test_decode_batch_unknown_id():
+    encoder = SimpleLabelEncoder(label_to_id={"O": 0, "B-PER": 1})
+    with pytest.raises(ValueError, match="Unknown ID '5'"):
+        encoder.decode_batch([[0, 5]])
+
+
+def test_batch_matches_scalar_with_negative_ids():
+    encoder = SimpleLabelEncoder(label_to_id={"PAD": -100, "O": 0, "B-PER": 1})
+    sequences = [["PAD", "O", "B-PER"], ["B-PER", "PAD"]]
+
+    ids, offsets = encoder.encode_batch(sequences)
+    assert ids.tolist() == encoder.encode(sequences[0]) + encoder.encode(sequences[1])
+    assert ids.tolist() == [-100, 0, 1, 1, -100]
+    assert encoder.decode_batch(ids, offsets) == [
+        encoder.decode(ids[offsets[i] : offsets[i + 1]].tolist()) for i in range(2)
+    ]
+    assert encoder.decode_batch(ids, offsets) == sequences
+
+    with pytest.raises(ValueError, match="Unknown ID '-1'"):
+        encoder.decode_batch([-1], [0, 1])
+    with pytest.raises(ValueError, match="Unknown label"):
+        encoder.encode_batch([["B-LOC"]])
+
+
+def test_sparse_ids():
+    encoder = SimpleLabelEncoder(label_to_id={"O": 0, "B-X": 10**10})
+
+    ids, offsets = encoder.encode_batch([["O", "B-X"], ["B-X"]])
+    assert ids.tolist() == [0, 10**10, 10**10]
+    assert encoder.decode_batch(ids, offsets) == [["O", "B-X"], ["B-X"]]
+    with pytest.raises(ValueError, match="Unknown ID '5'"):
+        encoder.decode_batch([[0, 5]])
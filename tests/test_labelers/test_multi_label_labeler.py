@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from chisel.extraction.labelers.bio_labeler import BIOLabeler
+from chisel.extraction.labelers.multi_label_labeler import MultiLabelLabeler
+from chisel.extraction.models.models import EntitySpan, Token, TokenEntitySpan
+from chisel.extraction.models.sequences import SpanSet, TokenLabelMatrix
+
+
+@pytest.fixture
+def tokens():
+    return [
+        Token(id=1, text="University", start=0, end=10),
+        Token(id=2, text="of", start=11, end=13),
+        Token(id=3, text="Oslo", start=14, end=18),
+        Token(id=4, text="staff", start=19, end=24),
+    ]
+
+
+@pytest.fixture
+def nested_spans():
+    # "Oslo" (LOC) is nested inside "University of Oslo" (ORG).
+    return [
+        TokenEntitySpan(
+            entity=EntitySpan(text="University of Oslo", start=0, end=18, label="ORG"),
+            token_indices=[0, 1, 2],
+        ),
+        TokenEntitySpan(
+            entity=EntitySpan(text="Oslo", start=14, end=18, label="LOC"),
+            token_indices=[2],
+        ),
+    ]
+
+
+def test_nested_entities_keep_all_tags(tokens, nested_spans):
+    labeler = MultiLabelLabeler(["LOC", "ORG"])
+
+    assert labeler.tags == ["B-LOC", "I-LOC", "B-ORG", "I-ORG"]
+    assert labeler.label(tokens, nested_spans) == [
+        ["B-ORG"],
+        ["I-ORG"],
+        ["B-LOC", "I-ORG"],
+        [],
+    ]
+
+
+def test_bilou_scheme(tokens, nested_spans):
+    labeler = MultiLabelLabeler(["LOC", "ORG"], scheme="bilou")
+
+    assert labeler.label(tokens, nested_spans) == [
+        ["B-ORG"],
+        ["I-ORG"],
+        ["U-LOC", "L-ORG"],
+        [],
+    ]
+
+
+def test_sparse_matrix_matches_dense_and_columnar_input(tokens, nested_spans):
+    dense = MultiLabelLabeler(["LOC", "ORG"]).label_matrix(tokens, nested_spans)
+    sparse = MultiLabelLabeler(["LOC", "ORG"], sparse=True).label_matrix(
+        tokens, SpanSet.from_token_entity_spans(nested_spans)
+    )
+
+    assert dense.shape == (4, 4) and dense.dtype == bool
+    assert isinstance(sparse, TokenLabelMatrix)
+    assert np.array_equal(sparse.to_dense(), dense)
+
+
+def test_single_label_per_token_matches_bio_labeler(tokens, nested_spans):
+    spans = nested_spans[:1]
+    multi = MultiLabelLabeler(["LOC", "ORG"]).label(tokens, spans)
+
+    assert [row[0] if row else "O" for row in multi] == BIOLabeler().label(
+        tokens, spans
+    )
+
+
+def test_unknown_label_and_misalignment(tokens):
+    unaligned = TokenEntitySpan(
+        entity=EntitySpan(text="Uni", start=0, end=3, label="ORG"), token_indices=[]
+    )
+    unknown = TokenEntitySpan(
+        entity=EntitySpan(text="staff", start=19, end=24, label="ROLE"),
+        token_indices=[3],
+    )
+
+    assert MultiLabelLabeler(["ORG"]).label(tokens, [unaligned]) == [[]] * 4
+    with pytest.raises(ValueError, match="No aligned tokens"):
+        MultiLabelLabeler(["ORG"], misalignment_policy="fail").label(
+            tokens, [unaligned]
+        )
+    with pytest.raises(ValueError, match="Unknown entity label 'ROLE'"):
+        MultiLabelLabeler(["ORG"]).label(tokens, [unknown])
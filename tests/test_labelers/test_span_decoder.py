@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+from chisel.extraction.labelers.bilo_labeler import BILOLabeler
+from chisel.extraction.labelers.bio_labeler import BIOLabeler
+from chisel.extraction.labelers.label_encoder import SimpleLabelEncoder
+from chisel.extraction.labelers.span_decoder import SpanDecoder
+from chisel.extraction.models.models import EntitySpan, Token, TokenEntitySpan
+from chisel.extraction.models.sequences import TokenSequence
+
+TAGS = ["O"] + [f"{p}-{t}" for t in ("PER", "LOC") for p in "BILU"]
+LABEL_TO_ID = {tag: i for i, tag in enumerate(TAGS)}
+
+
+@pytest.fixture
+def document():
+    text = "Barack Obama visited Paris and Angela Merkel ."
+    words = text.split(" ")
+    tokens = []
+    position = 0
+    for i, word in enumerate(words):
+        tokens.append(Token(id=i, text=word, start=position, end=position + len(word)))
+        position += len(word) + 1
+
+    def span(first, stop, label):
+        start, end = tokens[first].start, tokens[stop - 1].end
+        return TokenEntitySpan(
+            entity=EntitySpan(text=text[start:end], start=start, end=end, label=label),
+            token_indices=list(range(first, stop)),
+        )
+
+    return text, tokens, [span(0, 2, "PER"), span(3, 4, "LOC"), span(5, 7, "PER")]
+
+
+@pytest.mark.parametrize("labeler", [BIOLabeler(), BILOLabeler()])
+def test_decode_inverts_labelers(document, labeler):
+    text, tokens, spans = document
+    encoder = SimpleLabelEncoder(LABEL_TO_ID)
+    label_ids = encoder.encode(labeler.label(tokens, spans))
+
+    decoded = SpanDecoder(encoder).decode(label_ids, tokens, text)
+
+    assert decoded == [span.entity for span in spans]
+
+
+def test_decode_batch_accepts_padded_arrays_and_offset_mappings(document):
+    text, tokens, spans = document
+    label_ids = SimpleLabelEncoder(LABEL_TO_ID).encode(
+        BIOLabeler().label(tokens, spans)
+    )
+    padded = np.zeros((2, 10), dtype=np.int64)
+    padded[0, : len(label_ids)] = label_ids
+    padded[1, :3] = [LABEL_TO_ID["I-LOC"], LABEL_TO_ID["I-LOC"], LABEL_TO_ID["B-PER"]]
+    offsets = [[(t.start, t.end) for t in tokens], np.array([[0, 2], [3, 5], [6, 8]])]
+
+    first, second = SpanDecoder(LABEL_TO_ID).decode_batch(padded, offsets)
+
+    assert [(e.start, e.end, e.label) for e in first] == [
+        (0, 12, "PER"),
+        (21, 26, "LOC"),
+        (31, 44, "PER"),
+    ]
+    # An "I-" without a "B-" starts an entity; a "B-" always starts a new one.
+    assert [(e.start, e.end, e.label) for e in second] == [
+        (0, 5, "LOC"),
+        (6, 8, "PER"),
+    ]
+
+
+def test_ignored_subwords_extend_the_previous_entity():
+    tokens = TokenSequence(
+        ids=[0, 1, 2, 3], starts=[0, 2, 5, 8], ends=[2, 4, 7, 10], texts=["a"] * 4
+    )
+    label_ids = [LABEL_TO_ID["B-PER"], -100, LABEL_TO_ID["O"], -100]
+
+    (spans,) = SpanDecoder(LABEL_TO_ID).decode_spans([label_ids], [tokens])
+
+    assert spans.starts.tolist() == [0]
+    assert spans.ends.tolist() == [4]
+    assert spans.token_starts.tolist() == [0]
+    assert spans.token_ends.tolist() == [2]
+
+
+def test_validate_detects_label_span_mismatch(document):
+    _, tokens, spans = document
+    labels = BIOLabeler().label(tokens, spans)
+    decoder = SpanDecoder(LABEL_TO_ID, on_error="raise")
+
+    decoder.validate(tokens, labels, spans)
+    labels[1] = "B-PER"
+    with pytest.raises(ValueError, match="does not match"):
+        decoder.validate(tokens, labels, spans)
+
+
+def test_validate_records_issues_in_report(document):
+    _, tokens, spans = document
+    labels = BIOLabeler().label(tokens, spans)
+    decoder = SpanDecoder(LABEL_TO_ID)
+
+    report = decoder.validate(tokens, labels, spans, doc_id="doc-1")
+    assert report.ok and report.n_checked == len(spans)
+
+    labels[1] = "B-PER"
+    decoder.validate(tokens, labels, spans, doc_id="doc-1", report=report)
+    assert report.counts["missing_span"] >= 1
+    assert report.counts["unexpected_span"] >= 1
+    assert report.doc_ids == {"doc-1"}
+
+
+def test_negative_label_ids():
+    decoder = SpanDecoder(
+        {"PAD": -100, "O": 0, "B-PER": 1, "I-PER": 2}, ignore_index=-1
+    )
+    offsets = [(0, 1), (2, 3), (4, 5), (6, 7)]
+    assert decoder._type[-1] == -1  # The unknown slot is not overwritten.
+    (spans,) = decoder.decode_spans([[1, 2, -100, -7]], [offsets])
+    assert spans.token_starts.tolist() == [0, 2]
+    assert spans.token_ends.tolist() == [2, 3]
+    assert spans.labels.tolist() == ["PER", "PAD"]
+
+
+def test_sparse_label_ids():
+    decoder = SpanDecoder({"O": 0, "B-PER": 10**10, "I-PER": 2**62})
+    offsets = [(0, 1), (2, 3), (4, 5), (6, 7)]
+    assert len(decoder._prefix) == 4
+    (spans,) = decoder.decode_spans([[10**10, 2**62, 0, 5]], [offsets])
+    assert spans.token_starts.tolist() == [0]
+    assert spans.token_ends.tolist() == [2]
+    assert spans.labels.tolist() == ["PER"]
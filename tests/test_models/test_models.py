@@ -0,0 +1,37 @@
+from chisel.extraction.models.models import (
+    ChiselRecord,
+    EntitySpan,
+    Token,
+    TokenEntitySpan,
+)
+
+
+def test_trusted_matches_validated_construction():
+    token = Token.trusted(id=1, text="Paris", start=0, end=5)
+    assert token == Token(id=1, text="Paris", start=0, end=5)
+
+    entity = EntitySpan.trusted(text="Paris", start=0, end=5, label="LOC")
+    assert entity == EntitySpan(text="Paris", start=0, end=5, label="LOC")
+
+    span = TokenEntitySpan.trusted(entity=entity, token_indices=[0])
+    assert span.model_dump() == {
+        "entity": entity.model_dump(),
+        "token_indices": [0],
+    }
+
+
+def test_trusted_fills_fresh_defaults():
+    first = EntitySpan.trusted(text="a", start=0, end=1, label="X")
+    second = EntitySpan.trusted(text="b", start=1, end=2, label="X")
+
+    assert first.attributes == {}
+    assert first.attributes is not second.attributes
+    assert first.model_fields_set == {"text", "start", "end", "label"}
+
+
+def test_trusted_record_defaults_optional_fields():
+    record = ChiselRecord.trusted(
+        id="1", chunk_id=0, text="Paris", tokens=[], entities=[]
+    )
+    assert record.labels is None
+    assert record.input_ids is None
@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+from chisel.extraction.models.models import (
+    ChiselRecord,
+    EntitySpan,
+    Token,
+    TokenEntitySpan,
+)
+from chisel.extraction.models.sequences import SpanSet, TokenLabelMatrix, TokenSequence
+from chisel.extraction.span_aligners.token_span_aligner import TokenSpanAligner
+from chisel.extraction.chunkers.fixed_length_chunker import FixedLengthTokenChunker
+from chisel.extraction.labelers.bio_labeler import BIOLabeler
+from chisel.extraction.labelers.bilo_labeler import BILOLabeler
+from chisel.extraction.labelers.binary_labeler import BinaryLabeler
+
+
+@pytest.fixture
+def tokens():
+    return [
+        Token(id=10, text="Barack", start=0, end=6),
+        Token(id=11, text="Obama", start=7, end=12),
+        Token(id=12, text="visited", start=13, end=20),
+        Token(id=13, text="Paris", start=21, end=26),
+        Token(id=14, text=".", start=26, end=27),
+    ]
+
+
+@pytest.fixture
+def entities():
+    return [
+        EntitySpan(text="Barack Obama", start=0, end=12, label="PER"),
+        EntitySpan(text="Paris", start=21, end=26, label="LOC", attributes={"k": "v"}),
+    ]
+
+
+def test_token_sequence_round_trip(tokens):
+    seq = TokenSequence.from_tokens(tokens)
+
+    assert len(seq) == 5
+    assert seq.to_tokens() == tokens
+    assert seq[3] == tokens[3]
+    assert seq.ids.dtype == np.int32
+
+
+def test_token_sequence_slices_are_views(tokens):
+    seq = TokenSequence.from_tokens(tokens)
+    view = seq[2:4]
+
+    assert np.shares_memory(view.ids, seq.ids)
+    assert view.texts == ["visited", "Paris"]
+
+    rebased = view.rebase()
+    assert rebased.starts.tolist() == [0, 8]
+    assert rebased.ends.tolist() == [7, 13]
+    assert np.shares_memory(rebased._starts, seq._starts)
+
+
+def test_token_sequence_text_resolver():
+    vocab = {1: "he", 2: "##llo"}
+    seq = TokenSequence(
+        ids=[1, 2],
+        starts=[0, 2],
+        ends=[2, 5],
+        text_resolver=lambda ids: [vocab[i] for i in ids],
+    )
+    assert seq.texts == ["he", "##llo"]
+    assert seq[1].text == "##llo"
+
+
+def test_token_sequence_without_text_source_raises():
+    seq = TokenSequence(ids=[1], starts=[0], ends=[1])
+    with pytest.raises(ValueError, match="no token text source"):
+        seq.texts
+
+
+def test_span_set_round_trip(entities):
+    spans = [
+        TokenEntitySpan(entity=entities[0], token_indices=[0, 1]),
+        TokenEntitySpan(entity=entities[1], token_indices=[3]),
+    ]
+    span_set = SpanSet.from_token_entity_spans(spans)
+
+    assert span_set.is_aligned
+    assert span_set.to_token_entity_spans() == spans
+    assert span_set[1] == spans[1]
+    assert SpanSet.from_entities(entities).to_entities() == entities
+
+
+def test_span_set_rejects_non_contiguous_indices(entities):
+    spans = [TokenEntitySpan(entity=entities[0], token_indices=[0, 2])]
+    with pytest.raises(ValueError, match="contiguous"):
+        SpanSet.from_token_entity_spans(spans)
+
+
+def test_columnar_aligner_matches_list_aligner(tokens, entities):
+    aligner = TokenSpanAligner()
+    expected = aligner.align(entities, tokens)
+    result = aligner.align(entities, TokenSequence.from_tokens(tokens))
+
+    assert isinstance(result, SpanSet)
+    assert result.to_token_entity_spans() == expected
+
+
+def test_columnar_chunker_matches_list_chunker(tokens, entities):
+    aligned = TokenSpanAligner().align(entities, tokens)
+    chunker = FixedLengthTokenChunker(max_tokens=3, overlap=1)
+    expected_tokens, expected_entities = chunker.chunk(tokens, aligned)
+
+    token_chunks, entity_chunks = chunker.chunk(
+        TokenSequence.from_tokens(tokens), SpanSet.from_token_entity_spans(aligned)
+    )
+
+    assert [c.to_tokens() for c in token_chunks] == expected_tokens
+    assert [c.to_token_entity_spans() for c in entity_chunks] == expected_entities
+
+
+@pytest.mark.parametrize("labeler", [BIOLabeler(), BILOLabeler(), BinaryLabeler()])
+def test_labelers_accept_columnar_inputs(tokens, entities, labeler):
+    aligned = TokenSpanAligner().align(entities, tokens)
+    expected = labeler.label(tokens, aligned)
+
+    labels = labeler.label(
+        TokenSequence.from_tokens(tokens), SpanSet.from_token_entity_spans(aligned)
+    )
+    assert labels == expected
+
+
+def test_chisel_record_accepts_columnar_containers(tokens, entities):
+    record = ChiselRecord(
+        id="1",
+        chunk_id=0,
+        text="Barack Obama visited Paris.",
+        tokens=TokenSequence.from_tokens(tokens),
+        entities=SpanSet.from_entities(entities),
+    )
+    assert isinstance(record.tokens, TokenSequence)
+    assert isinstance(record.entities, SpanSet)
+
+
+def test_token_label_matrix_round_trip_slice_and_concatenate():
+    dense = np.array([[True, False, False], [False, True, True], [False, False, False]])
+    matrix = TokenLabelMatrix.from_dense(dense, ["B-PER", "I-PER", "B-LOC"])
+
+    assert matrix.shape == (3, 3)
+    assert np.array_equal(matrix.to_dense(), dense)
+    assert matrix.to_tags() == [["B-PER"], ["I-PER", "B-LOC"], []]
+
+    view = matrix[1:3]
+    assert view.rows() == [[1, 2], []]
+    assert np.shares_memory(view.indices, matrix.indices)
+    assert TokenLabelMatrix.concatenate([matrix[:1], view]) == matrix
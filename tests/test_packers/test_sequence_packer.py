@@ -0,0 +1,125 @@
+import pytest
+from chisel.extraction.models.models import ChiselRecord, EntitySpan, Token
+from chisel.extraction.models.sequences import TokenLabelMatrix, TokenSequence
+from chisel.extraction.packers.sequence_packer import SequencePacker
+
+
+def make_record(doc_id, n_tokens, entity_at=0):
+    words = [f"{doc_id}w{i}" for i in range(n_tokens)]
+    tokens = []
+    pos = 0
+    for i, word in enumerate(words):
+        tokens.append(Token(id=i, text=word, start=pos, end=pos + len(word)))
+        pos += len(word) + 1
+    token = tokens[entity_at]
+    return ChiselRecord(
+        id=doc_id,
+        chunk_id=0,
+        text=" ".join(words),
+        tokens=tokens,
+        entities=[
+            EntitySpan(text=token.text, start=token.start, end=token.end, label="E")
+        ],
+        bio_labels=["B-E" if i == entity_at else "O" for i in range(n_tokens)],
+        labels=[1 if i == entity_at else 0 for i in range(n_tokens)],
+    )
+
+
+@pytest.fixture
+def records():
+    sizes = [7, 3, 5, 2, 6, 4, 1, 8]
+    return [make_record(f"d{k}", n, entity_at=n // 2) for k, n in enumerate(sizes)]
+
+
+@pytest.mark.parametrize("strategy", ["ffd", "streaming"])
+def test_pack_respects_max_tokens_and_offsets(records, strategy):
+    packed = SequencePacker(max_tokens=10, strategy=strategy).pack(records)
+
+    assert sum(len(r.tokens) for r in packed) == sum(len(r.tokens) for r in records)
+    for record in packed:
+        assert len(record.tokens) <= 10
+        assert len(record.labels) == len(record.tokens)
+        for token in record.tokens:
+            assert record.text[token.start : token.end] == token.text
+        for entity in record.entities:
+            assert record.text[entity.start : entity.end] == entity.text
+
+
+def test_ffd_packs_tightly(records):
+    packed = SequencePacker(max_tokens=10, strategy="ffd").pack(records)
+
+    # 36 tokens fit into 4 sequences of 10.
+    assert len(packed) == 4
+
+
+def test_position_and_segment_ids(records):
+    packed = SequencePacker(max_tokens=10).pack(records)
+
+    for record in packed:
+        for s, segment in enumerate(record.segments):
+            length = segment.token_end - segment.token_start
+            window = slice(segment.token_start, segment.token_end)
+            assert record.position_ids[window] == list(range(length))
+            assert record.segment_ids[window] == [s] * length
+
+
+@pytest.mark.parametrize("strategy", ["ffd", "streaming"])
+def test_unpack_restores_source_records(records, strategy):
+    packer = SequencePacker(max_tokens=10, strategy=strategy)
+    unpacked = [r for packed in packer.pack(records) for r in packer.unpack(packed)]
+
+    assert sorted(unpacked, key=lambda r: r.id) == sorted(records, key=lambda r: r.id)
+
+
+def test_pack_columnar_tokens(records):
+    packer = SequencePacker(max_tokens=10)
+    columnar = [
+        r.model_copy(update={"tokens": TokenSequence.from_tokens(r.tokens)})
+        for r in records
+    ]
+
+    packed = packer.pack(columnar)
+
+    assert all(isinstance(r.tokens, TokenSequence) for r in packed)
+    assert [r.tokens.to_tokens() for r in packed] == [
+        r.tokens for r in packer.pack(records)
+    ]
+
+
+def test_pack_and_unpack_multi_labels(records):
+    packer = SequencePacker(max_tokens=10)
+    tagged = [
+        r.model_copy(
+            update={
+                "multi_labels": TokenLabelMatrix.from_dense(
+                    [[b == "B-E"] for b in r.bio_labels], ["B-E"]
+                )
+            }
+        )
+        for r in records
+    ]
+
+    packed = packer.pack(tagged)
+
+    for record in packed:
+        assert len(record.multi_labels) == len(record.tokens)
+    unpacked = {r.id: r for p in packed for r in packer.unpack(p)}
+    for record in tagged:
+        assert unpacked[record.id].multi_labels == record.multi_labels
+
+
+def test_unpack_keeps_zero_length_entities_at_segment_end():
+    first, second = make_record("a", 2), make_record("b", 2)
+    end = len(first.text)
+    first.entities.append(EntitySpan(text="", start=end, end=end, label="GAP"))
+    second.entities.append(EntitySpan(text="", start=0, end=0, label="GAP"))
+
+    packed = SequencePacker(max_tokens=10, strategy="streaming").pack([first, second])
+    restored = SequencePacker(max_tokens=10).unpack(packed[0])
+
+    assert [r.entities for r in restored] == [first.entities, second.entities]
+
+
+def test_pack_rejects_oversized_records():
+    with pytest.raises(ValueError):
+        SequencePacker(max_tokens=4).pack([make_record("long", 5)])
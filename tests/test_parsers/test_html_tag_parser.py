@@ -1,3 +1,4 @@
+import pytest
 from chisel.extraction.parsers.html_tag_parser import HTMLTagParser
 from chisel.extraction.models.models import EntitySpan
 
@@ -79,3 +80,130 @@ def test_parse_custom_tags():
     assert spans[0].text == "UN"
     assert spans[0].start == 4
     assert spans[0].end == 6
+
+
+def test_parse_offsets_inside_excluded_tags():
+    parser = HTMLTagParser(label_strategy="tag")
+    html = "<div><p>The <person>CEO</person> spoke.</p></div>"
+    text, spans = parser.parse(html)
+
+    assert text == "The CEO spoke."
+    assert (spans[0].start, spans[0].end) == (4, 7)
+    assert text[spans[0].start : spans[0].end] == spans[0].text
+
+
+def test_parse_nested_offsets_are_absolute():
+    parser = HTMLTagParser(label_strategy="tag", allow_nested=True)
+    html = "<x>a<y>b</y>c<z>d</z></x> and <w>e</w>"
+    text, spans = parser.parse(html)
+
+    assert text == "abcd and e"
+    assert [(s.label, s.start, s.end, s.text) for s in spans] == [
+        ("Y", 1, 2, "b"),
+        ("Z", 3, 4, "d"),
+        ("X", 0, 4, "abcd"),
+        ("W", 9, 10, "e"),
+    ]
+
+
+def test_parse_skips_comments_and_declarations():
+    parser = HTMLTagParser(label_strategy="tag")
+    html = (
+        "<!DOCTYPE html><html><body>a<!-- note -->b <x>c<!-- d -->e</x></body></html>"
+    )
+    text, spans = parser.parse(html)
+
+    assert text == "ab ce"
+    assert spans[0].text == "ce"
+    assert (spans[0].start, spans[0].end) == (3, 5)
+
+
+def test_parse_unescapes_character_references():
+    parser = HTMLTagParser(label_strategy="tag")
+    text, spans = parser.parse("<org>AT&amp;T</org> &copy; 2024")
+
+    assert text == "AT&T © 2024"
+    assert spans[0].text == "AT&T"
+
+
+def test_parse_unclosed_and_mismatched_tags():
+    parser = HTMLTagParser(label_strategy="tag", allow_nested=True)
+    text, spans = parser.parse("<x>a<y>b</x>c</y>d <z>open")
+
+    assert text == "abcd open"
+    assert [(s.label, s.text) for s in spans] == [
+        ("Y", "b"),
+        ("X", "ab"),
+        ("Z", "open"),
+    ]
+
+
+def test_parse_keeps_multi_valued_attributes_as_strings():
+    parser = HTMLTagParser(label_strategy="attribute", attribute_name="type")
+    text, spans = parser.parse("<e type='ORG' class='a b' flag>Google</e>")
+
+    assert spans[0].label == "ORG"
+    assert spans[0].attributes == {"type": "ORG", "class": "a b", "flag": ""}
+
+
+def test_parse_deeply_nested_document():
+    parser = HTMLTagParser(label_strategy="tag", allow_nested=True)
+    depth = 5000
+    text, spans = parser.parse("<x>" * depth + "a" + "</x>" * depth)
+
+    assert text == "a"
+    assert len(spans) == depth
+
+
+def test_lxml_backend_matches_default_backend():
+    pytest.importorskip("lxml")
+    html = "<p>The <ORG>UN</ORG> met <PER>Joe <b>Biden</b></PER> today.</p>"
+    for allow_nested in (False, True):
+        default = HTMLTagParser(allow_nested=allow_nested).parse(html)
+        lxml = HTMLTagParser(allow_nested=allow_nested, backend="lxml").parse(html)
+        assert lxml == default
+
+
+@pytest.mark.parametrize("allow_nested", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+def test_incremental_parse_matches_parse(allow_nested, chunk_size):
+    parser = HTMLTagParser(label_strategy="tag", allow_nested=allow_nested)
+    html = (
+        "<p>The <role><person>CEO</person></role> of <ORG>AT&amp;T</ORG>"
+        "<!-- note --> met <PER>Joe <b>Biden</b></PER> today.</p>"
+    )
+    expected = parser.parse(html)
+
+    chunks = [html[i : i + chunk_size] for i in range(0, len(html), chunk_size)]
+    segments = list(parser.parse_stream(chunks))
+
+    assert "".join(text for text, _ in segments) == expected[0]
+    assert [span for _, spans in segments for span in spans] == expected[1]
+
+
+def test_incremental_parse_yields_global_offsets():
+    parser = HTMLTagParser(label_strategy="tag")
+    text1, spans1 = parser.feed("Hello <per>Jo")
+    text2, spans2 = parser.feed("hn</per> and <org>UN")
+    text3, spans3 = parser.close()
+
+    assert text1 + text2 + text3 == "Hello John and UN"
+    assert spans1 == []
+    assert [(s.label, s.start, s.end, s.text) for s in spans2 + spans3] == [
+        ("PER", 6, 10, "John"),
+        ("ORG", 15, 17, "UN"),
+    ]
+
+
+def test_parse_file_reads_in_blocks(tmp_path):
+    path = tmp_path / "doc.html"
+    path.write_text("<p>" + "Visit <loc>Paris</loc>. " * 200 + "</p>", encoding="utf-8")
+    parser = HTMLTagParser(label_strategy="tag")
+
+    segments = list(parser.parse_file(str(path), block_size=50))
+    text = "".join(segment for segment, _ in segments)
+    spans = [span for _, spans in segments for span in spans]
+
+    assert len(segments) > 1
+    assert len(spans) == 200
+    assert all(text[s.start : s.end] == "Paris" for s in spans)
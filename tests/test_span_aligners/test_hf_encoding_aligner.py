@@ -0,0 +1,78 @@
+import pytest
+
+from chisel.extraction.models.models import EntitySpan
+from chisel.extraction.span_aligners.hf_encoding_aligner import HFEncodingSpanAligner
+from chisel.extraction.span_aligners.token_span_aligner import TokenSpanAligner
+from chisel.extraction.tokenizers.hf_tokenizer import HFTokenizer
+
+TEXT = "Barack Obama visited the Parisians."
+
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    return HFTokenizer()
+
+
+@pytest.fixture
+def entities():
+    return [
+        EntitySpan(text="Barack Obama", start=0, end=12, label="PER"),
+        EntitySpan(text="Parisians", start=25, end=34, label="GRP"),
+    ]
+
+
+def test_align_matches_token_span_aligner(tokenizer, entities):
+    encoding = tokenizer.encode([TEXT])
+    tokens = tokenizer.tokens_from_encoding(encoding)[0]
+
+    aligned = HFEncodingSpanAligner().align(entities, encoding)
+    assert aligned == TokenSpanAligner().align(entities, tokens)
+
+
+def test_align_batch(tokenizer, entities):
+    encoding = tokenizer.encode([TEXT, "Nothing here."])
+    aligned = HFEncodingSpanAligner().align_batch([entities, []], encoding)
+
+    assert aligned[0] == HFEncodingSpanAligner().align(entities, encoding, 0)
+    assert aligned[1] == []
+
+
+def test_partial_token_overlap_is_misaligned(tokenizer):
+    encoding = tokenizer.encode([TEXT])
+    partial = [EntitySpan(text="Barack Oba", start=0, end=10, label="PER")]
+
+    assert HFEncodingSpanAligner().align(partial, encoding)[0].token_indices == []
+    with pytest.raises(ValueError):
+        HFEncodingSpanAligner(misalignment_policy="fail").align(partial, encoding)
+
+
+def test_strict_rejects_boundary_inside_word(tokenizer):
+    encoding = tokenizer.encode(["unbelievably"])
+    word_ids = encoding.word_ids(0)
+    assert len(word_ids) > 1, "expected the word to be split into subwords"
+
+    # An entity covering only the first subword of a multi-subword word.
+    end = encoding.token_to_chars(0, 0).end
+    entity = EntitySpan(text="unbelievably"[:end], start=0, end=end, label="X")
+
+    assert HFEncodingSpanAligner("all").align([entity], encoding)[0].token_indices == [
+        0
+    ]
+    assert (
+        HFEncodingSpanAligner("strict").align([entity], encoding)[0].token_indices == []
+    )
+
+
+def test_first_strategy_masks_non_first_subwords(tokenizer):
+    encoding = tokenizer.encode([TEXT])
+    word_ids = encoding.word_ids(0)
+    label_ids = list(range(len(word_ids)))
+
+    masked = HFEncodingSpanAligner("first").mask_labels(label_ids, encoding)
+    for i, label_id in enumerate(masked):
+        if i > 0 and word_ids[i] == word_ids[i - 1]:
+            assert label_id == -100
+        else:
+            assert label_id == i
+
+    assert HFEncodingSpanAligner("all").mask_labels(label_ids, encoding) == label_ids
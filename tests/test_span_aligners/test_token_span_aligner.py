@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from chisel.extraction.models.models import Token, EntitySpan
+from chisel.extraction.models.sequences import SpanSet, TokenSequence
+from chisel.extraction.span_aligners.token_span_aligner import TokenSpanAligner
+
+
+def make_document(rng, n_tokens=60, n_entities=8):
+    tokens = []
+    pos = 0
+    for i in range(n_tokens):
+        pos += rng.randint(0, 2)
+        length = rng.randint(1, 6)
+        tokens.append(Token(id=i, text="x" * length, start=pos, end=pos + length))
+        pos += length
+    entities = []
+    for _ in range(n_entities):
+        start = rng.randint(0, pos - 1)
+        end = rng.randint(start + 1, pos)
+        entities.append(EntitySpan(text="e", start=start, end=end, label="ENT"))
+    return tokens, entities
+
+
+def test_align_matches_exhaustive_scan():
+    rng = random.Random(0)
+    aligner = TokenSpanAligner()
+    for _ in range(50):
+        tokens, entities = make_document(rng)
+        expected = aligner._align_exhaustive(entities, tokens)
+        assert aligner.align(entities, tokens) == expected
+
+
+def test_align_unsorted_tokens_falls_back_to_scan():
+    tokens = [
+        Token(id=1, text="world", start=6, end=11),
+        Token(id=0, text="hello", start=0, end=5),
+    ]
+    entities = [EntitySpan(text="hello", start=0, end=5, label="X")]
+    aligned = TokenSpanAligner().align(entities, tokens)
+    assert aligned[0].token_indices == [1]
+
+
+def test_align_entity_without_tokens():
+    tokens = [Token(id=0, text="hello", start=0, end=5)]
+    entities = [EntitySpan(text="ell", start=1, end=4, label="X")]
+    assert TokenSpanAligner().align(entities, tokens)[0].token_indices == []
+
+
+def test_align_columnar_returns_span_set():
+    rng = random.Random(1)
+    aligner = TokenSpanAligner()
+    tokens, entities = make_document(rng)
+    aligned = aligner.align(entities, TokenSequence.from_tokens(tokens))
+    assert isinstance(aligned, SpanSet)
+    assert aligned.to_token_entity_spans() == aligner._align_exhaustive(
+        entities, tokens
+    )
+
+
+def test_align_batch_matches_per_document():
+    rng = random.Random(2)
+    aligner = TokenSpanAligner()
+    documents = [make_document(rng) for _ in range(10)]
+    documents.append(([], []))
+    tokens_batch = [tokens for tokens, _ in documents]
+    entities_batch = [entities for _, entities in documents]
+
+    batched = aligner.align_batch(entities_batch, tokens_batch)
+    assert batched == [
+        aligner._align_exhaustive(entities, tokens) for tokens, entities in documents
+    ]
+
+    columnar = aligner.align_batch(
+        [SpanSet.from_entities(e) for e in entities_batch],
+        [TokenSequence.from_tokens(t) for t in tokens_batch],
+    )
+    assert [spans.to_token_entity_spans() for spans in columnar] == batched
+
+
+def test_align_batch_length_mismatch():
+    with pytest.raises(ValueError):
+        TokenSpanAligner().align_batch([[]], [])
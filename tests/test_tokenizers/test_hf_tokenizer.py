@@ -8,3 +8,28 @@ def test_hf_tokenizer_outputs_tokens_with_offsets():
 
     assert all(t.start < t.end for t in tokens)
     assert "Barack" in [t.text for t in tokens]
+
+
+def test_hf_tokenizer_batch_matches_single_calls():
+    tokenizer = HFTokenizer()
+    texts = ["Barack Obama", "visited Paris.", ""]
+    batch = tokenizer.tokenize_batch(texts)
+
+    assert len(batch) == len(texts)
+    for text, tokens in zip(texts, batch):
+        assert tokens == tokenizer.tokenize(text)
+    assert batch[2] == []
+
+
+def test_hf_tokenizer_batch_empty_input():
+    tokenizer = HFTokenizer()
+    assert tokenizer.tokenize_batch([]) == []
+
+
+def test_hf_tokenizer_sequences_match_token_lists():
+    tokenizer = HFTokenizer()
+    texts = ["Barack Obama", "visited Paris."]
+    sequences = tokenizer.tokenize_sequences(texts)
+
+    for sequence, tokens in zip(sequences, tokenizer.tokenize_batch(texts)):
+        assert sequence.to_tokens() == tokens
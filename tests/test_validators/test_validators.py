@@ -2,6 +2,7 @@ import pytest
 from typing import List
 from transformers import AutoTokenizer
 from chisel.extraction.models.models import Token, EntitySpan, TokenEntitySpan
+from chisel.extraction.validators.report import ErrorBudgetExceeded, ValidationReport
 from chisel.extraction.validators.validators import DefaultParseValidator, HFTokenAlignmentValidator, LabelSchemaValidator
 
 def make_tokens(text: str, tokenizer_name: str = "bert-base-uncased") -> List[Token]:
@@ -48,4 +49,121 @@ def test_label_schema_validator(capsys, on_error):
         entity_spans_invalid = EntitySpan(text="Unknown Entity", start=0, end=15, label="UNKNOWN")
         validator.validate("Unknown Entity is not allowed.", entity_spans_invalid)
         captured = capsys.readouterr()
-        assert  "Warning: Entity label 'UNKNOWN' not in" in captured.out
\ No newline at end of file
+        assert  "Warning: Entity label 'UNKNOWN' not in" in captured.out
+
+def _offset_tokens() -> List[Token]:
+    # "Barack Obama visited Paris."
+    return [
+        Token(text="Barack", id=1, start=0, end=6),
+        Token(text="Obama", id=2, start=7, end=12),
+        Token(text="visited", id=3, start=13, end=20),
+        Token(text="Paris", id=4, start=21, end=26),
+        Token(text=".", id=5, start=26, end=27),
+    ]
+
+
+def test_hf_token_alignment_validator_offsets_mode():
+    text = "Barack Obama visited Paris."
+    person = EntitySpan(text="Barack Obama", start=0, end=12, label="PER")
+    place = EntitySpan(text="Paris", start=21, end=26, label="LOC")
+    spans = [
+        TokenEntitySpan(entity=person, token_indices=[0, 1]),
+        TokenEntitySpan(entity=place, token_indices=[3]),
+        TokenEntitySpan(entity=place, token_indices=[3, 4]),
+        TokenEntitySpan(entity=place, token_indices=[]),
+    ]
+
+    # The offsets mode never calls the tokenizer.
+    validator = HFTokenAlignmentValidator(None, on_error="warn", mode="offsets")
+    for report in (
+        validator.validate_many(_offset_tokens(), spans),
+        validator.validate_many(_offset_tokens(), spans, text),
+    ):
+        assert (report.n_checked, report.n_failed) == (4, 2)
+        assert [issue.index for issue in report.examples["token_mismatch"]] == [2, 3]
+
+    report = validator.validate_batch(
+        [_offset_tokens()] * 2, [spans[:2], spans[2:]], doc_ids=["a", "b"]
+    )
+    assert report.counts == {"token_mismatch": 2}
+    assert report.doc_ids == {"b"}
+
+
+def test_hf_token_alignment_validator_offsets_mode_raises():
+    place = EntitySpan(text="Paris", start=21, end=26, label="LOC")
+    validator = HFTokenAlignmentValidator(None, on_error="raise", mode="offsets")
+    with pytest.raises(ValueError):
+        validator.validate(_offset_tokens(), TokenEntitySpan(entity=place, token_indices=[2]))
+
+
+def test_hf_token_alignment_validator_batch_decode_mode():
+    text = "Barack Obama visited Paris."
+    tokens = make_tokens(text)
+    tokenizer = AutoTokenizer.from_pretrained("bert-base-uncased")
+    person = EntitySpan(text="Barack Obama", start=0, end=12, label="PER")
+    place = EntitySpan(text="Paris", start=21, end=26, label="LOC")
+    spans = [
+        TokenEntitySpan(entity=person, token_indices=[0, 1]),
+        TokenEntitySpan(entity=place, token_indices=[2]),
+    ]
+
+    expected = HFTokenAlignmentValidator(tokenizer).validate_many(tokens, spans)
+    validator = HFTokenAlignmentValidator(tokenizer, mode="batch_decode")
+    report = validator.validate_batch([tokens, tokens], [spans, spans[:1]], doc_ids=["a", "b"])
+    assert (expected.n_checked, expected.n_failed) == (2, 1)
+    assert (report.n_checked, report.n_failed) == (3, 1)
+    assert report.examples["token_mismatch"][0].doc_id == "a"
+
+
+def test_hf_token_alignment_validator_unknown_mode():
+    with pytest.raises(ValueError):
+        HFTokenAlignmentValidator(None, mode="fast")
+
+
+def test_parse_validators_validate_many(capsys):
+    text = "Barack Obama visited Paris."
+    spans = [
+        EntitySpan(text="Barack Obama", start=0, end=12, label="PER"),
+        EntitySpan(text="Paris", start=20, end=25, label="LOC"),
+        EntitySpan(text="Berlin", start=21, end=26, label="CITY"),
+    ]
+    report = ValidationReport(max_examples=1)
+    DefaultParseValidator().validate_many(text, spans, doc_id="doc-1", report=report)
+    LabelSchemaValidator({"PER", "LOC"}).validate_many(text, spans, doc_id="doc-2", report=report)
+
+    # Nothing is printed per span; the failures are aggregated instead.
+    assert capsys.readouterr().out == ""
+    assert report.n_checked == 6
+    assert report.n_failed == 3
+    assert report.counts == {"text_mismatch": 2, "text_not_found": 1, "unknown_label": 1}
+    assert [issue.index for issue in report.examples["text_mismatch"]] == [1]
+    assert report.doc_ids == {"doc-1", "doc-2"}
+    assert "text_mismatch: 2" in report.summary()
+
+    with pytest.raises(ValueError, match="not in allowed labels"):
+        LabelSchemaValidator({"PER"}, on_error="raise").validate_many(text, spans)
+
+
+def test_validation_report_sampling_and_budget():
+    text = "Paris"
+    good = EntitySpan(text="Paris", start=0, end=5, label="LOC")
+    bad = EntitySpan(text="Pari", start=1, end=5, label="LOC")
+
+    report = ValidationReport(sample_rate=0.25, seed=0)
+    DefaultParseValidator().validate_many(text, [good] * 1000, report=report)
+    assert report.n_checked + report.n_skipped == 1000
+    assert 150 < report.n_checked < 350
+    assert report.ok
+
+    report = ValidationReport(max_error_rate=0.1, min_checked=20)
+    validator = DefaultParseValidator()
+    validator.validate_many(text, [good] * 9 + [bad], report=report)
+    with pytest.raises(ErrorBudgetExceeded) as error:
+        for _ in range(10):
+            validator.validate_many(text, [good] * 8 + [bad] * 2, report=report)
+    assert error.value.report.n_checked == 20
+    low, high = report.confidence_interval()
+    assert low < report.error_rate < high
+
+    merged = ValidationReport().merge(report).merge(report)
+    assert merged.n_failed == 2 * report.n_failed